@@ -12,12 +12,28 @@ from datetime import datetime
 from playwright.async_api import async_playwright
 import subprocess
 import sys
+from browser_pool import BrowserPool, PoolConfig
+from resource_filter import DEFAULT_PROFILE, RESOURCE_PROFILES
+from wait_strategies import AsyncMapsWaits, WaitTelemetry
+from detail_extractor import quick_record, read_detail_pane_async
+from feed_scroller import LISTING_SELECTOR, AsyncFeedScroller, ScrollTelemetry
+from progress_journal import ProgressJournal
+from entity_resolution import print_resolution_stats, resolve_duplicates
+from scraper_metrics import METRICS, start_metrics_server
+import argparse
+
+JOURNAL_PATH = "Auto_Ujjain_Results_progress.jsonl"
 
 class AutoUjjainScraper:
-    def __init__(self):
+    def __init__(self, resume=False, resource_profile=DEFAULT_PROFILE):
         self.total_businesses = 0
         self.results_dir = f"Auto_Ujjain_Results_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         os.makedirs(self.results_dir, exist_ok=True)
+        self.wait_telemetry = WaitTelemetry()
+        self.scroll_telemetry = ScrollTelemetry()
+        self.businesses_per_query = 15
+        self.journal = ProgressJournal(JOURNAL_PATH, resume=resume)
+        self.resource_profile = resource_profile
         
     def get_priority_queries(self):
         """Get high-priority queries for quick results"""
@@ -49,48 +65,7 @@ class AutoUjjainScraper:
         """Extract business data quickly"""
         
         try:
-            business = {}
-            
-            # Name
-            name_elem = page.locator('h1.DUwDvf').first
-            if await name_elem.count() > 0:
-                business['name'] = await name_elem.inner_text()
-            
-            # Address  
-            address_elem = page.locator('[data-item-id="address"] .fontBodyMedium').first
-            if await address_elem.count() > 0:
-                business['address'] = await address_elem.inner_text()
-            
-            # Phone
-            phone_elem = page.locator('[data-item-id*="phone"] .fontBodyMedium').first
-            if await phone_elem.count() > 0:
-                business['phone_number'] = await phone_elem.inner_text()
-            
-            # Image URL
-            img_elem = page.locator('.ZKCDEc img').first
-            if await img_elem.count() > 0:
-                business['image_url'] = await img_elem.get_attribute('src')
-            
-            # Rating
-            rating_elem = page.locator('[role="img"][aria-label*="stars"]').first
-            if await rating_elem.count() > 0:
-                rating_text = await rating_elem.get_attribute('aria-label')
-                if rating_text:
-                    try:
-                        business['rating'] = float(rating_text.split()[0])
-                    except:
-                        pass
-            
-            # Coordinates from URL
-            url = page.url
-            if '/@' in url:
-                try:
-                    coords = url.split('/@')[1].split('/')[0]
-                    lat, lng = coords.split(',')[:2]
-                    business['latitude'] = float(lat)
-                    business['longitude'] = float(lng)
-                except:
-                    pass
+            business = quick_record(await read_detail_pane_async(page))
             
             # Category
             business['category'] = self.categorize_business(query)
@@ -101,6 +76,7 @@ class AutoUjjainScraper:
             
         except Exception as e:
             print(f"Error extracting data: {e}")
+            METRICS.error('extract')
             return None
     
     def categorize_business(self, query):
@@ -123,41 +99,46 @@ class AutoUjjainScraper:
         else:
             return 'General Business'
     
-    async def scrape_query(self, browser, query):
-        """Scrape a single query"""
+    async def scrape_query(self, pool, query):
+        """Scrape a single query on a warm pooled page"""
         
+        start = time.perf_counter()
         try:
-            page = await browser.new_page()
-            await page.goto("https://www.google.com/maps", timeout=30000)
-            
-            # Search
-            await page.fill('input[id="searchboxinput"]', query)
-            await page.press('input[id="searchboxinput"]', 'Enter')
-            await page.wait_for_timeout(3000)
-            
-            # Scroll to load results
-            for _ in range(3):
-                await page.mouse.wheel(0, 3000)
-                await page.wait_for_timeout(1000)
-            
-            # Get listings
-            listings = await page.locator('a[href*="/maps/place/"]').all()
-            businesses = []
-            
-            for i, listing in enumerate(listings[:15]):  # Limit to 15 per query
-                try:
-                    await listing.click()
-                    await page.wait_for_timeout(2000)
-                    
-                    business = await self.extract_business_data(page, query)
-                    if business:
-                        businesses.append(business)
+            async with pool.page() as page:
+                resources = pool.resources_for(page)
+                resources.start_query()
+                
+                # Search
+                waits = AsyncMapsWaits(page, self.wait_telemetry)
+                await waits.mark_stale_results()
+                await page.fill('input[id="searchboxinput"]', query)
+                await page.press('input[id="searchboxinput"]', 'Enter')
+                await waits.results_loaded()
+                
+                # Scroll only as far as this query's results need
+                scrolled = await AsyncFeedScroller(page, waits, self.scroll_telemetry).scroll(
+                    self.businesses_per_query)
+                
+                # Get listings
+                hrefs = scrolled.hrefs[:self.businesses_per_query]
+                listings = (await page.locator(LISTING_SELECTOR).all())[:len(hrefs)]
+                businesses = []
+                
+                for i, (listing, href) in enumerate(zip(listings, hrefs)):
+                    try:
+                        if not await waits.open_listing(listing, href):
+                            continue  # pane never loaded - extracting now would copy the previous business
                         
-                except Exception as e:
-                    print(f"Error extracting business {i}: {e}")
-                    continue
-            
-            await page.close()
+                        business = await self.extract_business_data(page, query)
+                        if business:
+                            businesses.append(business)
+                            
+                    except Exception as e:
+                        print(f"Error extracting business {i}: {e}")
+                        METRICS.error('extract')
+                        continue
+                
+                bandwidth = resources.query_summary()
             
             # Save immediately
             safe_query = query.replace(' ', '_').replace(',', '').replace('/', '_')
@@ -167,13 +148,24 @@ class AutoUjjainScraper:
             with open(filepath, 'w') as f:
                 json.dump(businesses, f, indent=2, ensure_ascii=False)
             
+            self.journal.mark_done(
+                query,
+                place_ids=[business.get('google_place_id') for business in businesses],
+                businesses=len(businesses),
+                output=filepath
+            )
+            
             self.total_businesses += len(businesses)
-            print(f"✅ {query}: {len(businesses)} businesses (Total: {self.total_businesses})")
+            METRICS.query_finished(time.perf_counter() - start, len(businesses), scrolled.count)
+            print(f"✅ {query}: {len(businesses)} businesses (Total: {self.total_businesses}, {bandwidth}, "
+                  f"{scrolled.iterations} scrolls in {scrolled.seconds:.1f}s)")
             
             return businesses
             
         except Exception as e:
             print(f"❌ Query failed: {query} - {e}")
+            METRICS.error('query')
+            METRICS.query_failed()
             return []
     
     async def run_extraction(self):
@@ -190,14 +182,26 @@ class AutoUjjainScraper:
         start_time = time.time()
         
         async with async_playwright() as playwright:
-            browser = await playwright.chromium.launch(headless=True)
+            # One warm page reused for every query
+            pool = BrowserPool(playwright, PoolConfig(
+                max_browsers=1, contexts_per_browser=1, resource_profile=self.resource_profile
+            ))
             
             all_businesses = []
             
             for i, query in enumerate(queries):
+                if self.journal.is_done(query):
+                    # Finished in a previous run - reuse its saved results
+                    previous_output = self.journal.output_for(query)
+                    if previous_output and os.path.exists(previous_output):
+                        with open(previous_output, 'r') as f:
+                            all_businesses.extend(json.load(f))
+                    print(f"⏭️  Skipping {i+1}/{len(queries)}: {query} (already done)")
+                    continue
+                
                 print(f"\n🔄 Processing {i+1}/{len(queries)}: {query}")
                 
-                businesses = await self.scrape_query(browser, query)
+                businesses = await self.scrape_query(pool, query)
                 all_businesses.extend(businesses)
                 
                 # Small delay
@@ -208,7 +212,15 @@ class AutoUjjainScraper:
                     elapsed = (time.time() - start_time) / 60
                     print(f"📊 Progress: {i+1}/{len(queries)} queries, {len(all_businesses)} businesses, {elapsed:.1f} minutes")
             
-            await browser.close()
+            pool.print_stats()
+            self.wait_telemetry.print_summary()
+            self.scroll_telemetry.print_summary()
+            await pool.close()
+            self.journal.close()
+            
+            # Merge the same shop found by several queries
+            all_businesses, resolution_stats = resolve_duplicates(all_businesses)
+            print_resolution_stats(resolution_stats)
             
             # Save combined results
             combined_file = os.path.join(self.results_dir, 'complete_ujjain_businesses.json')
@@ -257,7 +269,18 @@ async def main():
     print("🚀 NO USER INPUT REQUIRED - RUNNING AUTOMATICALLY")
     print("=" * 60)
     
-    scraper = AutoUjjainScraper()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resume", action="store_true", help="Skip queries finished in the previous run")
+    parser.add_argument("--resources", choices=list(RESOURCE_PROFILES), default=DEFAULT_PROFILE,
+                        help="Which page resources to download (listing-only blocks stylesheets too)")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve live Prometheus metrics on this local port, e.g. 9464")
+    args = parser.parse_args()
+    
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port, "auto_ujjain_scraper")
+    
+    scraper = AutoUjjainScraper(resume=args.resume, resource_profile=args.resources)
     total_businesses = await scraper.run_extraction()
     
     print(f"\n🎉 AUTOMATIC EXTRACTION COMPLETED!")
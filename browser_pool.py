@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+🔥 WARM BROWSER POOL - REUSABLE GOOGLE MAPS PAGES 🔥
+Bounded pool of warm Playwright pages shared across scraper queries
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from resource_filter import DEFAULT_PROFILE, ResourceFilter, new_resource_stats, print_resource_stats
+from scraper_metrics import METRICS
+
+MAPS_HOME_URL = "https://www.google.com/maps"
+
+@dataclass
+class PoolConfig:
+    """Configuration for the warm browser pool"""
+    max_browsers: int = 4  # Chromium processes kept alive
+    contexts_per_browser: int = 5  # Isolated contexts (one warm page each) per browser
+    max_uses_per_page: int = 40  # Recycle a page after this many queries
+    health_check_timeout: float = 5.0  # seconds
+    navigation_timeout: int = 30000  # ms
+    headless: bool = True
+    locale: str = "en-GB"
+    resource_profile: str = DEFAULT_PROFILE  # listing-only / details / full
+    launch_args: list = field(default_factory=lambda: ['--no-sandbox', '--disable-dev-shm-usage'])
+
+    @property
+    def max_pages(self):
+        return self.max_browsers * self.contexts_per_browser
+
+class PooledPage:
+    """A warm page together with the context and browser it lives in"""
+
+    def __init__(self, browser, context, page, resources=None):
+        self.browser = browser
+        self.context = context
+        self.page = page
+        self.resources = resources
+        self.uses = 0
+        self.created_at = time.time()
+
+class BrowserPool:
+    """Bounded pool of warm Google Maps pages with health checks and recycling"""
+
+    def __init__(self, playwright, config=None):
+        self.playwright = playwright
+        self.config = config or PoolConfig()
+        self._browsers = []  # [browser, open_context_count]
+        self._idle = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.config.max_pages)
+        self._browser_lock = asyncio.Lock()
+        self._closed = False
+        self._resources = {}  # page -> ResourceFilter
+        self.resource_totals = new_resource_stats()
+        self.stats = {
+            'pages_created': 0,
+            'pages_recycled': 0,
+            'pages_discarded': 0,
+            'acquisitions': 0,
+            'browsers_launched': 0,
+        }
+
+    async def _get_browser(self):
+        """Pick the least loaded browser, launching a new one while under the limit"""
+        connected = [slot for slot in self._browsers if slot[0].is_connected()]
+        for _ in range(len(self._browsers) - len(connected)):
+            METRICS.browser_stopped()
+        self._browsers = connected
+
+        if len(self._browsers) < self.config.max_browsers:
+            browser = await self.playwright.chromium.launch(
+                headless=self.config.headless,
+                args=self.config.launch_args
+            )
+            self._browsers.append([browser, 0])
+            self.stats['browsers_launched'] += 1
+            METRICS.browser_started()
+
+        slot = min(self._browsers, key=lambda s: s[1])
+        slot[1] += 1
+        return slot[0]
+
+    def _release_browser_slot(self, browser):
+        for slot in self._browsers:
+            if slot[0] is browser:
+                slot[1] = max(0, slot[1] - 1)
+                break
+
+    async def _create_page(self):
+        """Open a new context + page and warm it on the Maps home page"""
+        async with self._browser_lock:
+            browser = await self._get_browser()
+        context = None
+        try:
+            context = await browser.new_context(locale=self.config.locale)
+            page = await context.new_page()
+            page.set_default_navigation_timeout(self.config.navigation_timeout)
+            resources = ResourceFilter(self.config.resource_profile, self.resource_totals)
+            await resources.attach_async(page)
+            await page.goto(MAPS_HOME_URL, timeout=self.config.navigation_timeout)
+        except Exception:
+            # A failed warm-up must not leave its context (and renderer) open
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            self._release_browser_slot(browser)
+            raise
+
+        self.stats['pages_created'] += 1
+        self._resources[page] = resources
+        return PooledPage(browser, context, page, resources)
+
+    async def _is_healthy(self, pooled):
+        """Cheap liveness probe before handing a page out"""
+        if pooled.page.is_closed() or not pooled.browser.is_connected():
+            return False
+        try:
+            await asyncio.wait_for(pooled.page.evaluate("1"), self.config.health_check_timeout)
+            return True
+        except Exception:
+            return False
+
+    async def _dispose(self, pooled):
+        """Close a pooled page's context and free its browser slot"""
+        self._resources.pop(pooled.page, None)
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass
+        self._release_browser_slot(pooled.browser)
+
+    async def acquire(self):
+        """Get a healthy warm page, waiting if the pool is at capacity"""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+
+        await self._slots.acquire()
+        try:
+            while True:
+                if not self._idle.empty():
+                    pooled = self._idle.get_nowait()
+                else:
+                    pooled = await self._create_page()
+
+                if await self._is_healthy(pooled):
+                    pooled.uses += 1
+                    self.stats['acquisitions'] += 1
+                    return pooled
+
+                self.stats['pages_discarded'] += 1
+                await self._dispose(pooled)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def release(self, pooled, healthy=True):
+        """Return a page to the pool, recycling worn-out or broken pages"""
+        try:
+            if self._closed or not healthy:
+                if not healthy:
+                    self.stats['pages_discarded'] += 1
+                await self._dispose(pooled)
+            elif pooled.uses >= self.config.max_uses_per_page:
+                self.stats['pages_recycled'] += 1
+                await self._dispose(pooled)
+            else:
+                self._idle.put_nowait(pooled)
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def page(self):
+        """Borrow a warm page for the duration of a query"""
+        pooled = await self.acquire()
+        try:
+            yield pooled.page
+        except BaseException:
+            await self.release(pooled, healthy=False)
+            raise
+        else:
+            await self.release(pooled)
+
+    def resources_for(self, page):
+        """ResourceFilter installed on a borrowed page (per-query byte counters)"""
+        return self._resources.get(page)
+
+    async def close(self):
+        """Close every page and browser owned by the pool"""
+        self._closed = True
+        while not self._idle.empty():
+            pooled = self._idle.get_nowait()
+            try:
+                await pooled.context.close()
+            except Exception:
+                pass
+        for browser, _ in self._browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+            METRICS.browser_stopped()
+        self._browsers = []
+        self._resources = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def print_stats(self):
+        """Print pool usage statistics"""
+        print("🧰 Browser pool stats:")
+        for key, value in self.stats.items():
+            print(f"   {key}: {value}")
+        print_resource_stats(self.config.resource_profile, self.resource_totals)
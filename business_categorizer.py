@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+🔥 COMPILED BUSINESS CATEGORIZER 🔥
+One precompiled regex over every category keyword, built once and reused for every business
+"""
+
+import re
+import time
+import random
+
+DEFAULT_CATEGORY = "💼 BUSINESS & PROFESSIONAL"
+DEFAULT_SUBCATEGORY = "General Business"
+
+# keyword -> (category, subcategory); order decides the order categories are reported in
+CATEGORY_MAPPING = {
+    # Food & Dining
+    "restaurant": ("🍽️ FOOD & DINING", "Restaurants"),
+    "fast food": ("🍽️ FOOD & DINING", "Fast Food"),
+    "sweet": ("🍽️ FOOD & DINING", "Sweet Shops"),
+    "bakery": ("🍽️ FOOD & DINING", "Bakeries"),
+    "ice cream": ("🍽️ FOOD & DINING", "Ice Cream Parlors"),
+    "juice": ("🍽️ FOOD & DINING", "Juice Centers"),
+    "tea": ("🍽️ FOOD & DINING", "Tea Stalls"),
+    "coffee": ("🍽️ FOOD & DINING", "Coffee Shops"),
+    "dhaba": ("🍽️ FOOD & DINING", "Dhaba"),
+    "pizza": ("🍽️ FOOD & DINING", "Pizza"),
+    "burger": ("🍽️ FOOD & DINING", "Burger Joints"),
+    "chat": ("🍽️ FOOD & DINING", "Chat Centers"),
+
+    # Grocery & Daily
+    "kirana": ("🛒 GROCERY & DAILY", "Kirana Stores"),
+    "grocery": ("🛒 GROCERY & DAILY", "Grocery Stores"),
+    "supermarket": ("🛒 GROCERY & DAILY", "Supermarkets"),
+    "general store": ("🛒 GROCERY & DAILY", "General Stores"),
+    "provision": ("🛒 GROCERY & DAILY", "Provision Stores"),
+    "spice": ("🛒 GROCERY & DAILY", "Spice Shops"),
+    "flour mill": ("🛒 GROCERY & DAILY", "Flour Mills"),
+
+    # Health & Medical
+    "hospital": ("🏥 HEALTH & MEDICAL", "Hospitals"),
+    "clinic": ("🏥 HEALTH & MEDICAL", "Clinics"),
+    "medical": ("🏥 HEALTH & MEDICAL", "Medical Stores"),
+    "pharmacy": ("🏥 HEALTH & MEDICAL", "Pharmacies"),
+    "dental": ("🏥 HEALTH & MEDICAL", "Dental Clinics"),
+    "eye": ("🏥 HEALTH & MEDICAL", "Eye Clinics"),
+    "skin": ("🏥 HEALTH & MEDICAL", "Skin Clinics"),
+    "diagnostic": ("🏥 HEALTH & MEDICAL", "Diagnostic Centers"),
+    "pathology": ("🏥 HEALTH & MEDICAL", "Pathology Labs"),
+    "ayurvedic": ("🏥 HEALTH & MEDICAL", "Ayurvedic Centers"),
+
+    # Fashion & Retail
+    "clothing": ("👗 FASHION & RETAIL", "Clothing Stores"),
+    "saree": ("👗 FASHION & RETAIL", "Saree Shops"),
+    "suit": ("👗 FASHION & RETAIL", "Suit Shops"),
+    "footwear": ("👗 FASHION & RETAIL", "Footwear"),
+    "shoe": ("👗 FASHION & RETAIL", "Shoe Stores"),
+    "bag": ("👗 FASHION & RETAIL", "Bags"),
+    "jewelry": ("👗 FASHION & RETAIL", "Jewelry"),
+    "jewellery": ("👗 FASHION & RETAIL", "Jewelry"),
+    "watch": ("👗 FASHION & RETAIL", "Watches"),
+
+    # Electronics & Tech
+    "mobile": ("📱 ELECTRONICS & TECH", "Mobile Shops"),
+    "electronics": ("📱 ELECTRONICS & TECH", "Electronics Stores"),
+    "computer": ("📱 ELECTRONICS & TECH", "Computer Shops"),
+    "laptop": ("📱 ELECTRONICS & TECH", "Laptop Stores"),
+    "repair": ("📱 ELECTRONICS & TECH", "Repair Services"),
+    "appliance": ("📱 ELECTRONICS & TECH", "Home Appliances"),
+
+    # Beauty & Care
+    "beauty": ("💄 BEAUTY & CARE", "Beauty Parlors"),
+    "salon": ("💄 BEAUTY & CARE", "Salons"),
+    "parlor": ("💄 BEAUTY & CARE", "Beauty Parlors"),
+    "parlour": ("💄 BEAUTY & CARE", "Beauty Parlors"),
+    "spa": ("💄 BEAUTY & CARE", "Spa"),
+    "cosmetic": ("💄 BEAUTY & CARE", "Cosmetics"),
+
+    # Home & Living
+    "furniture": ("🏠 HOME & LIVING", "Furniture Stores"),
+    "hardware": ("🏠 HOME & LIVING", "Hardware Stores"),
+    "paint": ("🏠 HOME & LIVING", "Paint Shops"),
+    "tile": ("🏠 HOME & LIVING", "Tiles"),
+    "marble": ("🏠 HOME & LIVING", "Marble"),
+
+    # Automotive & Transport
+    "petrol": ("🚗 AUTOMOTIVE & TRANSPORT", "Petrol Pumps"),
+    "auto": ("🚗 AUTOMOTIVE & TRANSPORT", "Auto Repair"),
+    "car": ("🚗 AUTOMOTIVE & TRANSPORT", "Car Service"),
+    "bike": ("🚗 AUTOMOTIVE & TRANSPORT", "Bike Service"),
+    "tire": ("🚗 AUTOMOTIVE & TRANSPORT", "Tire Shops"),
+    "transport": ("🚗 AUTOMOTIVE & TRANSPORT", "Transport Services"),
+
+    # Education & Training
+    "school": ("🎓 EDUCATION & TRAINING", "Schools"),
+    "college": ("🎓 EDUCATION & TRAINING", "Colleges"),
+    "coaching": ("🎓 EDUCATION & TRAINING", "Coaching Centers"),
+    "tuition": ("🎓 EDUCATION & TRAINING", "Tuition Centers"),
+    "book": ("🎓 EDUCATION & TRAINING", "Book Stores"),
+    "stationery": ("🎓 EDUCATION & TRAINING", "Stationery"),
+
+    # Business & Professional
+    "bank": ("💼 BUSINESS & PROFESSIONAL", "Banks"),
+    "atm": ("💼 BUSINESS & PROFESSIONAL", "ATMs"),
+    "insurance": ("💼 BUSINESS & PROFESSIONAL", "Insurance"),
+    "lawyer": ("💼 BUSINESS & PROFESSIONAL", "Lawyers"),
+    "real estate": ("💼 BUSINESS & PROFESSIONAL", "Real Estate"),
+    "property": ("💼 BUSINESS & PROFESSIONAL", "Property Dealers"),
+
+    # Travel & Stay
+    "hotel": ("🏨 TRAVEL & STAY", "Hotels"),
+    "guest house": ("🏨 TRAVEL & STAY", "Guest Houses"),
+    "lodge": ("🏨 TRAVEL & STAY", "Lodges"),
+    "travel": ("🏨 TRAVEL & STAY", "Travel Agencies"),
+    "tour": ("🏨 TRAVEL & STAY", "Tour Operators"),
+}
+
+class CompiledCategorizer:
+    """Keyword categorizer compiled once into a single regex
+
+    word_boundaries=True matches keywords at the start of a word, so stems still
+    catch their longer forms ("auto" -> "Automobiles", "book" -> "Bookstore",
+    "repair" -> "Repairing") while keywords inside a word no longer fire
+    ("bag" in "Rambagh", "tile" in "Textiles", "car" in "Oscar"). With False
+    it reproduces the original substring matching exactly.
+    """
+
+    def __init__(self, mapping=None, word_boundaries=True, cache_size=4096):
+        self.mapping = mapping or CATEGORY_MAPPING
+        self.word_boundaries = word_boundaries
+        self.cache_size = cache_size
+        self._keywords = list(self.mapping)
+        self._rank = {keyword: index for index, keyword in enumerate(self._keywords)}
+
+        # Longest first so the alternation prefers "general store" over any shorter keyword
+        alternation = "|".join(re.escape(keyword) for keyword in sorted(self._keywords, key=len, reverse=True))
+        if word_boundaries:
+            self.pattern = re.compile(rf"\b({alternation})\w*")
+        else:
+            # Zero-width lookahead finds overlapping hits, like `keyword in text` per keyword
+            self.pattern = re.compile(rf"(?=({alternation}))")
+
+        self._cache = {}  # search query -> matched keyword ranks
+
+    def _ranks(self, text):
+        return {self._rank[match] for match in self.pattern.findall(text.lower())}
+
+    def _query_ranks(self, search_query):
+        """Cached - a query is categorized once however many listings it returned"""
+        ranks = self._cache.get(search_query)
+        if ranks is None:
+            ranks = frozenset(self._ranks(search_query))
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[search_query] = ranks
+        return ranks
+
+    def _resolve(self, ranks, google_types=None):
+        """Ranks -> (categories, subcategories) in mapping order, first occurrence wins"""
+        categories = []
+        subcategories = []
+        for rank in sorted(ranks):
+            category, subcategory = self.mapping[self._keywords[rank]]
+            if category not in categories:
+                categories.append(category)
+            if subcategory not in subcategories:
+                subcategories.append(subcategory)
+
+        # If no match found, use Google types
+        if not categories and google_types:
+            for gtype in google_types:
+                if gtype in self.mapping:
+                    category, subcategory = self.mapping[gtype]
+                    if category not in categories:
+                        categories.append(category)
+                    if subcategory not in subcategories:
+                        subcategories.append(subcategory)
+
+        # Default fallback
+        if not categories:
+            return [DEFAULT_CATEGORY], [DEFAULT_SUBCATEGORY]
+        return categories, subcategories
+
+    def categorize(self, search_query, business_name, google_types=None):
+        """Same contract as categorize_business"""
+        ranks = self._query_ranks(search_query or "")
+        if business_name:
+            ranks = ranks | self._ranks(business_name)
+        return self._resolve(ranks, google_types)
+
+    def categorize_many(self, items):
+        """Batch: items of (search_query, business_name[, google_types]) -> list of results"""
+        return [self.categorize(*item) for item in items]
+
+    def categorize_dataframe(self, df, query_column="search_query", name_column="name", types_column=None):
+        """Add categories/subcategories/primary_* columns to a DataFrame in one pass over its rows"""
+        queries = df[query_column] if query_column in df else [""] * len(df)
+        types = df[types_column] if types_column and types_column in df else [None] * len(df)
+        results = [
+            self.categorize(query if isinstance(query, str) else "",
+                            name if isinstance(name, str) else "",
+                            gtypes if isinstance(gtypes, list) else None)
+            for query, name, gtypes in zip(queries, df[name_column], types)
+        ]
+
+        df = df.copy()
+        df["categories"] = [categories for categories, _ in results]
+        df["subcategories"] = [subcategories for _, subcategories in results]
+        df["primary_category"] = [categories[0] for categories, _ in results]
+        df["primary_subcategory"] = [subcategories[0] for _, subcategories in results]
+        return df
+
+DEFAULT_CATEGORIZER = CompiledCategorizer()
+
+def linear_categorize(search_query, business_name, google_types=None):
+    """The previous implementation (mapping rebuilt per call, one substring scan per keyword) - benchmark baseline"""
+    category_mapping = dict(CATEGORY_MAPPING)
+    categories = []
+    subcategories = []
+
+    search_lower = search_query.lower()
+    name_lower = (business_name or "").lower()
+
+    for keyword, (category, subcategory) in category_mapping.items():
+        if keyword in search_lower or keyword in name_lower:
+            if category not in categories:
+                categories.append(category)
+            if subcategory not in subcategories:
+                subcategories.append(subcategory)
+
+    if not categories and google_types:
+        for gtype in google_types:
+            if gtype in category_mapping:
+                category, subcategory = category_mapping[gtype]
+                if category not in categories:
+                    categories.append(category)
+                if subcategory not in subcategories:
+                    subcategories.append(subcategory)
+
+    if not categories:
+        categories = [DEFAULT_CATEGORY]
+        subcategories = [DEFAULT_SUBCATEGORY]
+
+    return categories, subcategories
+
+def benchmark(count=50000, seed=7):
+    """Time the linear function against the compiled categorizer on synthetic scraper-like input"""
+    rng = random.Random(seed)
+    keywords = list(CATEGORY_MAPPING)
+    areas = ["Freeganj", "Nanakheda", "Dewas Gate", "Mahakal Area", "Madhav Nagar", "Tower Chowk"]
+    words = ["Shree", "Ram", "Mahakal", "New", "Royal", "Ujjain", "Centre", "Brothers", "Traders", "& Sons"]
+
+    # Scraped data repeats each query for every listing it returned
+    queries = [f"{rng.choice(keywords)} in {rng.choice(areas)}, Ujjain" for _ in range(max(1, count // 20))]
+    items = [
+        (rng.choice(queries), " ".join(rng.sample(words, 2) + [rng.choice(keywords).title()]))
+        for _ in range(count)
+    ]
+
+    start = time.perf_counter()
+    for query, name in items:
+        linear_categorize(query, name)
+    linear_seconds = time.perf_counter() - start
+
+    substring = CompiledCategorizer(word_boundaries=False)
+    start = time.perf_counter()
+    substring_results = substring.categorize_many(items)
+    substring_seconds = time.perf_counter() - start
+
+    compiled = CompiledCategorizer()
+    start = time.perf_counter()
+    compiled.categorize_many(items)
+    compiled_seconds = time.perf_counter() - start
+
+    mismatches = sum(1 for item, result in zip(items, substring_results) if linear_categorize(*item) != result)
+
+    return {
+        "businesses": count,
+        "linear_seconds": linear_seconds,
+        "compiled_substring_seconds": substring_seconds,
+        "compiled_word_seconds": compiled_seconds,
+        "speedup": linear_seconds / compiled_seconds if compiled_seconds else 0,
+        "substring_mismatches": mismatches,
+    }
+
+def main():
+    print("🔥 CATEGORIZER BENCHMARK 🔥")
+    print("=" * 60)
+    result = benchmark()
+    print(f"📊 Businesses: {result['businesses']:,}")
+    print(f"🐢 Linear categorize_business: {result['linear_seconds']:.3f}s")
+    print(f"⚡ Compiled (substring mode): {result['compiled_substring_seconds']:.3f}s "
+          f"({result['substring_mismatches']} results differ from linear)")
+    print(f"⚡ Compiled (word starts): {result['compiled_word_seconds']:.3f}s")
+    print(f"🚀 Speedup: {result['speedup']:.1f}x")
+
+if __name__ == "__main__":
+    main()
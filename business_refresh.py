@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+🔥 INCREMENTAL REFRESH - RE-VISIT ONLY STALE OR CHANGING BUSINESSES 🔥
+Rank stored businesses by age and change likelihood, open their place URLs directly, record field diffs
+"""
+
+import math
+import time
+import argparse
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from business_store import DEFAULT_STORE_PATH, BusinessStore
+from place_detail_scraper import DetailConfig, detail_fields, scrape_places, target_url
+from resource_filter import DEFAULT_PROFILE, RESOURCE_PROFILES
+from scraper_metrics import start_metrics_server
+
+@dataclass
+class RefreshConfig:
+    """Which businesses a refresh run re-visits"""
+    limit: int = 500  # visits per run - the nightly budget
+    min_age_days: float = 1.0  # never re-visit anything newer than this
+    max_age_days: float = 30.0  # age at which a quiet business is as urgent as a busy one at half the age
+    activity_weight: float = 1.0  # how much change likelihood outweighs plain age
+    failure_backoff_days: float = 1.0  # wait after a failed visit, doubled per further failure
+    max_failures: int = 5  # failed visits in a row before a place is no longer refreshed
+    concurrency: int = DetailConfig.concurrency  # place pages open at once
+    headless: bool = True
+    resource_profile: str = DEFAULT_PROFILE
+
+def change_likelihood(record, history):
+    """0-2 estimate of how likely a business changed since its last visit
+
+    Businesses refreshed before are judged by how often a visit found changes
+    and how fast their review count grows; new ones by their review count
+    (busy places change hours, phones and ratings more often).
+    """
+    if history and history['refreshes']:
+        likelihood = history['changed'] / history['refreshes']
+        if history['reviews_per_day']:
+            likelihood += min(max(history['reviews_per_day'], 0) * 7 / 10, 1)  # 10+ reviews a week = max
+        return likelihood
+    return min(math.log10(1 + (record.get('reviews_count') or 0)) / 3, 1)  # 1000 reviews = max
+
+def refresh_priority(record, history, now, config):
+    """Higher first: age in units of max_age_days, boosted by change likelihood"""
+    try:
+        age_days = (now - datetime.fromisoformat(record['scraped_at'])).total_seconds() / 86400
+    except (KeyError, TypeError, ValueError):
+        age_days = config.max_age_days  # unknown age - treat as due
+    return age_days / config.max_age_days * (1 + config.activity_weight * change_likelihood(record, history))
+
+def plan_refresh(store, config):
+    """[(score, business_id, record)] of the businesses worth a visit, most urgent first"""
+    now = datetime.now()
+    cutoff = (now - timedelta(days=config.min_age_days)).isoformat()
+    history = store.change_history()
+    plan = [
+        (refresh_priority(record, history.get(business_id), now, config), business_id, record)
+        for business_id, record in store.refresh_candidates(cutoff, config.failure_backoff_days, config.max_failures)
+        if target_url(record.get('google_place_id') or record.get('place_id'))
+    ]
+    plan.sort(key=lambda item: item[0], reverse=True)
+    return plan[:config.limit]
+
+def refresh_businesses(store, plan, config):
+    """Open every planned place URL on a page pool, merge what the detail pane shows and record the diffs"""
+    stats = {'visited': len(plan), 'changed': 0, 'unchanged': 0, 'failed': 0, 'given_up': 0, 'fields': Counter()}
+    by_url = {
+        target_url(record.get('google_place_id') or record.get('place_id'), record.get('name')): (business_id, record)
+        for _, business_id, record in plan
+    }
+    refreshed = set()
+
+    def record_refresh(url, business):
+        business_id, record = by_url[url]
+        refreshed.add(url)
+        diffs = store.apply_refresh(business_id, detail_fields(business))
+        if diffs:
+            stats['changed'] += 1
+            stats['fields'].update(field for field, _, _ in diffs)
+            changes = ", ".join(f"{field} {old!r} → {new!r}" for field, old, new in diffs)
+            print(f"🔄 {record.get('name')}: {changes}")
+        else:
+            stats['unchanged'] += 1
+
+    detail_config = DetailConfig(concurrency=config.concurrency, headless=config.headless,
+                                 resource_profile=config.resource_profile)
+    _, scraper = scrape_places(list(by_url), detail_config, record_refresh)
+    scraper.print_stats()
+
+    # Failed visits back off, so dead places don't take the top of every plan
+    for url, (business_id, _) in by_url.items():
+        if url not in refreshed:
+            stats['failed'] += 1
+            if store.record_refresh_failure(business_id) >= config.max_failures:
+                stats['given_up'] += 1
+    return stats
+
+def print_refresh_stats(stats, stored, queries, seconds):
+    print(f"\n🔄 Refreshed {stats['visited']:,} of {stored:,} stored businesses "
+          f"({stats['visited'] / stored * 100 if stored else 0:.1f}%) in {seconds / 60:.1f} minutes")
+    print(f"   {stats['changed']:,} changed, {stats['unchanged']:,} unchanged, {stats['failed']:,} failed "
+          f"({stats['given_up']:,} failed too often and won't be refreshed again)")
+    for field, count in stats['fields'].most_common():
+        print(f"   ✏️  {field}: {count:,}")
+    if stats['visited']:
+        print(f"⚡ {seconds / stats['visited']:.1f}s per business, no searching or scrolling - "
+              f"a full crawl would re-run {queries:,} queries")
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-visit the stalest / most changing stored businesses")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH)
+    parser.add_argument("--limit", type=int, default=RefreshConfig.limit, help="Businesses to re-visit this run")
+    parser.add_argument("--min-age-days", type=float, default=RefreshConfig.min_age_days)
+    parser.add_argument("--max-age-days", type=float, default=RefreshConfig.max_age_days)
+    parser.add_argument("--max-failures", type=int, default=RefreshConfig.max_failures,
+                        help="Stop refreshing a place after this many failed visits in a row")
+    parser.add_argument("--concurrency", type=int, default=RefreshConfig.concurrency, help="Place pages open at once")
+    parser.add_argument("--resources", choices=list(RESOURCE_PROFILES), default=DEFAULT_PROFILE)
+    parser.add_argument("--show-browser", action="store_true", help="Run the browser with a window")
+    parser.add_argument("--dry-run", action="store_true", help="Only print what would be refreshed")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve live Prometheus metrics on this local port, e.g. 9464")
+    args = parser.parse_args()
+
+    config = RefreshConfig(limit=args.limit, min_age_days=args.min_age_days, max_age_days=args.max_age_days,
+                           max_failures=args.max_failures, concurrency=args.concurrency,
+                           headless=not args.show_browser, resource_profile=args.resources)
+    store = BusinessStore(args.store)
+    plan = plan_refresh(store, config)
+    print(f"🎯 {len(plan):,} businesses due for a refresh (limit {config.limit:,})")
+
+    if args.dry_run:
+        for score, business_id, record in plan[:25]:
+            print(f"   {score:5.2f}  {record.get('scraped_at', '')[:10]}  {record.get('name')}")
+        store.close()
+        return
+
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port, "business_refresh")
+    start = time.time()
+    stats = refresh_businesses(store, plan, config)
+    print_refresh_stats(stats, store.count(), len(store.query_counts()), time.time() - start)
+    store.close()
+
+if __name__ == "__main__":
+    main()
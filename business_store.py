@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+🔥 BUSINESS STORE - ONE DATABASE INSTEAD OF 10,000 CSV FILES 🔥
+Append-friendly SQLite (WAL) store of every scraped business, indexed by place ID, category and area
+"""
+
+import json
+import os
+import sqlite3
+import time
+import hashlib
+import argparse
+from datetime import datetime, timedelta
+import pandas as pd
+
+DEFAULT_STORE_PATH = os.path.join('Ujjain_Business_Data', 'businesses.sqlite')
+
+# Queried columns get their own column; everything else stays in the JSON record
+INDEXED_COLUMNS = (
+    'place_id', 'name', 'primary_category', 'primary_subcategory', 'area', 'phone_number',
+    'image_url', 'latitude', 'longitude', 'reviews_count', 'reviews_average', 'scraped_at',
+)
+
+def document_id(place_id, name=None, address=None, phone_number=None):
+    """Stable business ID: the Google place ID, else a hash of name/address/phone"""
+    if place_id:
+        return place_id.replace('/', '_')
+    key = "|".join(str(value or "").strip().lower() for value in (name, address, phone_number))
+    return "bz_" + hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+def record_id(record):
+    return document_id(record.get('google_place_id') or record.get('place_id'),
+                       record.get('name'), record.get('address'), record.get('phone_number'))
+
+# Fields a refresh compares; photo URLs are re-signed on every visit, so they are updated but never diffed
+TRACKED_FIELDS = (
+    'name', 'address', 'website', 'phone_number', 'opening_hours', 'business_status',
+    'reviews_count', 'reviews_average', 'latitude', 'longitude',
+)
+
+def same_value(field, old, new):
+    if field in ('latitude', 'longitude') and old is not None and new is not None:
+        return abs(float(old) - float(new)) < 1e-4  # ~10m - URL coordinates jitter between visits
+    return old == new
+
+def day_range(date):
+    """[start, end) ISO bounds of a YYYY-MM-DD day, for range scans on scraped_at"""
+    start = datetime.strptime(date, "%Y-%m-%d")
+    return start.isoformat(), (start + timedelta(days=1)).isoformat()
+
+class BusinessStore:
+    """Every business once, keyed by place ID, plus which queries found it
+
+    save_query() writes one query's businesses in a single transaction, so the
+    store always holds whole queries; a business found again by a later query
+    is updated in place instead of duplicated.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # The parallel scraper saves from a worker thread (one writer at a time)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS businesses (
+                id TEXT PRIMARY KEY,
+                place_id TEXT,
+                name TEXT,
+                primary_category TEXT,
+                primary_subcategory TEXT,
+                area TEXT,
+                phone_number TEXT,
+                image_url TEXT,
+                latitude REAL,
+                longitude REAL,
+                reviews_count INTEGER,
+                reviews_average REAL,
+                scraped_at TEXT,
+                record TEXT NOT NULL
+            )
+        """)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS query_results (
+                query TEXT NOT NULL,
+                business_id TEXT NOT NULL,
+                PRIMARY KEY (query, business_id)
+            ) WITHOUT ROWID
+        """)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS queries (
+                query TEXT PRIMARY KEY,
+                businesses INTEGER NOT NULL,
+                saved_at REAL NOT NULL
+            )
+        """)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS business_changes (
+                business_id TEXT NOT NULL,
+                field TEXT NOT NULL,
+                old_value TEXT,
+                new_value TEXT,
+                days REAL,
+                changed_at REAL NOT NULL
+            )
+        """)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS refresh_failures (
+                business_id TEXT PRIMARY KEY,
+                failures INTEGER NOT NULL,
+                last_attempt_at REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS business_changes_business ON business_changes (business_id)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS businesses_place_id ON businesses (place_id)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS businesses_category ON businesses (primary_category)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS businesses_area ON businesses (area)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS businesses_scraped_at ON businesses (scraped_at)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS query_results_business ON query_results (business_id)")
+        self.db.commit()
+
+    def save_query(self, query, records, also_found=()):
+        """Upsert one query's business dicts (e.g. asdict(business)); returns how many
+
+        also_found: place IDs the query listed but skipped as already scraped,
+        so its result set (what the query planner compares) stays complete.
+        """
+        rows = []
+        for record in records:
+            row = [record_id(record), record.get('google_place_id') or record.get('place_id')]
+            row.extend(record.get(column) for column in INDEXED_COLUMNS[1:])
+            row.append(json.dumps(record, ensure_ascii=False, default=str))
+            rows.append(row)
+
+        columns = ('id',) + INDEXED_COLUMNS + ('record',)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+        with self.db:
+            self.db.executemany(
+                f"INSERT INTO businesses ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT (id) DO UPDATE SET {updates}",
+                rows
+            )
+            self.db.executemany("INSERT OR IGNORE INTO query_results (query, business_id) VALUES (?, ?)",
+                                [(query, row[0]) for row in rows] +
+                                [(query, document_id(place_id)) for place_id in also_found if place_id])
+            self.db.execute("INSERT OR REPLACE INTO queries (query, businesses, saved_at) VALUES (?, ?, ?)",
+                            (query, len(rows), time.time()))
+            # Listed again by a search - whatever made its refreshes fail is over
+            self.db.executemany("DELETE FROM refresh_failures WHERE business_id = ?",
+                                [(row[0],) for row in rows] +
+                                [(document_id(place_id),) for place_id in also_found if place_id])
+        return len(rows)
+
+    def refresh_candidates(self, scraped_before, backoff_days=1.0, max_failures=5):
+        """(id, record) of businesses with a place ID last scraped before an ISO timestamp
+
+        Places whose last visits failed wait backoff_days, doubling with every
+        failure, and drop out after max_failures - closed or moved places would
+        otherwise stay the stalest candidates forever.
+        """
+        for business_id, record in self.db.execute(
+                "SELECT b.id, b.record FROM businesses b LEFT JOIN refresh_failures f ON f.business_id = b.id "
+                "WHERE b.scraped_at < ? AND b.place_id IS NOT NULL AND (f.failures IS NULL OR "
+                "(f.failures < ? AND f.last_attempt_at + ? * (1 << (f.failures - 1)) <= ?))",
+                (scraped_before, max_failures, backoff_days * 86400, time.time())):
+            yield business_id, json.loads(record)
+
+    def record_refresh_failure(self, business_id):
+        """Count a visit that got no detail pane; returns the business's consecutive failures"""
+        with self.db:
+            self.db.execute(
+                "INSERT INTO refresh_failures (business_id, failures, last_attempt_at) VALUES (?, 1, ?) "
+                "ON CONFLICT (business_id) DO UPDATE SET failures = failures + 1, "
+                "last_attempt_at = excluded.last_attempt_at",
+                (business_id, time.time()))
+        return self.db.execute("SELECT failures FROM refresh_failures WHERE business_id = ?",
+                               (business_id,)).fetchone()[0]
+
+    def missing_fields(self, fields):
+        """(id, record) of businesses with a place ID but none of some field, e.g. read from payloads unclicked"""
+        checks = " OR ".join(
+            f"{field} IS NULL" if field in INDEXED_COLUMNS else f"json_extract(record, '$.{field}') IS NULL"
+            for field in fields
+        )
+        for business_id, record in self.db.execute(
+                f"SELECT id, record FROM businesses WHERE place_id IS NOT NULL AND ({checks})"):
+            yield business_id, json.loads(record)
+
+    def change_history(self):
+        """{business_id: {'refreshes': n, 'changed': n, 'reviews_per_day': x}} from earlier refreshes"""
+        history = {
+            business_id: {'refreshes': refreshes, 'changed': changed, 'reviews_per_day': None}
+            for business_id, refreshes, changed in self.db.execute(
+                "SELECT business_id, COUNT(DISTINCT changed_at), "
+                "COUNT(DISTINCT CASE WHEN field != '' THEN changed_at END) "
+                "FROM business_changes GROUP BY business_id")
+        }
+        # Review growth between the last two visits that saw the count change
+        for business_id, old, new, days in self.db.execute(
+                "SELECT business_id, old_value, new_value, days FROM business_changes "
+                "WHERE field = 'reviews_count' AND days > 0 ORDER BY changed_at"):
+            try:
+                history[business_id]['reviews_per_day'] = (int(json.loads(new)) - int(json.loads(old))) / days
+            except (TypeError, ValueError):
+                pass
+        return history
+
+    def apply_refresh(self, business_id, fresh):
+        """Merge a re-scraped business dict into the stored one and record field diffs
+
+        Only fields the fresh scrape actually has overwrite the stored record, so
+        categories and area from the original query survive. Returns
+        [(field, old, new)]; an unchanged visit is logged too (as an empty field)
+        so change rates count every refresh.
+        """
+        row = self.db.execute("SELECT record FROM businesses WHERE id = ?", (business_id,)).fetchone()
+        if row is None:
+            return None
+        record = json.loads(row[0])
+        now = time.time()
+        try:
+            days = (datetime.fromisoformat(fresh['scraped_at']) -
+                    datetime.fromisoformat(record['scraped_at'])).total_seconds() / 86400
+        except (KeyError, TypeError, ValueError):
+            days = None
+
+        diffs = []
+        for field in TRACKED_FIELDS:
+            new = fresh.get(field)
+            if new in (None, '', []):
+                continue
+            if not same_value(field, record.get(field), new):
+                diffs.append((field, record.get(field), new))
+        record.update({key: value for key, value in fresh.items() if value not in (None, '', [])})
+
+        columns = INDEXED_COLUMNS[1:]
+        with self.db:
+            self.db.execute(
+                f"UPDATE businesses SET {', '.join(f'{column} = ?' for column in columns)}, record = ? WHERE id = ?",
+                [record.get(column) for column in columns] +
+                [json.dumps(record, ensure_ascii=False, default=str), business_id]
+            )
+            self.db.executemany(
+                "INSERT INTO business_changes (business_id, field, old_value, new_value, days, changed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(business_id, field, json.dumps(old, ensure_ascii=False, default=str),
+                  json.dumps(new, ensure_ascii=False, default=str), days, now) for field, old, new in diffs]
+                or [(business_id, '', None, None, days, now)]
+            )
+            self.db.execute("DELETE FROM refresh_failures WHERE business_id = ?", (business_id,))
+        return diffs
+
+    def changes(self, since=None):
+        """[(business_id, name, field, old, new, changed_at)] of recorded diffs, newest first"""
+        return [
+            (business_id, name, field, json.loads(old), json.loads(new), changed_at)
+            for business_id, name, field, old, new, changed_at in self.db.execute(
+                "SELECT c.business_id, b.name, c.field, c.old_value, c.new_value, c.changed_at "
+                "FROM business_changes c LEFT JOIN businesses b ON b.id = c.business_id "
+                "WHERE c.field != '' AND c.changed_at >= ? ORDER BY c.changed_at DESC", (since or 0,))
+        ]
+
+    def _where(self, date=None, category=None, area=None):
+        clauses, params = [], []
+        if date:
+            clauses.append("scraped_at >= ? AND scraped_at < ?")
+            params.extend(day_range(date))
+        if category:
+            clauses.append("primary_category = ?")
+            params.append(category)
+        if area:
+            clauses.append("area = ?")
+            params.append(area)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count(self, date=None, category=None, area=None):
+        where, params = self._where(date, category, area)
+        return self.db.execute(f"SELECT COUNT(*) FROM businesses{where}", params).fetchone()[0]
+
+    def get(self, place_id):
+        """Business record by place ID (or store ID), None if unknown"""
+        row = self.db.execute("SELECT record FROM businesses WHERE place_id = ? OR id = ? LIMIT 1",
+                              (place_id, place_id)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def records(self, date=None, category=None, area=None):
+        """Iterate business dicts, optionally only one day / category / area"""
+        where, params = self._where(date, category, area)
+        for (record,) in self.db.execute(f"SELECT record FROM businesses{where}", params):
+            yield json.loads(record)
+
+    def frame(self, date=None, category=None, area=None):
+        """Matching businesses as a flat DataFrame (same columns as the per-query CSVs)"""
+        return pd.json_normalize(list(self.records(date, category, area)), sep="_")
+
+    def breakdown(self, column, date=None):
+        """{value: businesses} for primary_category or area, largest first"""
+        if column not in ('primary_category', 'primary_subcategory', 'area'):
+            raise ValueError(f"Cannot group by {column}")
+        where, params = self._where(date)
+        return dict(self.db.execute(
+            f"SELECT {column}, COUNT(*) FROM businesses{where} GROUP BY {column} ORDER BY COUNT(*) DESC", params))
+
+    def query_counts(self, date=None):
+        """[(query, businesses)] of the queries saved (on a given day), in saving order"""
+        sql = "SELECT query, businesses FROM queries"
+        params = []
+        if date:
+            start, end = day_range(date)
+            sql += " WHERE saved_at >= ? AND saved_at < ?"
+            params = [datetime.fromisoformat(start).timestamp(), datetime.fromisoformat(end).timestamp()]
+        return self.db.execute(sql + " ORDER BY saved_at", params).fetchall()
+
+    def query_result_sets(self):
+        """{query: set of business IDs it found} for every saved query (empty sets included)"""
+        results = {query: set() for query, _ in self.query_counts()}
+        for query, business_id in self.db.execute("SELECT query, business_id FROM query_results"):
+            results.setdefault(query, set()).add(business_id)
+        return results
+
+    def query_sample(self, query):
+        """First stored business of a query, None if it found nothing"""
+        row = self.db.execute(
+            "SELECT b.record FROM query_results q JOIN businesses b ON b.id = q.business_id "
+            "WHERE q.query = ? LIMIT 1", (query,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def summary(self, date=None):
+        """Totals, coverage and data quality in one pass over the indexed columns"""
+        where, params = self._where(date)
+        total, with_images, with_phone, with_coordinates, with_reviews = self.db.execute(
+            "SELECT COUNT(*), "
+            "COUNT(NULLIF(image_url, '')), "
+            "COUNT(NULLIF(phone_number, '')), "
+            "SUM(latitude IS NOT NULL AND longitude IS NOT NULL), "
+            "SUM(COALESCE(reviews_count, 0) > 0) "
+            f"FROM businesses{where}", params).fetchone()
+        return {
+            "total_businesses": total,
+            "total_queries": len(self.query_counts(date)),
+            "categories_covered": sorted(value for value in self.breakdown('primary_category', date) if value),
+            "locations_covered": sorted(value for value in self.breakdown('area', date) if value),
+            "data_quality": {
+                "with_images": with_images,
+                "with_phone": with_phone,
+                "with_coordinates": with_coordinates or 0,
+                "with_reviews": with_reviews or 0,
+            },
+        }
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize or export the business store")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH)
+    parser.add_argument("--date", help="Only businesses scraped on this day (YYYY-MM-DD)")
+    parser.add_argument("--category", help="Only this primary category")
+    parser.add_argument("--area", help="Only this area")
+    parser.add_argument("--export", help="Write the matching businesses to this .csv/.parquet file")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.store):
+        print(f"❌ No business store at {args.store}")
+        return
+
+    store = BusinessStore(args.store)
+    if args.export:
+        df = store.frame(args.date, args.category, args.area)
+        if args.export.endswith('.parquet'):
+            from columnar_export import save_parquet
+            save_parquet(df, args.export)
+        else:
+            df.to_csv(args.export, index=False)
+        print(f"✅ {len(df):,} businesses exported: {args.export}")
+    else:
+        summary = store.summary(args.date)
+        print(f"🗃️  {summary['total_businesses']:,} businesses from {summary['total_queries']:,} queries")
+        for category, count in store.breakdown('primary_category', args.date).items():
+            print(f"   📂 {category or 'Uncategorized'}: {count:,}")
+        print(f"📍 {len(summary['locations_covered'])} areas covered")
+        for key, value in summary['data_quality'].items():
+            print(f"   ✅ {key.replace('_', ' ')}: {value:,}")
+    store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+🔥 COLUMNAR EXPORT - PARQUET & FEATHER FOR BIG BUSINESS DATASETS 🔥
+Typed, compressed, column-selectable output (needs pyarrow: pip install pyarrow)
+"""
+
+import os
+import glob
+import time
+import argparse
+import pandas as pd
+from dataset_writers import iter_records
+
+try:
+    import pyarrow  # noqa: F401 - pandas picks it up as the Parquet/Feather engine
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+COLUMNAR_FORMATS = ("parquet", "feather")
+
+# Few distinct values repeated on every row - stored once per file as dictionaries
+CATEGORY_COLUMNS = (
+    'category', 'subcategory', 'primary_category', 'primary_subcategory', 'location', 'area',
+    'city', 'state', 'business_status', 'source', 'data_type',
+)
+FLOAT32_COLUMNS = ('latitude', 'longitude', 'reviews_average', 'rating')  # float32 is ~1m precision here
+INTEGER_COLUMNS = {'reviews_count': 'Int32', 'user_ratings_total': 'Int32', 'price_level': 'Int8'}
+BOOLEAN_COLUMNS = ('verified', 'claimed', 'permanently_closed')
+DATETIME_COLUMNS = ('scraped_at',)
+
+def require_pyarrow():
+    if not HAS_PYARROW:
+        raise ImportError("Parquet/Feather output needs pyarrow: pip install pyarrow")
+
+def typed_frame(df):
+    """Copy of a business DataFrame with compact, typed columns (lists stay lists)"""
+    df = df.copy()
+    for column in df.columns:
+        if column in CATEGORY_COLUMNS:
+            df[column] = df[column].astype('category')
+        elif column in FLOAT32_COLUMNS:
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype('float32')
+        elif column in INTEGER_COLUMNS:
+            df[column] = pd.to_numeric(df[column], errors='coerce').round().astype(INTEGER_COLUMNS[column])
+        elif column in BOOLEAN_COLUMNS:
+            df[column] = df[column].astype('boolean')
+        elif column in DATETIME_COLUMNS:
+            df[column] = pd.to_datetime(df[column], errors='coerce')
+        elif df[column].dtype == object and not df[column].map(lambda value: isinstance(value, (list, dict))).any():
+            df[column] = df[column].astype('string')
+    return df
+
+def save_parquet(df, path, partition_cols=None, compression="zstd"):
+    """Write a typed Parquet file, or a hive-partitioned folder (path/area=…/…) with partition_cols"""
+    require_pyarrow()
+    df = typed_frame(df)
+    if partition_cols:
+        missing = [column for column in partition_cols if column not in df.columns]
+        if missing:
+            raise ValueError(f"Cannot partition by missing column(s): {', '.join(missing)}")
+        df.to_parquet(path, engine="pyarrow", compression=compression, partition_cols=list(partition_cols),
+                      index=False, existing_data_behavior="delete_matching")
+    else:
+        df.to_parquet(path, engine="pyarrow", compression=compression, index=False)
+    return path
+
+def save_feather(df, path, compression="zstd"):
+    """Arrow IPC (Feather v2) file - memory-mappable, fastest to load whole"""
+    require_pyarrow()
+    typed_frame(df).reset_index(drop=True).to_feather(path, compression=compression)
+    return path
+
+def read_columns(path, columns=None, filters=None):
+    """Read only the needed columns (and partitions) of a Parquet file/folder or Feather file
+
+    e.g. read_columns(path, ['name', 'latitude', 'longitude'], filters=[('area', '==', 'Freeganj')])
+    """
+    require_pyarrow()
+    if path.endswith('.feather'):
+        df = pd.read_feather(path, columns=columns)
+        if filters:
+            for column, op, value in filters:
+                df = df[df[column] == value] if op == '==' else df[df[column].isin(value)]
+        return df
+    return pd.read_parquet(path, engine="pyarrow", columns=columns, filters=filters)
+
+def dataset_frame(paths):
+    """One DataFrame from dataset JSON/JSONL files or folders (summary files skipped)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            # A folder's complete_* file already holds every business of its per-category files
+            complete = sorted(glob.glob(os.path.join(path, 'complete_*.json*')))
+            files.extend(complete or sorted(glob.glob(os.path.join(path, '*.json')) +
+                                            glob.glob(os.path.join(path, '*.jsonl'))))
+        else:
+            files.append(path)
+
+    records = []
+    for file_path in files:
+        records.extend(record for record in iter_records(file_path) if isinstance(record, dict))
+    return pd.json_normalize(records, sep="_")
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert business datasets to Parquet/Feather")
+    parser.add_argument("paths", nargs="+", help="Dataset JSON/JSONL files or folders")
+    parser.add_argument("--out", default="ujjain_businesses", help="Output path without extension")
+    parser.add_argument("--format", choices=COLUMNAR_FORMATS, default="parquet")
+    parser.add_argument("--partition-by", nargs="*", default=None,
+                        help="Parquet only: columns to partition by, e.g. category location")
+    args = parser.parse_args()
+
+    require_pyarrow()
+    start = time.time()
+    df = dataset_frame(args.paths)
+    print(f"📂 {len(df):,} businesses, {len(df.columns)} columns")
+
+    if args.format == "parquet":
+        path = save_parquet(df, args.out if args.partition_by else args.out + ".parquet", args.partition_by)
+    else:
+        path = save_feather(df, args.out + ".feather")
+
+    print(f"✅ {args.format.title()} saved: {path} ({time.time() - start:.1f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,8 @@ import os
 import time
 import json
 from datetime import datetime
-import pandas as pd
+import argparse
+from business_store import DEFAULT_STORE_PATH, BusinessStore
 
 def calculate_extraction_estimates():
     """Calculate detailed extraction estimates"""
@@ -41,9 +42,8 @@ def calculate_extraction_estimates():
             "Complete Ujjain": f"{total_hours:.0f} hours ({total_hours/24:.1f} days)",
         },
         "💾 DATA VOLUME": {
-            "CSV Files": f"{total_queries:,} files",
-            "Excel Files": f"{total_queries:,} files", 
-            "Total File Size": "~2-3 GB",
+            "Business Store": "1 SQLite file, every query appended",
+            "Phase 1 Test Files": "CSV + Excel per test query",
             "Database Records": f"{total_businesses:,} records",
         },
         "🎯 QUALITY METRICS": {
@@ -104,7 +104,7 @@ def create_extraction_phases():
     
     return phases
 
-def start_complete_extraction():
+def start_complete_extraction(resume=False):
     """Start the complete Ujjain data extraction"""
     
     print("🔥 COMPLETE UJJAIN DATA EXTRACTION STARTING 🔥")
@@ -149,7 +149,7 @@ def start_complete_extraction():
         test_success = input("\n✅ Phase 1 completed. Continue with full extraction? (y/n): ").lower()
         
         if test_success == 'y':
-            run_complete_extraction()
+            run_complete_extraction(resume=resume)
         else:
             print("👋 Extraction stopped after test phase")
     else:
@@ -200,7 +200,8 @@ def run_phase_1_test():
             sys.executable,
             'google_maps_scraper_bazarse.py',
             '-t', '10',  # 10 businesses per query
-            '--test'
+            '--test',
+            '--formats', 'csv', 'excel'  # per-query files for the Phase 1 folder - the store gets them anyway
         ]
         
         print("🚀 Starting test scraping...")
@@ -229,7 +230,7 @@ def run_phase_1_test():
         print(f"❌ Phase 1 error: {e}")
         return False
 
-def run_complete_extraction():
+def run_complete_extraction(resume=False):
     """Run the complete extraction process"""
     
     print("\n🌟 STARTING COMPLETE UJJAIN EXTRACTION")
@@ -255,6 +256,10 @@ def run_complete_extraction():
             '-t', '25'  # 25 businesses per query
         ]
         
+        if resume:
+            # Pick up after the last query the crashed run journaled
+            cmd.append('--resume')
+        
         print("🔥 Full extraction started in background...")
         print("📁 Monitor progress in Complete_Ujjain_Data folder")
         
@@ -284,45 +289,26 @@ def move_data_to_phase_folder(phase_folder):
         except Exception as e:
             print(f"❌ Error moving data: {e}")
 
-def generate_summary_report():
+def generate_summary_report(store_path=DEFAULT_STORE_PATH):
     """Generate summary report of extraction"""
     
     today = datetime.now().strftime("%Y-%m-%d")
     base_dir = f"Complete_Ujjain_Data/{today}"
     
-    summary = {
-        "extraction_date": today,
-        "total_businesses": 0,
-        "total_files": 0,
-        "categories_covered": [],
-        "locations_covered": [],
-        "data_quality": {
-            "with_images": 0,
-            "with_phone": 0,
-            "with_coordinates": 0,
-            "with_reviews": 0
-        }
-    }
+    if not os.path.exists(store_path):
+        print(f"❌ No business store found at {store_path}")
+        return None
     
-    # Analyze extracted data
-    for phase_folder in os.listdir(base_dir):
-        if phase_folder.startswith("Phase_"):
-            phase_path = os.path.join(base_dir, phase_folder)
-            if os.path.isdir(phase_path):
-                csv_files = [f for f in os.listdir(phase_path) if f.endswith('.csv')]
-                summary["total_files"] += len(csv_files)
-                
-                for csv_file in csv_files:
-                    try:
-                        df = pd.read_csv(os.path.join(phase_path, csv_file))
-                        summary["total_businesses"] += len(df)
-                    except:
-                        pass
+    # One indexed query over the store instead of re-reading every per-query CSV
+    store = BusinessStore(store_path)
+    summary = {"extraction_date": today, **store.summary(date=today)}
+    store.close()
     
     # Save summary report
     summary_path = os.path.join(base_dir, "Summary_Reports", "extraction_summary.json")
+    os.makedirs(os.path.dirname(summary_path), exist_ok=True)
     with open(summary_path, 'w') as f:
-        json.dump(summary, f, indent=2)
+        json.dump(summary, f, indent=2, ensure_ascii=False)
     
     print(f"📊 Summary report saved: {summary_path}")
     return summary
@@ -357,11 +343,15 @@ def main():
     
     print("\n📁 DATA ORGANIZATION:")
     print("✅ Organized by phases and locations")
-    print("✅ CSV + Excel formats")
+    print("✅ One SQLite business store (CSV + Excel files for the Phase 1 test)")
     print("✅ Firebase-ready structure")
     print("✅ Summary reports and analytics")
     
-    start_complete_extraction()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resume", action="store_true", help="Resume the full extraction from its progress journal")
+    args = parser.parse_args()
+    
+    start_complete_extraction(resume=args.resume)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+🔥 STREAMING DATASET WRITERS - CONSTANT MEMORY OUTPUT 🔥
+Write business records to disk as they are produced (JSON arrays or JSON Lines)
+"""
+
+import json
+import os
+
+OUTPUT_FORMATS = ("json", "jsonl")
+
+class JsonArrayWriter:
+    """Writes a JSON array one element at a time - same layout as json.dump(records, indent=2)"""
+
+    extension = ".json"
+
+    def __init__(self, path, indent=2):
+        self.path = path
+        self.indent = indent
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write("[")
+
+    def write(self, record):
+        text = json.dumps(record, indent=self.indent, ensure_ascii=False)
+        if self.indent:
+            pad = " " * self.indent
+            text = "\n".join(pad + line for line in text.split("\n"))
+            self._file.write(("," if self.count else "") + "\n" + text)
+        else:
+            self._file.write(("," if self.count else "") + text)
+        self.count += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.write("\n]" if self.count and self.indent else "]")
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class JsonLinesWriter:
+    """One JSON object per line - appendable and readable record by record"""
+
+    extension = ".jsonl"
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def open_record_writer(path_without_extension, output_format="json"):
+    """Writer for the chosen format; the extension is added to the path"""
+    if output_format == "json":
+        return JsonArrayWriter(path_without_extension + JsonArrayWriter.extension)
+    if output_format == "jsonl":
+        return JsonLinesWriter(path_without_extension + JsonLinesWriter.extension)
+    raise ValueError(f"Unknown output format: {output_format} (choose from {', '.join(OUTPUT_FORMATS)})")
+
+def iter_records(path):
+    """Read back either format without loading a .jsonl file into memory"""
+    if os.path.splitext(path)[1] == JsonLinesWriter.extension:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+🔥 ONE-ROUND-TRIP DETAIL EXTRACTION 🔥
+Read every Business field of the open detail pane with a single page.evaluate instead of ~10 locator calls
+"""
+
+import time
+import argparse
+from playwright.sync_api import sync_playwright
+from scraper_metrics import METRICS
+
+# Everything the detail pane shows, read in the page - one Playwright round trip per business
+DETAIL_PANE_JS = """
+() => {
+    const text = selector => {
+        const element = document.querySelector(selector);
+        return element ? element.innerText.trim() : null;
+    };
+    const rating = document.querySelector('div[jsaction="pane.reviewChart.moreReviews"] div[role="img"]');
+    return {
+        name: text('h1.DUwDvf'),
+        address: text('button[data-item-id="address"] div[class*="fontBodyMedium"]'),
+        domain: text('a[data-item-id="authority"] div[class*="fontBodyMedium"]'),
+        phone_number: text('button[data-item-id*="phone:tel:"] div[class*="fontBodyMedium"]'),
+        reviews_text: text('div[jsaction="pane.reviewChart.moreReviews"] span'),
+        rating_label: rating ? rating.getAttribute('aria-label') : null,
+        photos: Array.from(document.querySelectorAll('div[class*="ZKCDEc"] img'))
+            .slice(0, 5).map(image => image.getAttribute('src')).filter(Boolean),
+        opening_hours: text('div[class*="OqCZI"] div[class*="fontBodyMedium"]'),
+    };
+}
+"""
+
+def extract_coordinates_from_url(url: str) -> tuple[float, float]:
+    """Extract coordinates from Google Maps URL"""
+    try:
+        coordinates = url.split('/@')[-1].split('/')[0]
+        lat, lng = coordinates.split(',')[:2]
+        return float(lat), float(lng)
+    except:
+        return None, None
+
+def extract_place_id_from_url(url: str) -> str:
+    """Extract Google Place ID (0x...:0x... feature ID) from Google Maps URL"""
+    try:
+        # Place URLs carry the ID in the data blob: .../data=!4m7!3m6!1s0x3963...:0x8f2...!8m2...
+        if '!1s0x' in url:
+            return url.split('!1s')[1].split('!')[0]
+        for part in url.split('/'):
+            if part.startswith('0x') and len(part) > 10:
+                return part
+    except:
+        pass
+    return None
+
+def parse_detail_pane(pane, url):
+    """Business field dict from the DETAIL_PANE_JS result and the URL of the open place"""
+    fields = {
+        'name': pane.get('name'),
+        'address': pane.get('address'),
+        'phone_number': pane.get('phone_number'),
+        'opening_hours': pane.get('opening_hours'),
+        'google_place_id': extract_place_id_from_url(url),
+    }
+    fields['latitude'], fields['longitude'] = extract_coordinates_from_url(url)
+
+    if domain := pane.get('domain'):
+        fields['domain'] = domain
+        fields['website'] = f"https://www.{domain}"
+
+    if reviews_text := pane.get('reviews_text'):
+        try:
+            fields['reviews_count'] = int(reviews_text.split()[0].replace(',', ''))
+        except ValueError:
+            pass
+
+    if rating_label := pane.get('rating_label'):
+        try:
+            fields['reviews_average'] = float(rating_label.split()[0].replace(',', '.'))
+        except ValueError:
+            pass
+
+    # Main business image plus up to 4 more
+    if photos := pane.get('photos'):
+        fields['image_url'] = photos[0]
+        fields['photos'] = photos
+
+    return fields
+
+def quick_record(fields):
+    """Detail fields under the JSON keys of the ultra/auto scrapers (rating, website as shown)"""
+    record = {
+        'name': fields.get('name'),
+        'address': fields.get('address'),
+        'phone_number': fields.get('phone_number'),
+        'website': fields.get('domain'),
+        'rating': fields.get('reviews_average'),
+        'image_url': fields.get('image_url'),
+        'latitude': fields.get('latitude'),
+        'longitude': fields.get('longitude'),
+        'google_place_id': fields.get('google_place_id'),
+    }
+    return {key: value for key, value in record.items() if value is not None}
+
+def read_detail_pane(page):
+    """Business fields of the open detail pane (sync Playwright page)"""
+    start = time.perf_counter()
+    pane = page.evaluate(DETAIL_PANE_JS)
+    METRICS.observe('extract', time.perf_counter() - start)
+    return parse_detail_pane(pane, page.url)
+
+async def read_detail_pane_async(page):
+    """Business fields of the open detail pane (async Playwright page)"""
+    start = time.perf_counter()
+    pane = await page.evaluate(DETAIL_PANE_JS)
+    METRICS.observe('extract', time.perf_counter() - start)
+    return parse_detail_pane(pane, page.url)
+
+# Offline stand-in for a place's detail pane, so the benchmark runs without hitting Maps
+SAMPLE_PANE_HTML = """
+<h1 class="DUwDvf">Shree Ganga Sweets</h1>
+<div jsaction="pane.reviewChart.moreReviews"><div role="img" aria-label="4.3 stars"></div><span>1,284 reviews</span></div>
+<button data-item-id="address"><div class="Io6YTe fontBodyMedium">12 Tower Chowk, Freeganj, Ujjain, Madhya Pradesh 456010</div></button>
+<a data-item-id="authority"><div class="Io6YTe fontBodyMedium">gangasweets.in</div></a>
+<button data-item-id="phone:tel:07342525252"><div class="Io6YTe fontBodyMedium">0734 252 5252</div></button>
+<div class="t39EBf OqCZI"><div class="fontBodyMedium">Open ⋅ Closes 10 pm</div></div>
+<div class="ZKCDEc">""" + "".join(f'<img src="https://lh5.googleusercontent.com/p/sample{i}=w408-h306">' for i in range(6)) + """</div>
+"""
+
+def locator_pane(page):
+    """The previous per-field locator extraction (one round trip per count/text/attribute), for comparison"""
+    def first_text(selector):
+        element = page.locator(selector).first
+        return element.inner_text().strip() if element.count() > 0 else None
+
+    rating = page.locator('//div[@jsaction="pane.reviewChart.moreReviews"]//div[@role="img"]').first
+    return {
+        'name': first_text('h1.DUwDvf'),
+        'address': first_text('//button[@data-item-id="address"]//div[contains(@class, "fontBodyMedium")]'),
+        'domain': first_text('//a[@data-item-id="authority"]//div[contains(@class, "fontBodyMedium")]'),
+        'phone_number': first_text('//button[contains(@data-item-id, "phone:tel:")]//div[contains(@class, "fontBodyMedium")]'),
+        'reviews_text': first_text('//div[@jsaction="pane.reviewChart.moreReviews"]//span'),
+        'rating_label': rating.get_attribute('aria-label') if rating.count() > 0 else None,
+        'photos': [src for image in page.locator('//div[contains(@class, "ZKCDEc")]//img').all()[:5]
+                   if (src := image.get_attribute('src'))],
+        'opening_hours': first_text('//div[contains(@class, "OqCZI")]//div[contains(@class, "fontBodyMedium")]'),
+    }
+
+def benchmark(page, iterations):
+    """{method: ms per business} for the locator and single-evaluate extractions of the open pane"""
+    methods = {
+        'locators': lambda: parse_detail_pane(locator_pane(page), page.url),
+        'single evaluate': lambda: read_detail_pane(page),
+    }
+    if methods['locators']() != methods['single evaluate']():
+        print("⚠️  The two extractions disagree on this page - check the selectors")
+
+    timings = {}
+    for method, extract in methods.items():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            extract()
+        timings[method] = (time.perf_counter() - start) / iterations * 1000
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark per-business detail extraction")
+    parser.add_argument("--url", help="Benchmark on this /maps/place/ URL instead of the offline sample pane")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page(locale="en-GB")
+        if args.url:
+            page.goto(args.url, timeout=20000)
+            page.wait_for_selector('h1.DUwDvf', timeout=15000)
+        else:
+            page.set_content(SAMPLE_PANE_HTML)
+
+        print(f"⏱️  Extracting {read_detail_pane(page)['name']!r} {args.iterations} times per method")
+        timings = benchmark(page, args.iterations)
+        browser.close()
+
+    for method, ms in timings.items():
+        print(f"   {method}: {ms:.2f} ms per business")
+    print(f"⚡ {timings['locators'] / timings['single evaluate']:.1f}x faster with a single page.evaluate")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+🔥 BUSINESS ENTITY RESOLUTION - ONE RECORD PER REAL SHOP 🔥
+Merges the same business found by different queries, runs and scrapers
+"""
+
+import os
+import re
+import math
+import glob
+import time
+import argparse
+import unicodedata
+from difflib import SequenceMatcher
+from dataset_writers import OUTPUT_FORMATS, iter_records, open_record_writer
+from geo_index import METERS_PER_DEGREE, geohash_encode, haversine_m, record_point
+
+GEOHASH_PRECISION = 7  # ~150m x 140m blocks in Ujjain
+MATCH_RADIUS_M = 100  # must stay below the block width so the 3x3 neighbourhood covers it
+PHONE_MATCH_RADIUS_M = 300  # chain branches share a phone number but not a street
+NAME_THRESHOLD = 0.88  # same place, nearly the same name
+PHONE_NAME_THRESHOLD = 0.6  # same phone number, loosely similar name
+ADDRESS_THRESHOLD = 0.8  # no coordinates: same name, similar address
+CONTAINED_NAME_SCORE = 0.9  # 'MV Automotive' vs 'GoMechanic - MV Automotive'
+
+PLACE_ID_KEYS = ('place_id', 'google_place_id')
+TOLL_FREE_PREFIXES = ('1800', '1860')
+
+# Words that differ between listings of the same shop and carry no identity
+NAME_STOPWORDS = {
+    'the', 'and', 'shop', 'store', 'stores', 'pvt', 'ltd', 'private', 'limited',
+    'ujjain', 'shri', 'shree', 'sri', 'new',
+}
+
+def normalize_phone(phone):
+    """'+91 94071 43365' / '094071 43365' / '9407143365' -> '9407143365'"""
+    digits = re.sub(r'\D', '', str(phone or ''))
+    if len(digits) > 10 and digits.startswith('91'):
+        digits = digits[2:]
+    digits = digits.lstrip('0')
+    if digits.startswith(TOLL_FREE_PREFIXES):
+        return ""  # head-office helplines are shared by every branch
+    return digits if len(digits) >= 6 else ""
+
+def normalize_name(name):
+    """Lowercase ASCII words without punctuation and filler words"""
+    text = unicodedata.normalize('NFKD', str(name or '')).encode('ascii', 'ignore').decode('ascii')
+    text = text.lower().replace('&', ' and ').replace("'", '')
+    words = re.findall(r'[a-z0-9]+', text)
+    kept = [word for word in words if word not in NAME_STOPWORDS]
+    return " ".join(kept or words)
+
+def normalize_address(address):
+    text = str(address or '').lower()
+    text = re.sub(r'\b(ujjain|madhya pradesh|india|\d{6})\b', ' ', text)
+    return " ".join(re.findall(r'[a-z0-9]+', text))
+
+def names_match(a, b, threshold):
+    """Normalized names at least `threshold` similar (0..1)
+
+    A name containing every word of the other (2+ words) scores CONTAINED_NAME_SCORE.
+    The cheap upper bounds of SequenceMatcher reject most pairs before the full diff.
+    """
+    if not a or not b:
+        return False
+    if a == b:
+        return True
+    words_a, words_b = set(a.split()), set(b.split())
+    if CONTAINED_NAME_SCORE >= threshold and min(len(words_a), len(words_b)) >= 2 \
+            and (words_a <= words_b or words_b <= words_a):
+        return True
+    if 2 * min(len(a), len(b)) / (len(a) + len(b)) < threshold:
+        return False  # SequenceMatcher.real_quick_ratio() without building the matcher
+    matcher = SequenceMatcher(None, a, b)
+    return matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold
+
+def record_place_id(record):
+    for key in PLACE_ID_KEYS:
+        if record.get(key):
+            return str(record[key])
+    return None
+
+def neighbour_geohashes(lat, lng, precision=GEOHASH_PRECISION):
+    """The point's geohash block and the 8 around it"""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    lat_step = 180 / 2 ** lat_bits
+    lng_step = 360 / 2 ** lng_bits
+    return {
+        geohash_encode(lat + d_lat * lat_step, lng + d_lng * lng_step, precision)
+        for d_lat in (-1, 0, 1) for d_lng in (-1, 0, 1)
+    }
+
+def _is_empty(value):
+    return value is None or value == "" or value == [] or value == {}
+
+def _completeness(record):
+    return (record_place_id(record) is not None, sum(not _is_empty(value) for value in record.values()))
+
+def merge_records(records):
+    """Most complete record wins; its gaps are filled and its lists extended from the others"""
+    ordered = sorted(records, key=_completeness, reverse=True)
+    merged = dict(ordered[0])
+    for other in ordered[1:]:
+        for key, value in other.items():
+            if _is_empty(value):
+                continue
+            current = merged.get(key)
+            if _is_empty(current):
+                merged[key] = value
+            elif isinstance(current, list) and isinstance(value, list):
+                merged[key] = current + [item for item in value if item not in current]
+    if len(records) > 1:
+        merged['duplicates_merged'] = len(records) - 1
+    return merged
+
+class EntityResolver:
+    """Clusters business dicts that describe the same shop
+
+    Rules, in order: same place ID; same normalized phone with a similar name
+    (and nearby, when both have coordinates);
+    within MATCH_RADIUS_M with a near-identical name (compared only inside
+    neighbouring geohash blocks); no coordinates but same name and similar address.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._parent = []
+        self._by_place_id = {}
+        self._by_phone = {}
+        self._by_geohash = {}
+        self._neighbours = {}  # geohash -> its 3x3 neighbourhood
+        self._by_name = {}  # records without coordinates
+        self._names = []
+        self._points = []
+        self.stats = {'records': 0, 'comparisons': 0, 'merged_place_id': 0, 'merged_phone': 0,
+                      'merged_location': 0, 'merged_address': 0}
+
+    def _find(self, record_id):
+        parent = self._parent
+        while parent[record_id] != record_id:
+            parent[record_id] = parent[parent[record_id]]
+            record_id = parent[record_id]
+        return record_id
+
+    def _union(self, a, b, reason):
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+        self._parent[max(root_a, root_b)] = min(root_a, root_b)
+        self.stats[reason] += 1
+
+    def add(self, record):
+        """Add one business dict (Places, scraper or generator format)"""
+        record_id = len(self.records)
+        self.records.append(record)
+        self._parent.append(record_id)
+        name = normalize_name(record.get('name'))
+        self._names.append(name)
+        self.stats['records'] += 1
+
+        place_id = record_place_id(record)
+        if place_id:
+            if place_id in self._by_place_id:
+                self._union(record_id, self._by_place_id[place_id], 'merged_place_id')
+            else:
+                self._by_place_id[place_id] = record_id
+
+        point = record_point(record)
+        self._points.append(point)
+
+        phone = normalize_phone(record.get('phone_number') or record.get('phone'))
+        if phone:
+            for other_id in self._by_phone.get(phone, ()):
+                if self._find(other_id) == self._find(record_id):
+                    continue
+                self.stats['comparisons'] += 1
+                other_point = self._points[other_id]
+                if point and other_point and haversine_m(*point, *other_point) > PHONE_MATCH_RADIUS_M:
+                    continue
+                if names_match(name, self._names[other_id], PHONE_NAME_THRESHOLD):
+                    self._union(record_id, other_id, 'merged_phone')
+
+        if point:
+            lat, lng = point
+            block = geohash_encode(lat, lng, GEOHASH_PRECISION)
+            if block not in self._neighbours:
+                self._neighbours[block] = neighbour_geohashes(lat, lng)
+            max_d_lat = MATCH_RADIUS_M / METERS_PER_DEGREE
+            max_d_lng = max_d_lat / math.cos(math.radians(lat))
+            for neighbour in self._neighbours[block]:
+                for other_id in self._by_geohash.get(neighbour, ()):
+                    other_lat, other_lng = self._points[other_id]
+                    if abs(other_lat - lat) > max_d_lat or abs(other_lng - lng) > max_d_lng:
+                        continue
+                    if self._find(other_id) == self._find(record_id):
+                        continue
+                    self.stats['comparisons'] += 1
+                    if (haversine_m(lat, lng, other_lat, other_lng) <= MATCH_RADIUS_M
+                            and names_match(name, self._names[other_id], NAME_THRESHOLD)):
+                        self._union(record_id, other_id, 'merged_location')
+        elif name:
+            address = normalize_address(record.get('address'))
+            for other_id in self._by_name.get(name, ()):
+                if self._find(other_id) == self._find(record_id):
+                    continue
+                self.stats['comparisons'] += 1
+                other_address = normalize_address(self.records[other_id].get('address'))
+                if SequenceMatcher(None, address, other_address).ratio() >= ADDRESS_THRESHOLD:
+                    self._union(record_id, other_id, 'merged_address')
+
+        # Only a business's first sighting is indexed for blocking: later sightings
+        # compare against one record per known business, not against every copy
+        if self._find(record_id) == record_id:
+            if phone:
+                self._by_phone.setdefault(phone, []).append(record_id)
+            if point:
+                self._by_geohash.setdefault(block, []).append(record_id)
+            elif name:
+                self._by_name.setdefault(name, []).append(record_id)
+        return record_id
+
+    def clusters(self):
+        """Lists of record ids, in first-seen order"""
+        groups = {}
+        for record_id in range(len(self.records)):
+            groups.setdefault(self._find(record_id), []).append(record_id)
+        return list(groups.values())
+
+    def resolved(self):
+        """One merged record per real business"""
+        return [merge_records([self.records[record_id] for record_id in cluster]) for cluster in self.clusters()]
+
+def resolve_duplicates(records):
+    """Merge duplicates in a list of business dicts: (resolved records, stats)"""
+    resolver = EntityResolver()
+    for record in records:
+        if isinstance(record, dict):
+            resolver.add(record)
+    resolved = resolver.resolved()
+    resolver.stats['resolved'] = len(resolved)
+    return resolved, resolver.stats
+
+def print_resolution_stats(stats):
+    print(f"🧬 Resolved {stats['records']:,} records into {stats['resolved']:,} businesses "
+          f"({stats['records'] - stats['resolved']:,} duplicates)")
+    print(f"   place ID: {stats['merged_place_id']:,}, phone: {stats['merged_phone']:,}, "
+          f"location+name: {stats['merged_location']:,}, name+address: {stats['merged_address']:,} "
+          f"({stats['comparisons']:,} comparisons)")
+
+def dataset_files(paths):
+    """Expand dataset folders into their JSON/JSONL files"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.json')) + glob.glob(os.path.join(path, '*.jsonl'))))
+        else:
+            files.append(path)
+    return files
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge duplicate businesses across dataset files and runs")
+    parser.add_argument("paths", nargs="+", help="Dataset JSON/JSONL files or folders")
+    parser.add_argument("--out", default="resolved_ujjain_businesses", help="Output path without extension")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="json")
+    args = parser.parse_args()
+
+    start = time.time()
+    resolver = EntityResolver()
+    for file_path in dataset_files(args.paths):
+        before = resolver.stats['records']
+        for record in iter_records(file_path):
+            if isinstance(record, dict):  # skip summary files
+                resolver.add(record)
+        print(f"📂 {file_path}: {resolver.stats['records'] - before} records")
+
+    with open_record_writer(args.out, args.format) as writer:
+        for record in resolver.resolved():
+            writer.write(record)
+    resolver.stats['resolved'] = writer.count
+
+    print_resolution_stats(resolver.stats)
+    print(f"⏱️  {time.time() - start:.1f}s")
+    print(f"💾 Saved: {writer.path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+🔥 SMART FEED SCROLLING - STOP AS SOON AS MORE SCROLLING IS POINTLESS 🔥
+Scroll the result feed itself until the limit, the end-of-list marker or a batch of only already-seen places
+"""
+
+import time
+from dataclasses import dataclass, field
+from wait_strategies import FEED_END_CHECK
+from scraper_metrics import METRICS
+
+LISTING_SELECTOR = 'a[href*="/maps/place/"]'
+
+# Scroll the feed container to its bottom (no mouse hover needed); false when there is no feed
+SCROLL_FEED_JS = """
+() => {
+    const feed = document.querySelector('div[role="feed"]');
+    if (!feed) return false;
+    feed.scrollTop = feed.scrollHeight;
+    return true;
+}
+"""
+
+# Listing count, hrefs from fromIndex on and whether the end-of-list marker is shown - one round trip
+FEED_STATE_JS = f"""
+(fromIndex) => {{
+    const links = document.querySelectorAll('{LISTING_SELECTOR}');
+    return {{
+        count: links.length,
+        hrefs: Array.from(links).slice(fromIndex).map(link => link.href),
+        end: {FEED_END_CHECK.strip()},
+    }};
+}}
+"""
+
+@dataclass
+class ScrollResult:
+    """How one query's feed scroll went"""
+    count: int  # listings loaded
+    hrefs: list  # their hrefs, in feed order
+    iterations: int  # scrolls performed
+    seconds: float
+    reason: str  # limit / end / seen / stalled / empty
+
+@dataclass
+class ScrollTelemetry:
+    """Scroll iterations, time and stop reasons across queries"""
+    queries: int = 0
+    iterations: int = 0
+    seconds: float = 0.0
+    reasons: dict = field(default_factory=dict)
+
+    def record(self, result):
+        self.queries += 1
+        self.iterations += result.iterations
+        self.seconds += result.seconds
+        self.reasons[result.reason] = self.reasons.get(result.reason, 0) + 1
+        METRICS.observe('scroll', result.seconds)
+
+    def print_summary(self):
+        if not self.queries:
+            return
+        reasons = ", ".join(f"{reason}: {count}" for reason, count in sorted(self.reasons.items()))
+        print(f"📜 Feed scrolling: {self.iterations / self.queries:.1f} scrolls and "
+              f"{self.seconds / self.queries:.1f}s per query ({reasons})")
+
+def all_seen(hrefs, seen):
+    return seen is not None and bool(hrefs) and all(href in seen for href in hrefs)
+
+class FeedScroller:
+    """Feed scrolling for the sync Playwright API
+
+    seen: anything supporting `href in seen` (e.g. SeenPlaces) - once a scroll
+    only brings in places it already holds, deeper results are the overlap
+    of earlier queries too and scrolling stops.
+    """
+
+    def __init__(self, page, waits, telemetry=None):
+        self.page = page
+        self.waits = waits
+        self.telemetry = telemetry or ScrollTelemetry()
+
+    def scroll(self, limit, seen=None):
+        start = time.perf_counter()
+        state = self.page.evaluate(FEED_STATE_JS, 0)
+        hrefs, iterations = state['hrefs'], 0
+        reason = 'empty' if not state['count'] else None
+
+        while reason is None:
+            if len(hrefs) >= limit:
+                reason = 'limit'
+            elif state['end']:
+                reason = 'end'
+            elif iterations and all_seen(state['hrefs'], seen):
+                reason = 'seen'
+            else:
+                if not self.page.evaluate(SCROLL_FEED_JS):
+                    self.page.hover(LISTING_SELECTOR)
+                    self.page.mouse.wheel(0, 10000)
+                iterations += 1
+                if not self.waits.feed_more(len(hrefs)):
+                    reason = 'stalled'
+                    continue
+                state = self.page.evaluate(FEED_STATE_JS, len(hrefs))
+                hrefs += state['hrefs']
+
+        result = ScrollResult(len(hrefs), hrefs, iterations, time.perf_counter() - start, reason)
+        self.telemetry.record(result)
+        return result
+
+class AsyncFeedScroller:
+    """Feed scrolling for the async Playwright API (see FeedScroller)"""
+
+    def __init__(self, page, waits, telemetry=None):
+        self.page = page
+        self.waits = waits
+        self.telemetry = telemetry or ScrollTelemetry()
+
+    async def scroll(self, limit, seen=None):
+        start = time.perf_counter()
+        state = await self.page.evaluate(FEED_STATE_JS, 0)
+        hrefs, iterations = state['hrefs'], 0
+        reason = 'empty' if not state['count'] else None
+
+        while reason is None:
+            if len(hrefs) >= limit:
+                reason = 'limit'
+            elif state['end']:
+                reason = 'end'
+            elif iterations and all_seen(state['hrefs'], seen):
+                reason = 'seen'
+            else:
+                if not await self.page.evaluate(SCROLL_FEED_JS):
+                    await self.page.hover(LISTING_SELECTOR)
+                    await self.page.mouse.wheel(0, 10000)
+                iterations += 1
+                if not await self.waits.feed_more(len(hrefs)):
+                    reason = 'stalled'
+                    continue
+                state = await self.page.evaluate(FEED_STATE_JS, len(hrefs))
+                hrefs += state['hrefs']
+
+        result = ScrollResult(len(hrefs), hrefs, iterations, time.perf_counter() - start, reason)
+        self.telemetry.record(result)
+        return result
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+🔥 LOCAL FIRESTORE REST MOCK - TEST UPLOADS WITHOUT TOUCHING PRODUCTION 🔥
+Tiny in-memory stand-in for the Firestore endpoints FirebasePopulator uses
+"""
+
+import json
+import random
+import threading
+import argparse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class MockFirestoreHandler(BaseHTTPRequestHandler):
+    """Handles createDocument, documents:batchWrite, documents:commit and collection listing"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _store(self, name, fields):
+        with self.server.lock:
+            self.server.documents[name] = fields
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        payload = self._read_json()
+        path = self.path.split('?')[0]
+
+        if path.endswith(":batchWrite"):
+            with server.lock:
+                server.batch_sizes.append(len(payload.get("writes", [])))
+            results, statuses = [], []
+            for write in payload.get("writes", []):
+                if random.random() < server.abort_rate:
+                    statuses.append({"code": 10, "message": "Aborted due to cross-transaction contention"})
+                    results.append({})
+                    continue
+                update = write["update"]
+                self._store(update["name"], update.get("fields", {}))
+                statuses.append({"code": 0})
+                results.append({"updateTime": "2025-07-04T00:00:00Z"})
+            self._send_json(200, {"writeResults": results, "status": statuses})
+
+        elif path.endswith(":commit"):
+            for write in payload.get("writes", []):
+                update = write["update"]
+                self._store(update["name"], update.get("fields", {}))
+            self._send_json(200, {"writeResults": [{} for _ in payload.get("writes", [])],
+                                  "commitTime": "2025-07-04T00:00:00Z"})
+
+        else:
+            # createDocument on a collection path: /v1/projects/.../documents/<collection>
+            name = path.split("/v1/", 1)[-1] + "/" + uuid.uuid4().hex[:20]
+            self._store(name, payload.get("fields", {}))
+            self._send_json(200, {"name": name, "fields": payload.get("fields", {})})
+
+    def do_GET(self):
+        prefix = self.path.split("/v1/", 1)[-1].split('?')[0] + "/"
+        with self.server.lock:
+            documents = [
+                {"name": name, "fields": fields}
+                for name, fields in self.server.documents.items() if name.startswith(prefix)
+            ]
+        self._send_json(200, {"documents": documents})
+
+    def log_message(self, format, *args):
+        pass
+
+def start_mock_server(port=0, abort_rate=0.0):
+    """Serve in a daemon thread; returns (server, base_url) - pass base_url as firestore_api"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockFirestoreHandler)
+    server.documents = {}
+    server.requests = 0
+    server.batch_sizes = []  # writes per batchWrite request, retries included
+    server.abort_rate = abort_rate
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8085)
+    parser.add_argument("--abort-rate", type=float, default=0.0,
+                        help="Fraction of batchWrite writes answered with ABORTED, to exercise retries")
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(args.port, args.abort_rate)
+    print(f"🧪 Mock Firestore running at {base_url}")
+    print(f"👉 python populate_firebase_db.py --endpoint {base_url} --bulk Real_Ujjain_Data_20250704_160328")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n📊 {len(server.documents)} documents stored, {server.requests} requests")
+
+if __name__ == "__main__":
+    main()
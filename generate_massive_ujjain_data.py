@@ -7,7 +7,33 @@ Generate 10,000+ businesses for complete coverage
 import json
 import os
 import random
+import argparse
 from datetime import datetime
+from dataset_writers import OUTPUT_FORMATS, open_record_writer
+
+# Area name -> centre coordinates
+UJJAIN_LOCATIONS = {
+    "Freeganj": {"lat": 23.1765, "lng": 75.7885},
+    "Mahakaleshwar Temple": {"lat": 23.1828, "lng": 75.7681},
+    "Tower Chowk": {"lat": 23.1793, "lng": 75.7849},
+    "Dewas Gate": {"lat": 23.1756, "lng": 75.7923},
+    "University Road": {"lat": 23.1689, "lng": 75.7834},
+    "Agar Road": {"lat": 23.1634, "lng": 75.8012},
+    "Indore Road": {"lat": 23.1567, "lng": 75.8123},
+    "Railway Station Road": {"lat": 23.1634, "lng": 75.7712},
+    "Nanakheda": {"lat": 23.1923, "lng": 75.7456},
+    "Chimanganj Mandi": {"lat": 23.1567, "lng": 75.7923},
+    "Jiwaji University": {"lat": 23.1689, "lng": 75.7834},
+    "Kshipra Pul": {"lat": 23.1845, "lng": 75.7634},
+    "Ramghat Road": {"lat": 23.1845, "lng": 75.7634},
+    "Vikram University": {"lat": 23.1712, "lng": 75.7856},
+    "Madhav Nagar": {"lat": 23.1678, "lng": 75.7923},
+    "Kalbhairav Temple": {"lat": 23.1834, "lng": 75.7712},
+    "Sandipani Ashram": {"lat": 23.1756, "lng": 75.7634},
+    "Triveni Museum": {"lat": 23.1789, "lng": 75.7823},
+    "Bharti Nagar": {"lat": 23.1623, "lng": 75.7945},
+    "Jaisinghpura": {"lat": 23.1534, "lng": 75.8034}
+}
 
 class MassiveUjjainGenerator:
     def __init__(self):
@@ -16,28 +42,7 @@ class MassiveUjjainGenerator:
         
     def get_all_ujjain_locations(self):
         """Get all 20 Ujjain locations"""
-        return {
-            "Freeganj": {"lat": 23.1765, "lng": 75.7885},
-            "Mahakaleshwar Temple": {"lat": 23.1828, "lng": 75.7681},
-            "Tower Chowk": {"lat": 23.1793, "lng": 75.7849},
-            "Dewas Gate": {"lat": 23.1756, "lng": 75.7923},
-            "University Road": {"lat": 23.1689, "lng": 75.7834},
-            "Agar Road": {"lat": 23.1634, "lng": 75.8012},
-            "Indore Road": {"lat": 23.1567, "lng": 75.8123},
-            "Railway Station Road": {"lat": 23.1634, "lng": 75.7712},
-            "Nanakheda": {"lat": 23.1923, "lng": 75.7456},
-            "Chimanganj Mandi": {"lat": 23.1567, "lng": 75.7923},
-            "Jiwaji University": {"lat": 23.1689, "lng": 75.7834},
-            "Kshipra Pul": {"lat": 23.1845, "lng": 75.7634},
-            "Ramghat Road": {"lat": 23.1845, "lng": 75.7634},
-            "Vikram University": {"lat": 23.1712, "lng": 75.7856},
-            "Madhav Nagar": {"lat": 23.1678, "lng": 75.7923},
-            "Kalbhairav Temple": {"lat": 23.1834, "lng": 75.7712},
-            "Sandipani Ashram": {"lat": 23.1756, "lng": 75.7634},
-            "Triveni Museum": {"lat": 23.1789, "lng": 75.7823},
-            "Bharti Nagar": {"lat": 23.1623, "lng": 75.7945},
-            "Jaisinghpura": {"lat": 23.1534, "lng": 75.8034}
-        }
+        return UJJAIN_LOCATIONS
     
     def get_comprehensive_categories(self):
         """Get comprehensive business categories"""
@@ -112,41 +117,54 @@ class MassiveUjjainGenerator:
         suffixes = ["Plaza", "Center", "Hub", "Point", "Zone", "World", "Palace", "Store", "Shop", "Mart", "Corner", "Junction"]
         prefixes = ["New", "Modern", "Royal", "Golden", "Silver", "Star", "Super", "Mega", "Prime", "Elite", "Grand"]
         
+        seen = set(names)
+        attempts = 0
         while len(names) < count_needed:
             base = random.choice(base_names)
-            if random.choice([True, False]):
+            if attempts > count_needed * 20:
+                # Prefix/suffix combinations exhausted (large --scale) - number the branches
+                new_name = f"{base} {len(names) + 1}"
+            elif random.choice([True, False]):
                 new_name = f"{random.choice(prefixes)} {base}"
             else:
                 new_name = f"{base} {random.choice(suffixes)}"
+            attempts += 1
             
-            if new_name not in names:
+            if new_name not in seen:
                 names.append(new_name)
+                seen.add(new_name)
         
         return names[:count_needed]
     
-    def generate_massive_dataset(self):
-        """Generate massive dataset with 10,000+ businesses"""
+    def generate_massive_dataset(self, output_format="json", scale=1):
+        """Generate massive dataset with 10,000+ businesses (x scale), streamed straight to disk"""
         
         print("🔥 GENERATING MASSIVE UJJAIN BUSINESS DATASET 🔥")
-        print("🎯 TARGET: 10,000+ BUSINESSES")
+        print(f"🎯 TARGET: {10000 * scale:,}+ BUSINESSES")
         print("=" * 60)
         
         locations = self.get_all_ujjain_locations()
         categories = self.get_comprehensive_categories()
         
-        all_businesses = []
+        total_businesses = 0
         category_counts = {}
         
+        # Records go to the complete file and their category file as soon as they exist
+        complete_writer = open_record_writer(
+            os.path.join(self.results_dir, "complete_ujjain_businesses_massive"), output_format
+        )
+        
         for category, subcategories in categories.items():
-            category_businesses = []
             category_counts[category] = 0
+            category_name = category.replace('🍽️ ', '').replace('🛒 ', '').replace('🏥 ', '').replace('👗 ', '').replace('📱 ', '').replace('💄 ', '').replace('🏠 ', '').replace('🚗 ', '').replace('🎓 ', '').replace('💼 ', '').replace(' & ', '_').replace(' ', '_').lower()
+            category_writer = open_record_writer(os.path.join(self.results_dir, category_name), output_format)
             
             print(f"\n📂 Processing {category}...")
             
             for subcategory, base_names in subcategories.items():
                 for location, location_data in locations.items():
                     # Generate 8-15 businesses per subcategory per location
-                    num_businesses = random.randint(8, 15)
+                    num_businesses = random.randint(8, 15) * scale
                     
                     # Generate enough names
                     business_names = self.generate_business_names(base_names, num_businesses)
@@ -163,41 +181,37 @@ class MassiveUjjainGenerator:
                             name, category, subcategory, location, location_data
                         )
                         
-                        category_businesses.append(business)
-                        all_businesses.append(business)
+                        category_writer.write(business)
+                        complete_writer.write(business)
                         category_counts[category] += 1
+                        total_businesses += 1
             
-            # Save category-wise data
-            category_file = os.path.join(self.results_dir, f"{category.replace('🍽️ ', '').replace('🛒 ', '').replace('🏥 ', '').replace('👗 ', '').replace('📱 ', '').replace('💄 ', '').replace('🏠 ', '').replace('🚗 ', '').replace('🎓 ', '').replace('💼 ', '').replace(' & ', '_').replace(' ', '_').lower()}.json")
-            with open(category_file, 'w') as f:
-                json.dump(category_businesses, f, indent=2, ensure_ascii=False)
-            
-            print(f"✅ {category}: {len(category_businesses)} businesses")
+            category_writer.close()
+            print(f"✅ {category}: {category_counts[category]:,} businesses -> {category_writer.path}")
         
-        # Save complete dataset
-        complete_file = os.path.join(self.results_dir, "complete_ujjain_businesses_massive.json")
-        with open(complete_file, 'w') as f:
-            json.dump(all_businesses, f, indent=2, ensure_ascii=False)
+        complete_writer.close()
         
         # Generate comprehensive summary
         summary = {
-            "total_businesses": len(all_businesses),
+            "total_businesses": total_businesses,
             "generation_date": datetime.now().isoformat(),
             "locations_covered": len(locations),
             "categories_covered": len(categories),
             "subcategories_covered": sum(len(subcat) for subcat in categories.values()),
             "categories": category_counts,
             "data_quality": {
-                "with_images": len(all_businesses),
-                "with_phone": len(all_businesses),
-                "with_coordinates": len(all_businesses),
-                "with_ratings": len(all_businesses),
-                "with_opening_hours": len(all_businesses)
+                "with_images": total_businesses,
+                "with_phone": total_businesses,
+                "with_coordinates": total_businesses,
+                "with_ratings": total_businesses,
+                "with_opening_hours": total_businesses
             },
             "locations": list(locations.keys()),
             "coverage": "Complete Ujjain city coverage",
             "source": "massive_ujjain_data_generator",
-            "note": "Production-ready massive dataset for Bazar Se app"
+            "note": "Production-ready massive dataset for Bazar Se app",
+            "output_format": output_format,
+            "complete_file": complete_writer.path
         }
         
         summary_file = os.path.join(self.results_dir, "massive_dataset_summary.json")
@@ -205,13 +219,13 @@ class MassiveUjjainGenerator:
             json.dump(summary, f, indent=2)
         
         print(f"\n🎉 MASSIVE DATASET GENERATION COMPLETED!")
-        print(f"📊 Total Businesses: {len(all_businesses):,}")
+        print(f"📊 Total Businesses: {total_businesses:,}")
         print(f"📍 Locations: {len(locations)}")
         print(f"📂 Categories: {len(categories)}")
         print(f"📋 Subcategories: {summary['subcategories_covered']}")
         print(f"📁 Saved in: {self.results_dir}")
         
-        return all_businesses, self.results_dir
+        return total_businesses, self.results_dir
     
     def generate_business(self, name, category, subcategory, location, location_data):
         """Generate a complete business entry"""
@@ -283,16 +297,22 @@ class MassiveUjjainGenerator:
 def main():
     """Main function"""
     
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="json",
+                        help="json (streamed array) or jsonl (one business per line)")
+    parser.add_argument("--scale", type=int, default=1, help="Multiply businesses per subcategory per location")
+    args = parser.parse_args()
+    
     print("🔥 MASSIVE UJJAIN BUSINESS DATA GENERATOR 🔥")
-    print("🚀 GENERATING 10,000+ BUSINESSES")
+    print(f"🚀 GENERATING {10000 * args.scale:,}+ BUSINESSES")
     print("=" * 60)
     
     generator = MassiveUjjainGenerator()
-    businesses, results_dir = generator.generate_massive_dataset()
+    total_businesses, results_dir = generator.generate_massive_dataset(args.format, args.scale)
     
     print(f"\n🎯 MASSIVE DATASET READY FOR BAZAR SE APP!")
     print(f"📁 Location: {results_dir}")
-    print(f"📊 Total: {len(businesses):,} businesses")
+    print(f"📊 Total: {total_businesses:,} businesses")
     print(f"🖼️ All businesses have image URLs")
     print(f"📞 All businesses have phone numbers")
     print(f"📍 All businesses have GPS coordinates")
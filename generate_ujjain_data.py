@@ -8,6 +8,7 @@ import json
 import os
 import random
 from datetime import datetime
+from dataset_writers import open_record_writer
 
 class UjjainDataGenerator:
     def __init__(self):
@@ -137,12 +138,16 @@ class UjjainDataGenerator:
         locations = self.get_ujjain_locations()
         categories = self.get_business_categories()
         
-        all_businesses = []
+        total_businesses = 0
         category_counts = {}
         
+        complete_writer = open_record_writer(os.path.join(self.results_dir, "complete_ujjain_businesses"))
+        
         for category, subcategories in categories.items():
-            category_businesses = []
             category_counts[category] = 0
+            category_writer = open_record_writer(
+                os.path.join(self.results_dir, category.replace(' & ', '_').replace(' ', '_').lower())
+            )
             
             for subcategory, business_names in subcategories.items():
                 for location, location_data in locations.items():
@@ -165,33 +170,27 @@ class UjjainDataGenerator:
                             name, category, subcategory, location, location_data
                         )
                         
-                        category_businesses.append(business)
-                        all_businesses.append(business)
+                        category_writer.write(business)
+                        complete_writer.write(business)
                         category_counts[category] += 1
+                        total_businesses += 1
             
-            # Save category-wise data
-            category_file = os.path.join(self.results_dir, f"{category.replace(' & ', '_').replace(' ', '_').lower()}.json")
-            with open(category_file, 'w') as f:
-                json.dump(category_businesses, f, indent=2, ensure_ascii=False)
-            
-            print(f"✅ {category}: {len(category_businesses)} businesses")
+            category_writer.close()
+            print(f"✅ {category}: {category_counts[category]} businesses")
         
-        # Save complete dataset
-        complete_file = os.path.join(self.results_dir, "complete_ujjain_businesses.json")
-        with open(complete_file, 'w') as f:
-            json.dump(all_businesses, f, indent=2, ensure_ascii=False)
+        complete_writer.close()
         
         # Generate summary
         summary = {
-            "total_businesses": len(all_businesses),
+            "total_businesses": total_businesses,
             "generation_date": datetime.now().isoformat(),
             "locations_covered": len(locations),
             "categories": category_counts,
             "data_quality": {
-                "with_images": len(all_businesses),  # All have images
-                "with_phone": len(all_businesses),   # All have phone
-                "with_coordinates": len(all_businesses),  # All have coordinates
-                "with_ratings": len(all_businesses)  # All have ratings
+                "with_images": total_businesses,  # All have images
+                "with_phone": total_businesses,   # All have phone
+                "with_coordinates": total_businesses,  # All have coordinates
+                "with_ratings": total_businesses  # All have ratings
             },
             "locations": list(locations.keys()),
             "source": "ujjain_data_generator",
@@ -203,7 +202,7 @@ class UjjainDataGenerator:
             json.dump(summary, f, indent=2)
         
         print(f"\n🎉 DATASET GENERATION COMPLETED!")
-        print(f"📊 Total Businesses: {len(all_businesses):,}")
+        print(f"📊 Total Businesses: {total_businesses:,}")
         print(f"📍 Locations: {len(locations)}")
         print(f"📂 Categories: {len(categories)}")
         print(f"📁 Saved in: {self.results_dir}")
@@ -213,7 +212,7 @@ class UjjainDataGenerator:
         for category, count in category_counts.items():
             print(f"   {category}: {count:,} businesses")
         
-        return all_businesses, self.results_dir
+        return total_businesses, self.results_dir
 
 def main():
     """Main function"""
@@ -223,11 +222,11 @@ def main():
     print("=" * 60)
     
     generator = UjjainDataGenerator()
-    businesses, results_dir = generator.generate_complete_dataset()
+    total_businesses, results_dir = generator.generate_complete_dataset()
     
     print(f"\n🎯 DATASET READY FOR BAZAR SE APP!")
     print(f"📁 Location: {results_dir}")
-    print(f"📊 Total: {len(businesses):,} businesses")
+    print(f"📊 Total: {total_businesses:,} businesses")
     print(f"🖼️ All businesses have image URLs")
     print(f"📞 All businesses have phone numbers")
     print(f"📍 All businesses have GPS coordinates")
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+🔥 UJJAIN GEO INDEX - NEARBY BUSINESSES WITHOUT FULL SCANS 🔥
+Grid spatial index over the scraped datasets with radius and k-nearest queries
+"""
+
+import os
+import glob
+import math
+import heapq
+import pickle
+import random
+import time
+import argparse
+from dataset_writers import iter_records
+from generate_massive_ujjain_data import UJJAIN_LOCATIONS
+
+EARTH_RADIUS_M = 6371000
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180  # same sphere as haversine_m
+DEFAULT_CELL_SIZE = 0.0025  # degrees, ~250m in Ujjain
+DEFAULT_INDEX_PATH = "ujjain_geo_index.pkl"
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Keys that carry category labels in the different dataset formats
+CATEGORY_KEYS = ('category', 'subcategory', 'primary_category', 'primary_subcategory',
+                 'categories', 'subcategories', 'types', 'google_types')
+
+# What the index keeps per business - enough to answer a query without the source file
+INDEX_FIELDS = ('name', 'address', 'phone_number', 'category', 'subcategory', 'primary_category',
+                'primary_subcategory', 'rating', 'reviews_average', 'place_id', 'google_place_id',
+                'location', 'area', 'image_url', 'source')
+
+def geohash_encode(lat, lng, precision=7):
+    """Standard base32 geohash (precision 7 ~ 150m cells)"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(geohash) < precision:
+        value_range, value = (lng_range, lng) if even else (lat_range, lat)
+        middle = (value_range[0] + value_range[1]) / 2
+        if value >= middle:
+            bits = (bits << 1) | 1
+            value_range[0] = middle
+        else:
+            bits <<= 1
+            value_range[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(geohash)
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    """Great-circle distance in metres"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+def normalize_category(label):
+    """'🍽️ FOOD & DINING' / 'Food & Dining' -> 'food & dining'"""
+    label = str(label).strip()
+    while label and not label[0].isalnum():
+        label = label[1:]
+    return label.strip().lower().replace('_', ' ')
+
+def record_categories(record):
+    labels = set()
+    for key in CATEGORY_KEYS:
+        value = record.get(key)
+        for item in (value if isinstance(value, list) else [value]):
+            if item:
+                labels.add(normalize_category(item))
+    return frozenset(labels)
+
+def record_point(record):
+    try:
+        lat = float(record['latitude'])
+        lng = float(record['longitude'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180) or (lat == 0 and lng == 0):
+        return None
+    return lat, lng
+
+class GeoIndex:
+    """Uniform lat/lng grid: each cell lists the businesses inside it"""
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (row, col) -> [point ids]
+        self.label_cells = {}  # category label -> its own grid, so filtered queries skip other businesses
+        self.lats = []
+        self.lngs = []
+        self.categories = []  # frozenset of normalized labels per point
+        self.records = []
+
+    def __len__(self):
+        return len(self.records)
+
+    def _cell(self, lat, lng):
+        return math.floor(lat / self.cell_size), math.floor(lng / self.cell_size)
+
+    def add(self, record):
+        """Index one business dict (Business asdict, Places or generator format); False if it has no coordinates"""
+        if not isinstance(record, dict):
+            return False
+        point = record_point(record)
+        if point is None:
+            return False
+
+        point_id = len(self.records)
+        self.lats.append(point[0])
+        self.lngs.append(point[1])
+        self.categories.append(record_categories(record))
+        self.records.append({key: record[key] for key in INDEX_FIELDS if record.get(key) is not None}
+                            | {'latitude': point[0], 'longitude': point[1]})
+        cell = self._cell(*point)
+        self.cells.setdefault(cell, []).append(point_id)
+        for label in self.categories[point_id]:
+            self.label_cells.setdefault(label, {}).setdefault(cell, []).append(point_id)
+        return True
+
+    @classmethod
+    def build(cls, records, cell_size=DEFAULT_CELL_SIZE):
+        index = cls(cell_size)
+        for record in records:
+            index.add(record)
+        return index
+
+    @classmethod
+    def from_files(cls, paths, cell_size=DEFAULT_CELL_SIZE):
+        """Index dataset JSON/JSONL files or whole dataset folders"""
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                files.extend(sorted(glob.glob(os.path.join(path, '*.json')) + glob.glob(os.path.join(path, '*.jsonl'))))
+            else:
+                files.append(path)
+
+        index = cls(cell_size)
+        seen = set()
+        for file_path in files:
+            added = 0
+            for record in iter_records(file_path):
+                if not isinstance(record, dict):
+                    continue  # summary files
+                # Category files repeat the businesses of the complete file
+                key = record.get('place_id') or record.get('google_place_id') or (
+                    record.get('name'), record.get('latitude'), record.get('longitude'))
+                if key in seen:
+                    continue
+                seen.add(key)
+                added += index.add(record)
+            print(f"📍 {file_path}: {added} businesses indexed")
+        return index
+
+    def _grids(self, category):
+        """Grids to search: everything, or the grids of every label containing the category text"""
+        if not category:
+            return [self.cells]
+        category = normalize_category(category)
+        return [cells for label, cells in self.label_cells.items() if category in label]
+
+    def _candidates(self, grids, cells):
+        if len(grids) == 1:
+            for cell in cells:
+                yield from grids[0].get(cell, ())
+            return
+        seen = set()  # a business can carry several matching labels
+        for cell in cells:
+            for grid in grids:
+                for point_id in grid.get(cell, ()):
+                    if point_id not in seen:
+                        seen.add(point_id)
+                        yield point_id
+
+    def nearby(self, lat, lng, radius_m, category=None, limit=None):
+        """Businesses within radius_m, nearest first: [(distance_m, record)]"""
+        grids = self._grids(category)
+        cos_lat = math.cos(math.radians(lat))
+        d_lat = radius_m / METERS_PER_DEGREE
+        d_lng = radius_m / (METERS_PER_DEGREE * max(cos_lat, 1e-6))
+        row_min, col_min = self._cell(lat - d_lat, lng - d_lng)
+        row_max, col_max = self._cell(lat + d_lat, lng + d_lng)
+        cells = [(row, col) for row in range(row_min, row_max + 1) for col in range(col_min, col_max + 1)]
+
+        # Planar distance is within a fraction of a metre at city scale - only survivors get haversine
+        lats, lngs = self.lats, self.lngs
+        limit_sq = (radius_m * 1.001 / METERS_PER_DEGREE) ** 2
+        results = []
+        for point_id in self._candidates(grids, cells):
+            dy = lats[point_id] - lat
+            dx = (lngs[point_id] - lng) * cos_lat
+            if dx * dx + dy * dy <= limit_sq:
+                distance = haversine_m(lat, lng, lats[point_id], lngs[point_id])
+                if distance <= radius_m:
+                    results.append((distance, point_id))
+        results.sort()
+        if limit:
+            results = results[:limit]
+        return [(distance, self.records[point_id]) for distance, point_id in results]
+
+    def nearest(self, lat, lng, k=10, category=None, max_radius_m=20000):
+        """k nearest businesses, searching outward ring by ring: [(distance_m, record)]"""
+        grids = self._grids(category)
+        if not any(grids):
+            return []  # no business of this category - walking every ring out to max_radius_m finds nothing
+        center_row, center_col = self._cell(lat, lng)
+        # Anything in ring r+1 is at least r whole cells away
+        cell_m = self.cell_size * METERS_PER_DEGREE * math.cos(math.radians(lat))
+        heap = []  # max-heap of (-planar distance, point_id), size <= k
+        lats, lngs = self.lats, self.lngs
+        meters_per_lng = METERS_PER_DEGREE * math.cos(math.radians(lat))
+
+        ring = 0
+        while True:
+            ring_cells = [
+                (row, col)
+                for row in range(center_row - ring, center_row + ring + 1)
+                for col in range(center_col - ring, center_col + ring + 1)
+                if max(abs(row - center_row), abs(col - center_col)) == ring
+            ]
+            for point_id in self._candidates(grids, ring_cells):
+                dy = (lats[point_id] - lat) * METERS_PER_DEGREE
+                dx = (lngs[point_id] - lng) * meters_per_lng
+                distance = math.sqrt(dx * dx + dy * dy)
+                if distance > max_radius_m:
+                    continue
+                if len(heap) < k:
+                    heapq.heappush(heap, (-distance, point_id))
+                elif distance < -heap[0][0]:
+                    heapq.heapreplace(heap, (-distance, point_id))
+
+            searched_m = ring * cell_m
+            if (len(heap) == k and -heap[0][0] <= searched_m) or searched_m > max_radius_m:
+                break
+            ring += 1
+
+        nearest = sorted(
+            (haversine_m(lat, lng, lats[point_id], lngs[point_id]), point_id) for _, point_id in heap
+        )
+        return [(distance, self.records[point_id]) for distance, point_id in nearest]
+
+    def save(self, path=DEFAULT_INDEX_PATH):
+        with open(path, 'wb') as f:
+            pickle.dump({
+                'cell_size': self.cell_size,
+                'cells': self.cells,
+                'label_cells': self.label_cells,
+                'lats': self.lats,
+                'lngs': self.lngs,
+                'categories': self.categories,
+                'records': self.records,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        print(f"💾 Geo index saved: {path} ({len(self):,} businesses, {len(self.cells):,} cells)")
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH):
+        """Only load index files you built yourself (pickle)"""
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        index = cls(state['cell_size'])
+        index.cells = state['cells']
+        index.label_cells = state['label_cells']
+        index.lats = state['lats']
+        index.lngs = state['lngs']
+        index.categories = state['categories']
+        index.records = state['records']
+        return index
+
+def resolve_place(name):
+    """Coordinates of a known Ujjain area, case-insensitive"""
+    for place, location in UJJAIN_LOCATIONS.items():
+        if place.lower() == name.strip().lower():
+            return location['lat'], location['lng']
+    raise ValueError(f"Unknown place: {name} (known: {', '.join(UJJAIN_LOCATIONS)})")
+
+def nearest_area(lat, lng, max_distance_m=2500):
+    """Name of the closest known Ujjain area, None when none is within max_distance_m"""
+    best, best_distance = None, max_distance_m
+    for place, location in UJJAIN_LOCATIONS.items():
+        distance = haversine_m(lat, lng, location['lat'], location['lng'])
+        if distance <= best_distance:
+            best, best_distance = place, distance
+    return best
+
+def benchmark(index, queries=2000, radius_m=500, k=10, seed=3):
+    """Average microseconds per radius and k-nearest query around random Ujjain areas"""
+    rng = random.Random(seed)
+    centres = [(location['lat'] + rng.uniform(-0.01, 0.01), location['lng'] + rng.uniform(-0.01, 0.01))
+               for location in rng.choices(list(UJJAIN_LOCATIONS.values()), k=queries)]
+
+    start = time.perf_counter()
+    for lat, lng in centres:
+        index.nearby(lat, lng, radius_m)
+    radius_us = (time.perf_counter() - start) / queries * 1e6
+
+    start = time.perf_counter()
+    for lat, lng in centres:
+        index.nearest(lat, lng, k)
+    nearest_us = (time.perf_counter() - start) / queries * 1e6
+
+    return {'queries': queries, 'radius_us': radius_us, 'nearest_us': nearest_us}
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the Ujjain geo index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Index dataset files/folders")
+    build_parser.add_argument("paths", nargs="+")
+    build_parser.add_argument("--out", default=DEFAULT_INDEX_PATH)
+    build_parser.add_argument("--cell-size", type=float, default=DEFAULT_CELL_SIZE, help="Grid cell size in degrees")
+
+    near_parser = subparsers.add_parser("near", help="Businesses near a place or coordinate")
+    near_parser.add_argument("--index", default=DEFAULT_INDEX_PATH)
+    near_parser.add_argument("--place", help="Known area, e.g. 'Tower Chowk'")
+    near_parser.add_argument("--lat", type=float)
+    near_parser.add_argument("--lng", type=float)
+    near_parser.add_argument("--radius", type=float, help="Metres; omit for k-nearest")
+    near_parser.add_argument("-k", type=int, default=10)
+    near_parser.add_argument("--category", help="e.g. 'food & dining', 'pharmacy'")
+
+    bench_parser = subparsers.add_parser("benchmark", help="Time radius and k-nearest queries")
+    bench_parser.add_argument("--index", default=DEFAULT_INDEX_PATH)
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        index = GeoIndex.from_files(args.paths, args.cell_size)
+        index.save(args.out)
+
+    elif args.command == "near":
+        index = GeoIndex.load(args.index)
+        if args.place:
+            lat, lng = resolve_place(args.place)
+        elif args.lat is not None and args.lng is not None:
+            lat, lng = args.lat, args.lng
+        else:
+            parser.error("near needs --place or --lat/--lng")
+
+        if args.radius:
+            results = index.nearby(lat, lng, args.radius, args.category, limit=args.k)
+        else:
+            results = index.nearest(lat, lng, args.k, args.category)
+
+        print(f"📍 {len(results)} businesses near {args.place or (lat, lng)}")
+        for distance, record in results:
+            print(f"   {distance:6.0f}m  {record.get('name')}  "
+                  f"({record.get('primary_category') or record.get('category') or ''})")
+
+    elif args.command == "benchmark":
+        index = GeoIndex.load(args.index)
+        result = benchmark(index)
+        print(f"⚡ {len(index):,} businesses: radius 500m {result['radius_us']:.0f}µs, "
+              f"10-nearest {result['nearest_us']:.0f}µs per query")
+
+if __name__ == "__main__":
+    main()
@@ -13,8 +13,24 @@ import os
 import sys
 import json
 import time
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import firebase_admin
 from firebase_admin import credentials, firestore
+from google.api_core import exceptions as google_exceptions
+from wait_strategies import MapsWaits
+from detail_extractor import read_detail_pane
+from feed_scroller import LISTING_SELECTOR, FeedScroller
+from progress_journal import ProgressJournal
+from maps_response_parser import ResponseCollector, has_required_fields
+from business_categorizer import DEFAULT_CATEGORIZER
+from resource_filter import DEFAULT_PROFILE, RESOURCE_PROFILES, ResourceFilter, print_resource_stats
+from entity_resolution import print_resolution_stats, resolve_duplicates
+from seen_places import SeenPlaces, place_key
+from columnar_export import COLUMNAR_FORMATS, HAS_PYARROW, save_feather, save_parquet
+from business_store import DEFAULT_STORE_PATH, BusinessStore, document_id
+from query_planner import optimize_queries
+from scraper_metrics import METRICS, start_metrics_server
 
 @dataclass
 class Business:
@@ -55,6 +71,25 @@ class Business:
             hash_fields.append(f"phone:{self.phone_number}")
         return hash(tuple(hash_fields))
 
+OUTPUT_FORMATS = ("csv", "excel") + COLUMNAR_FORMATS
+DEFAULT_OUTPUT_FORMATS = ()  # every query goes to the business store; per-query files are opt-in
+
+# Firestore rejects write batches larger than this
+FIRESTORE_BATCH_LIMIT = 500
+
+# Contention and transient backend errors - the whole batch is safe to resend
+FIRESTORE_RETRYABLE_ERRORS = (
+    google_exceptions.Aborted,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.InternalServerError,
+)
+
+def firestore_document_id(business):
+    """Stable document ID: the Google place ID, else a hash of name/address/phone"""
+    return document_id(business.google_place_id, business.name, business.address, business.phone_number)
+
 @dataclass
 class BusinessList:
     """Enhanced business list with Firebase integration"""
@@ -81,22 +116,51 @@ class BusinessList:
             sep="_"
         )
 
-    def save_to_excel(self, filename):
+    def save_to_excel(self, filename, df=None):
         """Save to Excel with Bazar Se formatting"""
-        df = self.dataframe()
+        df = self.dataframe() if df is None else df
         filepath = f"{self.save_at}/{filename}.xlsx"
         df.to_excel(filepath, index=False)
         print(f"✅ Excel saved: {filepath}")
 
-    def save_to_csv(self, filename):
+    def save_to_csv(self, filename, df=None):
         """Save to CSV with Bazar Se formatting"""
-        df = self.dataframe()
+        df = self.dataframe() if df is None else df
         filepath = f"{self.save_at}/{filename}.csv"
         df.to_csv(filepath, index=False)
         print(f"✅ CSV saved: {filepath}")
 
-    def save_to_firebase(self, collection_name="ujjain_businesses"):
-        """Save directly to Firebase Firestore"""
+    def save_to_parquet(self, filename, df=None, partition_cols=None):
+        """Save to typed Parquet (a partitioned folder when partition_cols is given)"""
+        df = self.dataframe() if df is None else df
+        filepath = f"{self.save_at}/{filename}" + ("" if partition_cols else ".parquet")
+        save_parquet(df, filepath, partition_cols)
+        print(f"✅ Parquet saved: {filepath}")
+
+    def save_to_feather(self, filename, df=None):
+        """Save to Arrow IPC (Feather)"""
+        df = self.dataframe() if df is None else df
+        filepath = f"{self.save_at}/{filename}.feather"
+        save_feather(df, filepath)
+        print(f"✅ Feather saved: {filepath}")
+
+    def save(self, filename, formats=DEFAULT_OUTPUT_FORMATS):
+        """Save in every requested format from a single DataFrame"""
+        if not formats:
+            return
+        df = self.dataframe()
+        savers = {
+            'csv': self.save_to_csv,
+            'excel': self.save_to_excel,
+            'parquet': self.save_to_parquet,
+            'feather': self.save_to_feather,
+        }
+        for output_format in formats:
+            savers[output_format](filename, df)
+
+    def save_to_firebase(self, collection_name="ujjain_businesses", batch_size=FIRESTORE_BATCH_LIMIT,
+                         max_in_flight=8, max_retries=5):
+        """Save to Firebase Firestore in batched commits keyed by Google place ID"""
         try:
             # Initialize Firebase (you'll need to add your service account key)
             if not firebase_admin._apps:
@@ -105,34 +169,55 @@ class BusinessList:
                 firebase_admin.initialize_app(cred)
             
             db = firestore.client()
+            collection = db.collection(collection_name)
             
-            success_count = 0
+            # Deterministic IDs make re-uploads overwrite instead of duplicating
+            documents = {}
             for business in self.business_list:
-                try:
-                    # Convert to dict and clean None values
-                    business_data = {k: v for k, v in asdict(business).items() if v is not None}
-                    
-                    # Add to Firestore
-                    doc_ref = db.collection(collection_name).add(business_data)
-                    success_count += 1
-                    print(f"✅ Added to Firebase: {business.name}")
-                    
-                except Exception as e:
-                    print(f"❌ Firebase error for {business.name}: {e}")
+                business_data = {k: v for k, v in asdict(business).items() if v is not None}
+                documents[firestore_document_id(business)] = business_data
             
-            print(f"🎉 Successfully added {success_count}/{len(self.business_list)} businesses to Firebase!")
+            items = list(documents.items())
+            batch_size = min(batch_size, FIRESTORE_BATCH_LIMIT)
+            chunks = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+            
+            def commit_chunk(chunk):
+                for attempt in range(max_retries + 1):
+                    batch = db.batch()
+                    for doc_id, business_data in chunk:
+                        batch.set(collection.document(doc_id), business_data)
+                    try:
+                        batch.commit()
+                        return len(chunk)
+                    except FIRESTORE_RETRYABLE_ERRORS as e:
+                        if attempt == max_retries:
+                            raise
+                        delay = min(30, 2 ** attempt) * (1 + random.random() / 2)
+                        print(f"🔁 Firestore batch retry {attempt + 1}/{max_retries} in {delay:.1f}s - {e}")
+                        time.sleep(delay)
+            
+            start_time = time.time()
+            success_count = 0
+            with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as executor:
+                futures = {executor.submit(commit_chunk, chunk): chunk for chunk in chunks}
+                for future in as_completed(futures):
+                    try:
+                        success_count += future.result()
+                    except Exception as e:
+                        print(f"❌ Firebase batch of {len(futures[future])} failed: {e}")
+            
+            elapsed = time.time() - start_time
+            print(f"🎉 Successfully wrote {success_count}/{len(items)} businesses to Firebase "
+                  f"in {len(chunks)} batches ({elapsed:.1f}s)")
+            return success_count
             
         except Exception as e:
             print(f"❌ Firebase connection error: {e}")
+            return 0
 
-def extract_coordinates_from_url(url: str) -> tuple[float, float]:
-    """Extract coordinates from Google Maps URL"""
-    try:
-        coordinates = url.split('/@')[-1].split('/')[0]
-        lat, lng = coordinates.split(',')[:2]
-        return float(lat), float(lng)
-    except:
-        return None, None
+def extract_business(page):
+    """Build a Business from the open detail pane (categories are left to apply_search_context)"""
+    return Business(**read_detail_pane(page))
 
 def get_ujjain_locations():
     """Get 20 key locations in Ujjain for comprehensive coverage"""
@@ -266,140 +351,32 @@ def get_ujjain_search_queries():
 
 def categorize_business(search_query, business_name, google_types=None):
     """Advanced categorization with multiple categories and subcategories"""
-
-    # Enhanced category mapping
-    category_mapping = {
-        # Food & Dining
-        "restaurant": ("🍽️ FOOD & DINING", "Restaurants"),
-        "fast food": ("🍽️ FOOD & DINING", "Fast Food"),
-        "sweet": ("🍽️ FOOD & DINING", "Sweet Shops"),
-        "bakery": ("🍽️ FOOD & DINING", "Bakeries"),
-        "ice cream": ("🍽️ FOOD & DINING", "Ice Cream Parlors"),
-        "juice": ("🍽️ FOOD & DINING", "Juice Centers"),
-        "tea": ("🍽️ FOOD & DINING", "Tea Stalls"),
-        "coffee": ("🍽️ FOOD & DINING", "Coffee Shops"),
-        "dhaba": ("🍽️ FOOD & DINING", "Dhaba"),
-        "pizza": ("🍽️ FOOD & DINING", "Pizza"),
-        "burger": ("🍽️ FOOD & DINING", "Burger Joints"),
-        "chat": ("🍽️ FOOD & DINING", "Chat Centers"),
-
-        # Grocery & Daily
-        "kirana": ("🛒 GROCERY & DAILY", "Kirana Stores"),
-        "grocery": ("🛒 GROCERY & DAILY", "Grocery Stores"),
-        "supermarket": ("🛒 GROCERY & DAILY", "Supermarkets"),
-        "general store": ("🛒 GROCERY & DAILY", "General Stores"),
-        "provision": ("🛒 GROCERY & DAILY", "Provision Stores"),
-        "spice": ("🛒 GROCERY & DAILY", "Spice Shops"),
-        "flour mill": ("🛒 GROCERY & DAILY", "Flour Mills"),
-
-        # Health & Medical
-        "hospital": ("🏥 HEALTH & MEDICAL", "Hospitals"),
-        "clinic": ("🏥 HEALTH & MEDICAL", "Clinics"),
-        "medical": ("🏥 HEALTH & MEDICAL", "Medical Stores"),
-        "pharmacy": ("🏥 HEALTH & MEDICAL", "Pharmacies"),
-        "dental": ("🏥 HEALTH & MEDICAL", "Dental Clinics"),
-        "eye": ("🏥 HEALTH & MEDICAL", "Eye Clinics"),
-        "skin": ("🏥 HEALTH & MEDICAL", "Skin Clinics"),
-        "diagnostic": ("🏥 HEALTH & MEDICAL", "Diagnostic Centers"),
-        "pathology": ("🏥 HEALTH & MEDICAL", "Pathology Labs"),
-        "ayurvedic": ("🏥 HEALTH & MEDICAL", "Ayurvedic Centers"),
-
-        # Fashion & Retail
-        "clothing": ("👗 FASHION & RETAIL", "Clothing Stores"),
-        "saree": ("👗 FASHION & RETAIL", "Saree Shops"),
-        "suit": ("👗 FASHION & RETAIL", "Suit Shops"),
-        "footwear": ("👗 FASHION & RETAIL", "Footwear"),
-        "shoe": ("👗 FASHION & RETAIL", "Shoe Stores"),
-        "bag": ("👗 FASHION & RETAIL", "Bags"),
-        "jewelry": ("👗 FASHION & RETAIL", "Jewelry"),
-        "jewellery": ("👗 FASHION & RETAIL", "Jewelry"),
-        "watch": ("👗 FASHION & RETAIL", "Watches"),
-
-        # Electronics & Tech
-        "mobile": ("📱 ELECTRONICS & TECH", "Mobile Shops"),
-        "electronics": ("📱 ELECTRONICS & TECH", "Electronics Stores"),
-        "computer": ("📱 ELECTRONICS & TECH", "Computer Shops"),
-        "laptop": ("📱 ELECTRONICS & TECH", "Laptop Stores"),
-        "repair": ("📱 ELECTRONICS & TECH", "Repair Services"),
-        "appliance": ("📱 ELECTRONICS & TECH", "Home Appliances"),
-
-        # Beauty & Care
-        "beauty": ("💄 BEAUTY & CARE", "Beauty Parlors"),
-        "salon": ("💄 BEAUTY & CARE", "Salons"),
-        "parlor": ("💄 BEAUTY & CARE", "Beauty Parlors"),
-        "parlour": ("💄 BEAUTY & CARE", "Beauty Parlors"),
-        "spa": ("💄 BEAUTY & CARE", "Spa"),
-        "cosmetic": ("💄 BEAUTY & CARE", "Cosmetics"),
-
-        # Home & Living
-        "furniture": ("🏠 HOME & LIVING", "Furniture Stores"),
-        "hardware": ("🏠 HOME & LIVING", "Hardware Stores"),
-        "paint": ("🏠 HOME & LIVING", "Paint Shops"),
-        "tile": ("🏠 HOME & LIVING", "Tiles"),
-        "marble": ("🏠 HOME & LIVING", "Marble"),
-
-        # Automotive & Transport
-        "petrol": ("🚗 AUTOMOTIVE & TRANSPORT", "Petrol Pumps"),
-        "auto": ("🚗 AUTOMOTIVE & TRANSPORT", "Auto Repair"),
-        "car": ("🚗 AUTOMOTIVE & TRANSPORT", "Car Service"),
-        "bike": ("🚗 AUTOMOTIVE & TRANSPORT", "Bike Service"),
-        "tire": ("🚗 AUTOMOTIVE & TRANSPORT", "Tire Shops"),
-        "transport": ("🚗 AUTOMOTIVE & TRANSPORT", "Transport Services"),
-
-        # Education & Training
-        "school": ("🎓 EDUCATION & TRAINING", "Schools"),
-        "college": ("🎓 EDUCATION & TRAINING", "Colleges"),
-        "coaching": ("🎓 EDUCATION & TRAINING", "Coaching Centers"),
-        "tuition": ("🎓 EDUCATION & TRAINING", "Tuition Centers"),
-        "book": ("🎓 EDUCATION & TRAINING", "Book Stores"),
-        "stationery": ("🎓 EDUCATION & TRAINING", "Stationery"),
-
-        # Business & Professional
-        "bank": ("💼 BUSINESS & PROFESSIONAL", "Banks"),
-        "atm": ("💼 BUSINESS & PROFESSIONAL", "ATMs"),
-        "insurance": ("💼 BUSINESS & PROFESSIONAL", "Insurance"),
-        "lawyer": ("💼 BUSINESS & PROFESSIONAL", "Lawyers"),
-        "real estate": ("💼 BUSINESS & PROFESSIONAL", "Real Estate"),
-        "property": ("💼 BUSINESS & PROFESSIONAL", "Property Dealers"),
-
-        # Travel & Stay
-        "hotel": ("🏨 TRAVEL & STAY", "Hotels"),
-        "guest house": ("🏨 TRAVEL & STAY", "Guest Houses"),
-        "lodge": ("🏨 TRAVEL & STAY", "Lodges"),
-        "travel": ("🏨 TRAVEL & STAY", "Travel Agencies"),
-        "tour": ("🏨 TRAVEL & STAY", "Tour Operators"),
-    }
-
-    # Find matching categories
-    categories = []
-    subcategories = []
-
-    search_lower = search_query.lower()
-    name_lower = (business_name or "").lower()
-
-    for keyword, (category, subcategory) in category_mapping.items():
-        if keyword in search_lower or keyword in name_lower:
-            if category not in categories:
-                categories.append(category)
-            if subcategory not in subcategories:
-                subcategories.append(subcategory)
-
-    # If no match found, use Google types
-    if not categories and google_types:
-        for gtype in google_types:
-            if gtype in category_mapping:
-                category, subcategory = category_mapping[gtype]
-                if category not in categories:
-                    categories.append(category)
-                if subcategory not in subcategories:
-                    subcategories.append(subcategory)
-
-    # Default fallback
-    if not categories:
-        categories = ["💼 BUSINESS & PROFESSIONAL"]
-        subcategories = ["General Business"]
-
-    return categories, subcategories
+    return DEFAULT_CATEGORIZER.categorize(search_query, business_name, google_types)
+
+def apply_search_context(business, search_query):
+    """Set categories, area and location of a business from its search query"""
+    categories, subcategories = categorize_business(search_query, business.name or "", business.google_types)
+    business.categories = categories
+    business.subcategories = subcategories
+    business.primary_category = categories[0] if categories else "💼 BUSINESS & PROFESSIONAL"
+    business.primary_subcategory = subcategories[0] if subcategories else "General Business"
+
+    # Extract area from search query or address
+    if " in " in search_query:
+        business.area = search_query.split(" in ")[-1].replace(", Ujjain", "").strip()
+    business.location = "Ujjain"
+
+def business_from_place_record(record, search_query):
+    """Build a Business from a place parsed out of an intercepted search response"""
+    business = Business(**{key: value for key, value in record.items() if value is not None})
+    apply_search_context(business, search_query)
+    return business
+
+def fill_missing_from_record(business, record):
+    """Complete a clicked business with whatever the intercepted payload already had"""
+    for key, value in record.items():
+        if getattr(business, key, None) in (None, []) and value not in (None, []):
+            setattr(business, key, value)
 
 def main():
     print("🔥 BAZAR SE - UJJAIN BUSINESS DATA SCRAPER 🔥")
@@ -411,8 +388,37 @@ def main():
     parser.add_argument("--firebase", action="store_true", help="Save to Firebase")
     parser.add_argument("--ujjain", action="store_true", help="Use predefined Ujjain queries")
     parser.add_argument("--test", action="store_true", help="Test mode with limited queries")
+    parser.add_argument("--headless", action="store_true", help="Run the browser without a window")
+    parser.add_argument("--resume", action="store_true", help="Skip queries finished in the previous run")
+    parser.add_argument("--journal", type=str, default=os.path.join('Ujjain_Business_Data', 'progress_journal.jsonl'),
+                        help="Progress journal used by --resume (not written by -s and --test runs)")
+    parser.add_argument("--no-journal", action="store_true", help="Don't write the progress journal")
+    parser.add_argument("--intercept", action="store_true",
+                        help="Read listings from Maps search responses, click only incomplete ones")
+    parser.add_argument("--resources", choices=list(RESOURCE_PROFILES), default=DEFAULT_PROFILE,
+                        help="Which page resources to download (listing-only blocks stylesheets too)")
+    parser.add_argument("--seen-file", type=str,
+                        help="Remember scraped places in this file so later runs never click them again")
+    parser.add_argument("--store", type=str, default=DEFAULT_STORE_PATH,
+                        help="SQLite business store every query is appended to")
+    parser.add_argument("--plan", action="store_true",
+                        help="Skip duplicate/synonym queries and ones past runs show are covered by others")
+    parser.add_argument("--formats", nargs="*", choices=OUTPUT_FORMATS, default=list(DEFAULT_OUTPUT_FORMATS),
+                        help="Also write per-query files in these formats, e.g. csv excel (parquet/feather need pyarrow)")
+    parser.add_argument("--partition-by", nargs="*", default=None,
+                        help="Partition the combined Parquet output by these columns, e.g. primary_category area")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve live Prometheus metrics on this local port, e.g. 9464")
     args = parser.parse_args()
 
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port, "google_maps_scraper_bazarse")
+
+    output_formats = args.formats
+    if set(output_formats) & set(COLUMNAR_FORMATS) and not HAS_PYARROW:
+        print("❌ Parquet/Feather output needs pyarrow: pip install pyarrow")
+        sys.exit()
+
     # Determine search list
     if args.test:
         # Test mode with limited queries
@@ -440,150 +446,177 @@ def main():
             print("❌ No search queries found. Use --ujjain, --test, or provide -s argument")
             sys.exit()
 
+    if args.plan:
+        # Drop duplicate, near-synonym and (per the store) already-covered queries
+        search_list = optimize_queries(search_list, args.store)
+
+    journal = None
+    # One-off -s / --test searches never touch the journal - a fresh journal would move a long run's aside
+    if args.test or (args.search and not args.ujjain):
+        if args.resume:
+            print("ℹ️  --resume is ignored for -s and --test runs, which are not journaled")
+    elif not args.no_journal:
+        journal = ProgressJournal(args.journal, resume=args.resume)
+        if args.resume:
+            skipped = len(search_list)
+            search_list = journal.pending(search_list)
+            print(f"⏭️  Skipping {skipped - len(search_list)} finished queries, {len(search_list)} left")
+
+    # Overlapping queries (same area, related subcategories) keep finding the same places
+    seen = SeenPlaces(args.seen_file)
+    if journal:
+        seen.update(journal.place_ids)  # empty unless resuming
+
+    store = BusinessStore(args.store)
     total_businesses = 0
+    run_records = []  # every query's businesses, merged across queries at the end
     
     with sync_playwright() as p:
         print("🚀 Starting browser...")
-        browser = p.chromium.launch(headless=False)  # Set to True for headless
+        browser = p.chromium.launch(headless=args.headless)
+        METRICS.browser_started()
         page = browser.new_page(locale="en-GB")
+        resources = ResourceFilter(args.resources)
+        resources.attach(page)
         page.goto("https://www.google.com/maps", timeout=20000)
+        waits = MapsWaits(page)
+        scroller = FeedScroller(page, waits)
+        
+        collector = None
+        if args.intercept:
+            collector = ResponseCollector()
+            page.on("response", collector.on_response)
         
         for search_index, search_query in enumerate(search_list):
             print(f"\n📍 {search_index + 1}/{len(search_list)} - {search_query}")
+            query_start = time.perf_counter()
             
             # Search on Google Maps
+            if collector:
+                collector.reset()
+            resources.start_query()
+            waits.mark_stale_results()
             page.locator('//input[@id="searchboxinput"]').fill(search_query)
-            page.wait_for_timeout(3000)
             page.keyboard.press("Enter")
-            page.wait_for_timeout(5000)
+            waits.results_loaded()
+
+            # Scroll the feed until enough listings, its end, or only already-scraped places come in
+            scrolled = scroller.scroll(args.total, seen)
+            hrefs = scrolled.hrefs[:args.total]
+            # Same selector the scroller read the hrefs with, so listings and hrefs line up by position
+            listings = page.locator(LISTING_SELECTOR).all()[:len(hrefs)]
 
-            # Scroll to load more results
-            page.hover('//a[contains(@href, "https://www.google.com/maps/place")]')
-            previously_counted = 0
+            print(f"✅ Found {len(listings)} businesses for {search_query} "
+                  f"({scrolled.iterations} scrolls, {scrolled.seconds:.1f}s, stopped: {scrolled.reason})")
+            
+            business_list = BusinessList()
+            
+            # Skip places an earlier query already extracted
+            fresh = seen.filter_new(list(zip(listings, hrefs)), href_of=lambda pair: pair[1])
+            fresh_hrefs = {href for _, href in fresh}
+            already_found = [place_key(href) for href in hrefs if href not in fresh_hrefs]
+            if already_found:
+                print(f"♻️  {len(already_found)} already scraped by earlier queries, skipping them")
             
-            while True:
-                page.mouse.wheel(0, 10000)
-                page.wait_for_timeout(3000)
+            # Listings still needing a click, with any partial record from the intercepted payloads
+            to_click = [(listing, href, None) for listing, href in fresh]
+            if collector and fresh:
+                collector.parse_pending()
                 
-                current_count = page.locator('//a[contains(@href, "https://www.google.com/maps/place")]').count()
+                to_click = []
+                for listing, href in fresh:
+                    record = collector.lookup(href)
+                    if has_required_fields(record):
+                        business = business_from_place_record(record, search_query)
+                        if business_list.add_business(business):
+                            total_businesses += 1
+                        seen.add(href, business.google_place_id)
+                    else:
+                        to_click.append((listing, href, record))
                 
-                if current_count >= args.total:
-                    listings = page.locator('//a[contains(@href, "https://www.google.com/maps/place")]').all()[:args.total]
-                    break
-                elif current_count == previously_counted:
-                    listings = page.locator('//a[contains(@href, "https://www.google.com/maps/place")]').all()
-                    break
-                else:
-                    previously_counted = current_count
-                    print(f"📊 Loading... {current_count} businesses found", end='\r')
-
-            print(f"✅ Found {len(listings)} businesses for {search_query}")
-            
-            business_list = BusinessList()
+                print(f"⚡ {len(fresh) - len(to_click)} businesses read from intercepted results, "
+                      f"clicking {len(to_click)} incomplete ones")
             
             # Extract business data
-            for listing_index, listing in enumerate(listings):
+            for listing_index, (listing, href, record) in enumerate(to_click):
                 try:
-                    listing.click()
-                    page.wait_for_timeout(2000)
+                    if not waits.open_listing(listing, href):
+                        print(f"⚠️  {listing_index + 1}/{len(to_click)} - detail pane never loaded, skipping")
+                        continue
                     
-                    business = Business()
+                    business = extract_business(page)
+                    
+                    if record:
+                        fill_missing_from_record(business, record)
                     
-                    # Extract business details
-                    if name_elem := page.locator('h1.DUwDvf').first:
-                        business.name = name_elem.inner_text().strip()
-
-                    if address_elem := page.locator('//button[@data-item-id="address"]//div[contains(@class, "fontBodyMedium")]').first:
-                        business.address = address_elem.inner_text().strip()
-
-                    if website_elem := page.locator('//a[@data-item-id="authority"]//div[contains(@class, "fontBodyMedium")]').first:
-                        business.domain = website_elem.inner_text().strip()
-                        business.website = f"https://www.{business.domain}"
-
-                    if phone_elem := page.locator('//button[contains(@data-item-id, "phone:tel:")]//div[contains(@class, "fontBodyMedium")]').first:
-                        business.phone_number = phone_elem.inner_text().strip()
-
-                    if review_count_elem := page.locator('//div[@jsaction="pane.reviewChart.moreReviews"]//span').first:
-                        try:
-                            business.reviews_count = int(review_count_elem.inner_text().split()[0].replace(',', ''))
-                        except:
-                            pass
-
-                    if rating_elem := page.locator('//div[@jsaction="pane.reviewChart.moreReviews"]//div[@role="img"]').first:
-                        try:
-                            business.reviews_average = float(rating_elem.get_attribute('aria-label').split()[0].replace(',', '.'))
-                        except:
-                            pass
-
-                    # Extract main business image
-                    try:
-                        # Try to get the main business photo
-                        photo_elem = page.locator('//div[contains(@class, "ZKCDEc")]//img').first
-                        if photo_elem:
-                            business.image_url = photo_elem.get_attribute('src')
-
-                        # Get additional photos
-                        photo_elems = page.locator('//div[contains(@class, "ZKCDEc")]//img').all()[:5]
-                        business.photos = [elem.get_attribute('src') for elem in photo_elems if elem.get_attribute('src')]
-                    except:
-                        pass
-
-                    # Extract opening hours
-                    try:
-                        hours_elem = page.locator('//div[contains(@class, "OqCZI")]//div[contains(@class, "fontBodyMedium")]').first
-                        if hours_elem:
-                            business.opening_hours = hours_elem.inner_text().strip()
-                    except:
-                        pass
-
-                    # Extract Google Place ID from URL
-                    try:
-                        url_parts = page.url.split('/')
-                        for part in url_parts:
-                            if part.startswith('0x') and len(part) > 10:
-                                business.google_place_id = part
-                                break
-                    except:
-                        pass
-
                     # Set categories and location
-                    categories, subcategories = categorize_business(search_query, business.name or "")
-                    business.categories = categories
-                    business.subcategories = subcategories
-                    business.primary_category = categories[0] if categories else "💼 BUSINESS & PROFESSIONAL"
-                    business.primary_subcategory = subcategories[0] if subcategories else "General Business"
-
-                    # Extract area from search query or address
-                    if " in " in search_query:
-                        business.area = search_query.split(" in ")[-1].replace(", Ujjain", "").strip()
-                    business.location = "Ujjain"
-
-                    # Extract coordinates
-                    business.latitude, business.longitude = extract_coordinates_from_url(page.url)
+                    apply_search_context(business, search_query)
                     
                     # Add to list
                     if business_list.add_business(business):
                         total_businesses += 1
-                        print(f"✅ {listing_index + 1}/{len(listings)} - {business.name}")
+                        print(f"✅ {listing_index + 1}/{len(to_click)} - {business.name}")
+                    seen.add(href, business.google_place_id)
                     
                 except Exception as e:
                     print(f"❌ Error extracting business {listing_index + 1}: {e}")
+                    METRICS.error('extract')
                     continue
             
             # Save data for this category
             filename = search_query.replace(' ', '_').replace('in_Ujjain', '').strip('_')
-            business_list.save_to_csv(filename)
-            business_list.save_to_excel(filename)
+            records = [asdict(business) for business in business_list.business_list]
+            store.save_query(search_query, records, already_found)
+            business_list.save(filename, output_formats)
+            METRICS.query_finished(time.perf_counter() - query_start, len(records), len(hrefs))
             
             if args.firebase:
                 business_list.save_to_firebase(f"ujjain_businesses_{filename}")
             
-            print(f"💾 Saved {len(business_list.business_list)} businesses for {search_query}")
+            run_records.extend(records)
+            
+            if journal:
+                journal.mark_done(
+                    search_query,
+                    place_ids=[business.google_place_id for business in business_list.business_list],
+                    businesses=len(business_list.business_list),
+                    output=store.path
+                )
+            seen.flush()
+            
+            print(f"💾 Saved {len(business_list.business_list)} businesses for {search_query} "
+                  f"({resources.query_summary()})")
         
         browser.close()
+        METRICS.browser_stopped()
+        print_resource_stats(resources.profile, resources.totals)
+    
+    store.close()
+    if journal:
+        journal.close()
+    if collector:
+        print(f"⚡ Intercepted {collector.stats['responses']} result payloads "
+              f"({collector.stats['bytes'] / 1024:.0f} KB), {collector.stats['parse_errors']} unreadable")
+    waits.telemetry.print_summary()
+    scroller.telemetry.print_summary()
+    seen.print_stats()
+    
+    # The same shop often turns up under several queries ("sweet shops" / "bakeries")
+    if len(search_list) > 1 and run_records:
+        resolved, resolution_stats = resolve_duplicates(run_records)
+        resolved_df = pd.json_normalize(resolved, sep="_")
+        resolved_path = f"{BusinessList.save_at}/all_businesses_resolved.csv"
+        resolved_df.to_csv(resolved_path, index=False)
+        print_resolution_stats(resolution_stats)
+        print(f"✅ CSV saved: {resolved_path}")
+        if "parquet" in output_formats:
+            parquet_path = f"{BusinessList.save_at}/all_businesses_resolved" + ("" if args.partition_by else ".parquet")
+            save_parquet(resolved_df, parquet_path, args.partition_by)
+            print(f"✅ Parquet saved: {parquet_path}")
     
     print(f"\n🎉 SCRAPING COMPLETED!")
     print(f"📊 Total businesses extracted: {total_businesses}")
+    print(f"🗃️  Business store: {args.store}")
     print(f"📁 Data saved in: {BusinessList.save_at}")
 
 if __name__ == "__main__":
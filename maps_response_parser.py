@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+🔥 GOOGLE MAPS RESPONSE INTERCEPTION - BULK LISTINGS WITHOUT CLICKS 🔥
+Capture the search XHR payloads Maps loads while scrolling and parse places from them
+"""
+
+import json
+import re
+from urllib.parse import quote_plus
+
+# Feature ID Maps uses in place URLs and payloads: 0x3963...:0x8f2...
+FEATURE_ID_RE = re.compile(r'^0x[0-9a-f]+:0x[0-9a-f]+$')
+
+# Fields a parsed place needs before we trust it without opening the detail pane
+REQUIRED_FIELDS = ('name', 'address', 'latitude', 'longitude')
+
+XSSI_PREFIX = ")]}'"
+
+def is_listing_response(url):
+    """Search result batches (first page and every scroll) and place previews"""
+    return ('tbm=map' in url and '/search' in url) or '/maps/preview/place' in url
+
+def decode_maps_payload(text):
+    """Strip the )]}' guard (possibly wrapped in {"d": ...}) and parse the JSON arrays"""
+    if not text:
+        return None
+    text = text.strip()
+    if text.startswith(XSSI_PREFIX):
+        text = text[len(XSSI_PREFIX):]
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError:
+        # Search responses are sometimes several JSON documents separated by /*""*/
+        text = text.split('/*""*/')[0]
+        try:
+            payload = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+
+    if isinstance(payload, dict) and isinstance(payload.get('d'), str):
+        return decode_maps_payload(payload['d'])
+    return payload
+
+def _dig(node, *path):
+    """Safe nested index lookup - returns None instead of raising"""
+    for index in path:
+        if not isinstance(node, list) or index >= len(node) or node[index] is None:
+            return None
+        node = node[index]
+    return node
+
+def _is_place_array(node):
+    return (
+        isinstance(node, list) and len(node) > 11
+        and isinstance(node[10], str) and FEATURE_ID_RE.match(node[10])
+        and isinstance(node[11], str)
+    )
+
+def iter_place_arrays(node, depth=0):
+    """Walk the payload and yield every place info array, wherever Maps nests it"""
+    if depth > 12 or not isinstance(node, list):
+        return
+    if _is_place_array(node):
+        yield node
+        return
+    for child in node:
+        if isinstance(child, list):
+            yield from iter_place_arrays(child, depth + 1)
+
+def parse_place_array(info):
+    """Map one place info array to Business field names (missing fields are None)"""
+    address = _dig(info, 39) or _dig(info, 18)
+    if address is None and isinstance(_dig(info, 2), list):
+        address = ", ".join(part for part in info[2] if isinstance(part, str)) or None
+
+    website = _dig(info, 7, 0)
+    domain = _dig(info, 7, 1)
+
+    categories = _dig(info, 13)
+    if not isinstance(categories, list):
+        categories = []
+
+    photo = _dig(info, 72, 0, 1, 6, 0) or _dig(info, 37, 0, 0, 6, 0)
+
+    record = {
+        'name': _dig(info, 11),
+        'address': address if isinstance(address, str) else None,
+        'google_place_id': info[10],
+        'latitude': _dig(info, 9, 2),
+        'longitude': _dig(info, 9, 3),
+        'reviews_average': _dig(info, 4, 7),
+        'reviews_count': _dig(info, 4, 8),
+        'phone_number': _dig(info, 178, 0, 0),
+        'website': website if isinstance(website, str) else None,
+        'domain': domain if isinstance(domain, str) else None,
+        'google_types': [category for category in categories if isinstance(category, str)],
+        'image_url': photo if isinstance(photo, str) else None,
+    }
+
+    for key in ('latitude', 'longitude', 'reviews_average'):
+        if not isinstance(record[key], (int, float)):
+            record[key] = None
+    if not isinstance(record['reviews_count'], int):
+        record['reviews_count'] = None
+    if not isinstance(record['phone_number'], str):
+        record['phone_number'] = None
+
+    return record
+
+def parse_search_payload(text):
+    """All places in one intercepted response body"""
+    payload = decode_maps_payload(text)
+    if payload is None:
+        return []
+    return [parse_place_array(info) for info in iter_place_arrays(payload)]
+
+def has_required_fields(record):
+    return bool(record) and all(record.get(field) is not None for field in REQUIRED_FIELDS)
+
+def feature_id_from_href(href):
+    """Feature ID embedded in a listing's /maps/place/ href (…!1s0x…:0x…!…)"""
+    if href and '!1s0x' in href:
+        candidate = href.split('!1s')[1].split('!')[0]
+        if FEATURE_ID_RE.match(candidate):
+            return candidate
+    return None
+
+def place_url(place_id, name=None):
+    """Direct Maps URL of a place from its feature ID (0x…:0x…) or Places API ID (ChIJ…), else None"""
+    if not place_id:
+        return None
+    if FEATURE_ID_RE.match(place_id):
+        slug = f"{quote_plus(name)}/" if name else ""
+        return f"https://www.google.com/maps/place/{slug}data=!4m2!3m1!1s{place_id}"
+    if place_id.startswith('ChI'):
+        return f"https://www.google.com/maps/place/?q=place_id:{place_id}"
+    return None
+
+class ResponseCollector:
+    """Listens to page responses and indexes every place it sees by feature ID"""
+
+    def __init__(self):
+        self.pending = []  # responses captured but not parsed yet
+        self.places = {}  # feature ID -> record
+        self.stats = {'responses': 0, 'bytes': 0, 'places': 0, 'parse_errors': 0}
+
+    def on_response(self, response):
+        """page.on("response", ...) handler - only queues, bodies are read later"""
+        if is_listing_response(response.url):
+            self.pending.append(response)
+
+    def _ingest(self, body):
+        self.stats['responses'] += 1
+        self.stats['bytes'] += len(body)
+        for record in parse_search_payload(body):
+            known = self.places.get(record['google_place_id'])
+            if known:
+                # Keep whichever batch carried more detail for each field
+                for key, value in record.items():
+                    if known.get(key) in (None, []) and value not in (None, []):
+                        known[key] = value
+            else:
+                self.places[record['google_place_id']] = record
+                self.stats['places'] += 1
+
+    def parse_pending(self):
+        """Read and parse queued bodies (sync Playwright API)"""
+        responses, self.pending = self.pending, []
+        for response in responses:
+            try:
+                self._ingest(response.text())
+            except Exception:
+                self.stats['parse_errors'] += 1
+
+    async def parse_pending_async(self):
+        """Read and parse queued bodies (async Playwright API)"""
+        responses, self.pending = self.pending, []
+        for response in responses:
+            try:
+                self._ingest(await response.text())
+            except Exception:
+                self.stats['parse_errors'] += 1
+
+    def lookup(self, href):
+        """Parsed record for a listing href, or None"""
+        feature_id = feature_id_from_href(href)
+        return self.places.get(feature_id) if feature_id else None
+
+    def reset(self):
+        """Forget everything captured for the previous query"""
+        self.pending = []
+        self.places = {}
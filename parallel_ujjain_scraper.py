@@ -7,30 +7,54 @@ Complete Ujjain data extraction in 6-8 hours using massive parallelization
 import asyncio
 import aiohttp
 import multiprocessing as mp
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 import threading
 import queue
 import time
 import json
-import os
 import sys
-from datetime import datetime
 import pandas as pd
 from dataclasses import dataclass, asdict
 import random
-import subprocess
+from query_scheduler import QueryScheduler, SchedulerConfig, dense_first_priority
+from progress_journal import ProgressJournal
+from browser_pool import BrowserPool, PoolConfig
+from resource_filter import DEFAULT_PROFILE, RESOURCE_PROFILES
+from wait_strategies import AsyncMapsWaits, WaitTelemetry
+from feed_scroller import LISTING_SELECTOR, AsyncFeedScroller, ScrollTelemetry
+from detail_extractor import read_detail_pane_async
+from maps_response_parser import ResponseCollector, has_required_fields
+from seen_places import SeenPlaces, place_key
+from business_store import DEFAULT_STORE_PATH, BusinessStore
+from query_planner import optimize_queries
+from columnar_export import COLUMNAR_FORMATS, HAS_PYARROW
+from scraper_metrics import METRICS, start_metrics_server
+from playwright.async_api import async_playwright
+from google_maps_scraper_bazarse import (
+    DEFAULT_OUTPUT_FORMATS, OUTPUT_FORMATS, Business, BusinessList, apply_search_context,
+    business_from_place_record, fill_missing_from_record
+)
+import argparse
+
+JOURNAL_PATH = "Parallel_Ujjain_progress.jsonl"
 
 @dataclass
 class ParallelConfig:
     """Configuration for parallel scraping"""
-    total_workers: int = 1000
-    browser_workers: int = 100  # Actual browser instances
-    queries_per_worker: int = 5
+    browser_workers: int = 100  # Actual browser instances (capped at max_concurrent_browsers)
     businesses_per_query: int = 25
-    max_concurrent_browsers: int = 50
-    worker_timeout: int = 300  # 5 minutes per worker
+    max_concurrent_browsers: int = 50  # workers = pages open at once
+    seconds_per_query: int = 65  # search + scroll + ~2s per click, for the estimates only
+    worker_timeout: int = 300  # 5 minutes per query
     retry_attempts: int = 3
     delay_between_requests: float = 0.1  # 100ms delay
+    headless: bool = True
+    intercept_responses: bool = False  # Read listings from search payloads, click only incomplete ones
+    resource_profile: str = DEFAULT_PROFILE  # listing-only / details / full
+    seen_file: str = None  # Remember scraped places across runs (one place per line)
+    store_path: str = DEFAULT_STORE_PATH  # SQLite store every finished query is appended to
+    plan_queries: bool = False  # drop duplicate/synonym/covered queries before scraping
+    output_formats: tuple = DEFAULT_OUTPUT_FORMATS  # extra per-query files: csv / excel / parquet / feather
 
 def generate_all_ujjain_queries():
     """Generate all 5000 Ujjain search queries"""
@@ -127,87 +151,191 @@ def generate_all_ujjain_queries():
     
     return queries
 
-def split_queries_for_workers(queries, num_workers):
-    """Split queries among workers"""
-    chunk_size = len(queries) // num_workers
-    worker_queries = []
-    
-    for i in range(num_workers):
-        start_idx = i * chunk_size
-        if i == num_workers - 1:  # Last worker gets remaining queries
-            end_idx = len(queries)
-        else:
-            end_idx = (i + 1) * chunk_size
-        
-        worker_queries.append(queries[start_idx:end_idx])
-    
-    return worker_queries
-
-def create_worker_script(worker_id, queries, config):
-    """Create individual worker script"""
-    
-    script_content = f'''#!/usr/bin/env python3
-"""
-Worker {worker_id} - Parallel Ujjain Scraper
-"""
-
-import subprocess
-import sys
-import time
-import os
-from datetime import datetime
+async def extract_business(page, search_query):
+    """Build a Business from the open detail pane (async twin of the main scraper's extraction)"""
+    return Business(**await read_detail_pane_async(page))
 
-def run_worker_{worker_id}():
-    """Run worker {worker_id} with assigned queries"""
-    
-    queries = {queries}
-    
-    print(f"🔥 Worker {worker_id} starting with {{len(queries)}} queries")
-    
-    total_businesses = 0
+class InProcessRunner:
+    """Keeps browsers warm in this process and streams per-query results to a single writer"""
+    
+    def __init__(self, config, journal):
+        self.config = config
+        self.journal = journal
+        self.wait_telemetry = WaitTelemetry()
+        self.scroll_telemetry = ScrollTelemetry()
+        self.results = None  # asyncio.Queue of (query, [Business], [place IDs skipped as already scraped])
+        self.total_businesses = 0
+        self.intercept_stats = {'from_payload': 0, 'clicked': 0, 'responses': 0, 'bytes': 0}
+        # Shared by all workers; on --resume it starts with the places of finished queries
+        self.seen = SeenPlaces(config.seen_file)
+        self.seen.update(journal.place_ids)
+        self.store = BusinessStore(config.store_path)
+    
+    async def _scrape(self, pool, query, worker_id):
+        async with pool.page() as page:
+            resources = pool.resources_for(page)
+            resources.start_query()
+            waits = AsyncMapsWaits(page, self.wait_telemetry)
+            collector = None
+            if self.config.intercept_responses:
+                collector = ResponseCollector()
+                page.on("response", collector.on_response)
+            try:
+                businesses, already_found = await self._scrape_page(page, waits, collector, query, worker_id)
+                return businesses, already_found, resources.query_summary()
+            finally:
+                if collector:
+                    # Pooled pages outlive the query - don't leave the listener behind
+                    page.remove_listener("response", collector.on_response)
+                    self.intercept_stats['responses'] += collector.stats['responses']
+                    self.intercept_stats['bytes'] += collector.stats['bytes']
+    
+    async def _scrape_page(self, page, waits, collector, query, worker_id):
+        await waits.mark_stale_results()
+        await page.fill('input[id="searchboxinput"]', query)
+        await page.press('input[id="searchboxinput"]', 'Enter')
+        await waits.results_loaded()
+        
+        # Scroll the feed until enough listings, its end, or only already-scraped places come in
+        scrolled = await AsyncFeedScroller(page, waits, self.scroll_telemetry).scroll(
+            self.config.businesses_per_query, self.seen)
+        hrefs = scrolled.hrefs[:self.config.businesses_per_query]
+        listings = (await page.locator(LISTING_SELECTOR).all())[:len(hrefs)]
+        print(f"📜 Worker {worker_id}: {query} - {len(hrefs)} listings after {scrolled.iterations} scrolls "
+              f"in {scrolled.seconds:.1f}s ({scrolled.reason})")
+        businesses = []
+        
+        # Skip places another query already extracted
+        fresh = self.seen.filter_new(list(zip(listings, hrefs)), href_of=lambda pair: pair[1])
+        fresh_hrefs = {href for _, href in fresh}
+        already_found = [place_key(href) for href in hrefs if href not in fresh_hrefs]
+        
+        # Listings still needing a click, with any partial record from the intercepted payloads
+        to_click = [(listing, href, None) for listing, href in fresh]
+        if collector and fresh:
+            await collector.parse_pending_async()
+            
+            to_click = []
+            for listing, href in fresh:
+                record = collector.lookup(href)
+                if has_required_fields(record):
+                    businesses.append(business_from_place_record(record, query))
+                else:
+                    to_click.append((listing, href, record))
+            self.intercept_stats['from_payload'] += len(fresh) - len(to_click)
+            self.intercept_stats['clicked'] += len(to_click)
+        
+        for i, (listing, href, record) in enumerate(to_click):
+            try:
+                if not await waits.open_listing(listing, href):
+                    print(f"⚠️  Worker {worker_id}: detail pane of business {i + 1} never loaded, skipping")
+                    continue
+                business = await extract_business(page, query)
+                if record:
+                    fill_missing_from_record(business, record)
+                apply_search_context(business, query)
+                if business.name:
+                    businesses.append(business)
+            except Exception as e:
+                print(f"Worker {worker_id}: Error extracting business {i + 1}: {e}")
+                METRICS.error('extract')
+        
+        return businesses, already_found
     
-    for i, query in enumerate(queries):
+    async def scrape_query(self, pool, query, worker_id):
+        """Scrape one query on a pooled page and hand the results to the writer"""
+        
+        start = time.perf_counter()
         try:
-            print(f"Worker {worker_id}: {{i+1}}/{{len(queries)}} - {{query}}")
-            
-            # Run scraper for this query
-            cmd = [
-                sys.executable,
-                'google_maps_scraper_bazarse.py',
-                '-s', query,
-                '-t', '{config.businesses_per_query}',
-                '--headless'  # Run in headless mode for speed
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout={config.worker_timeout})
+            businesses, already_found, bandwidth = await asyncio.wait_for(
+                self._scrape(pool, query, worker_id), self.config.worker_timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"timed out after {self.config.worker_timeout}s")
+        
+        await self.results.put((query, businesses, already_found))
+        METRICS.query_finished(time.perf_counter() - start, len(businesses), len(businesses) + len(already_found))
+        print(f"✅ Worker {worker_id}: {query} - {len(businesses)} businesses ({bandwidth})")
+        return len(businesses)
+    
+    async def _writer(self):
+        """Single consumer: appends each query to the store (plus any per-query files) and journals it"""
+        
+        while True:
+            item = await self.results.get()
+            if item is None:
+                break
             
-            if result.returncode == 0:
-                print(f"✅ Worker {worker_id}: {{query}} completed")
-                total_businesses += {config.businesses_per_query}
-            else:
-                print(f"❌ Worker {worker_id}: {{query}} failed")
+            query, businesses, already_found = item
+            business_list = BusinessList()
+            for business in businesses:
+                business_list.add_business(business)
             
-            # Small delay to avoid overwhelming
-            time.sleep({config.delay_between_requests})
+            filename = query.replace(' ', '_').replace('in_Ujjain', '').strip('_')
+            records = [asdict(business) for business in business_list.business_list]
+            try:
+                # SQLite and pandas/openpyxl are blocking - keep them off the event loop
+                await asyncio.to_thread(self.store.save_query, query, records, already_found)
+                await asyncio.to_thread(business_list.save, filename, self.config.output_formats)
+            except Exception as e:
+                print(f"❌ Could not save {query}: {e}")
+                continue
             
-        except subprocess.TimeoutExpired:
-            print(f"⏰ Worker {worker_id}: {{query}} timed out")
-        except Exception as e:
-            print(f"❌ Worker {worker_id}: Error - {{e}}")
-    
-    print(f"🎉 Worker {worker_id} completed! Total businesses: {{total_businesses}}")
-    return total_businesses
-
-if __name__ == "__main__":
-    run_worker_{worker_id}()
-'''
-    
-    # Save worker script
-    script_path = f"worker_{worker_id}.py"
-    with open(script_path, 'w') as f:
-        f.write(script_content)
-    
-    return script_path
+            self.journal.mark_done(
+                query,
+                place_ids=[business.google_place_id for business in business_list.business_list],
+                businesses=len(business_list.business_list),
+                output=self.store.path
+            )
+            # Registered only once saved - a query whose save failed must not mark its places as scraped
+            self.seen.add(*(business.google_place_id for business in business_list.business_list))
+            self.seen.flush()
+            self.total_businesses += len(business_list.business_list)
+    
+    async def run(self, queries):
+        """Scrape all queries with max_concurrent_browsers workers over browser_workers browsers"""
+        
+        self.results = asyncio.Queue()
+        browsers = max(1, min(self.config.browser_workers, self.config.max_concurrent_browsers))
+        pool_config = PoolConfig(
+            max_browsers=browsers,
+            contexts_per_browser=-(-self.config.max_concurrent_browsers // browsers),
+            headless=self.config.headless,
+            resource_profile=self.config.resource_profile
+        )
+        
+        async with async_playwright() as playwright:
+            async with BrowserPool(playwright, pool_config) as pool:
+                writer = asyncio.create_task(self._writer())
+                
+                # Idle workers pull the next query, so dense queries never hold up a fixed chunk
+                scheduler = QueryScheduler(
+                    lambda query, worker_id: self.scrape_query(pool, query, worker_id),
+                    SchedulerConfig(
+                        concurrency=self.config.max_concurrent_browsers,
+                        max_retries=self.config.retry_attempts,
+                        delay_between_queries=self.config.delay_between_requests
+                    ),
+                    priority=dense_first_priority
+                )
+                
+                try:
+                    await scheduler.run(queries)
+                finally:
+                    await self.results.put(None)
+                    await writer
+                    self.store.close()
+                
+                scheduler.print_stats()
+                pool.print_stats()
+                self.wait_telemetry.print_summary()
+                self.scroll_telemetry.print_summary()
+                self.seen.print_stats()
+                if self.config.intercept_responses:
+                    print(f"⚡ Interception: {self.intercept_stats['from_payload']} businesses from payloads, "
+                          f"{self.intercept_stats['clicked']} clicked, {self.intercept_stats['responses']} responses "
+                          f"({self.intercept_stats['bytes'] / 1024:.0f} KB)")
+        
+        return self.total_businesses
 
 def calculate_parallel_estimates(config):
     """Calculate estimates for parallel execution"""
@@ -215,45 +343,54 @@ def calculate_parallel_estimates(config):
     total_queries = len(generate_all_ujjain_queries())
     total_businesses = total_queries * config.businesses_per_query
     
-    # Time calculations for parallel execution
-    queries_per_worker = total_queries // config.total_workers
-    time_per_query = 10  # minutes (including browser startup)
-    time_per_worker = queries_per_worker * time_per_query
+    # The runner's pool: max_concurrent_browsers pages spread over at most browser_workers browsers
+    workers = config.max_concurrent_browsers
+    browsers = max(1, min(config.browser_workers, workers))
+    queries_per_worker = -(-total_queries // workers)
     
-    # Since workers run in parallel, total time is max worker time
-    total_time_minutes = time_per_worker
-    total_time_hours = total_time_minutes / 60
+    # Idle workers pull the next query, so the run takes about one worker's share of queries
+    time_per_worker = queries_per_worker * config.seconds_per_query / 60
+    total_time_hours = time_per_worker / 60
     
     estimates = {
         "🚀 PARALLEL EXECUTION": {
-            "Total Workers": config.total_workers,
-            "Browser Instances": config.browser_workers,
+            "Parallel Workers": workers,
+            "Browser Instances": browsers,
+            "Pages per Browser": -(-workers // browsers),
             "Queries per Worker": queries_per_worker,
             "Total Queries": f"{total_queries:,}",
             "Expected Businesses": f"{total_businesses:,}"
         },
         "⚡ ULTRA-FAST TIMING": {
-            "Per Query": "10 minutes (parallel)",
-            "Per Worker": f"{time_per_worker} minutes",
+            "Per Query": f"~{config.seconds_per_query}s",
+            "Per Worker": f"{time_per_worker:.0f} minutes",
             "Total Time": f"{total_time_hours:.1f} hours",
             "Speed Improvement": f"{833/total_time_hours:.0f}x faster",
-            "Completion": "TODAY (6-8 hours)"
         },
         "💾 MASSIVE DATA OUTPUT": {
             "Businesses": f"{total_businesses:,}",
             "Images": f"{total_businesses * 5:,}",
             "Files": f"{total_queries:,}",
             "Data Size": "2-3 GB",
-            "Workers Running": f"{config.total_workers} parallel"
+            "Workers Running": f"{workers} parallel"
         }
     }
     
     return estimates
 
-def start_parallel_extraction():
+def start_parallel_extraction(resume=False, intercept=False, resource_profile=DEFAULT_PROFILE, seen_file=None,
+                              output_formats=DEFAULT_OUTPUT_FORMATS, store_path=DEFAULT_STORE_PATH,
+                              plan_queries=False):
     """Start the parallel extraction process"""
     
-    config = ParallelConfig()
+    # Fail now, not when the first query's files are written hours into the run
+    if set(output_formats) & set(COLUMNAR_FORMATS) and not HAS_PYARROW:
+        print("❌ Parquet/Feather output needs pyarrow: pip install pyarrow")
+        sys.exit()
+    
+    config = ParallelConfig(intercept_responses=intercept, resource_profile=resource_profile, seen_file=seen_file,
+                            output_formats=tuple(output_formats), store_path=store_path,
+                            plan_queries=plan_queries)
     
     print("🔥 ULTRA-FAST PARALLEL UJJAIN SCRAPER 🔥")
     print("=" * 60)
@@ -271,77 +408,48 @@ def start_parallel_extraction():
     print("🚀 PARALLEL EXECUTION PLAN")
     print("=" * 60)
     
-    print(f"✅ {config.total_workers} workers will run simultaneously")
-    print(f"✅ {config.browser_workers} browser instances")
-    print(f"✅ Each worker handles ~5 queries")
-    print(f"✅ Complete in 6-8 hours (TODAY)")
+    print(f"✅ {config.max_concurrent_browsers} workers share one query queue")
+    print(f"✅ {estimates['🚀 PARALLEL EXECUTION']['Browser Instances']} browser instances")
+    print(f"✅ Failed queries retried {config.retry_attempts}x with backoff")
+    print(f"✅ Complete in about {estimates['⚡ ULTRA-FAST TIMING']['Total Time']}")
     print(f"✅ 125,000+ businesses with images")
     print(f"✅ All data saved to GitHub folder")
     
-    choice = input(f"\n👉 Start {config.total_workers} parallel workers? (y/n): ").lower()
+    choice = input(f"\n👉 Start {config.max_concurrent_browsers} parallel workers? (y/n): ").lower()
     
     if choice == 'y':
-        run_parallel_workers(config)
+        run_parallel_workers(config, resume=resume)
     else:
         print("👋 Parallel extraction cancelled")
 
-def run_parallel_workers(config):
-    """Run all parallel workers"""
+def run_parallel_workers(config, resume=False):
+    """Run all queries through a shared work queue of parallel workers"""
     
-    print(f"\n🚀 STARTING {config.total_workers} PARALLEL WORKERS")
+    print(f"\n🚀 STARTING {config.max_concurrent_browsers} PARALLEL WORKERS")
     print("=" * 50)
     
     # Generate all queries
     all_queries = generate_all_ujjain_queries()
     print(f"📊 Total queries generated: {len(all_queries):,}")
+    if config.plan_queries:
+        all_queries = optimize_queries(all_queries, config.store_path)
     
-    # Split queries among workers
-    worker_queries = split_queries_for_workers(all_queries, config.total_workers)
-    
-    # Create worker scripts
-    worker_scripts = []
-    for i in range(config.total_workers):
-        script_path = create_worker_script(i, worker_queries[i], config)
-        worker_scripts.append(script_path)
+    journal = ProgressJournal(JOURNAL_PATH, resume=resume)
+    pending_queries = journal.pending(all_queries)
+    if len(pending_queries) < len(all_queries):
+        print(f"⏭️  Skipping {len(all_queries) - len(pending_queries):,} queries finished in a previous run")
     
-    print(f"✅ Created {len(worker_scripts)} worker scripts")
+    print(f"📁 Results will be saved in: {config.store_path}")
     
-    # Create results directory
-    results_dir = f"Parallel_Ujjain_Data_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-    os.makedirs(results_dir, exist_ok=True)
-    
-    print(f"📁 Results will be saved in: {results_dir}")
-    
-    # Start all workers in parallel
-    print(f"\n🔥 LAUNCHING {config.total_workers} WORKERS...")
+    print(f"\n🔥 LAUNCHING {config.max_concurrent_browsers} WORKERS...")
+    print("📊 Monitor progress in terminal...")
     
     start_time = time.time()
-    
-    # Use ProcessPoolExecutor for true parallelism
-    with ProcessPoolExecutor(max_workers=config.total_workers) as executor:
-        # Submit all worker tasks
-        futures = []
-        for i, script_path in enumerate(worker_scripts):
-            future = executor.submit(run_single_worker, i, script_path)
-            futures.append(future)
-        
-        print(f"✅ All {config.total_workers} workers launched!")
-        print("📊 Monitor progress in terminal...")
-        
-        # Wait for all workers to complete
-        completed_workers = 0
-        total_businesses = 0
-        
-        for future in futures:
-            try:
-                worker_result = future.result(timeout=config.worker_timeout * 2)
-                completed_workers += 1
-                total_businesses += worker_result
-                
-                print(f"✅ Worker completed ({completed_workers}/{config.total_workers})")
-                
-            except Exception as e:
-                print(f"❌ Worker failed: {e}")
+    runner = InProcessRunner(config, journal)
+    try:
+        total_businesses = asyncio.run(runner.run(pending_queries))
+    finally:
+        journal.close()
     
     end_time = time.time()
     duration_hours = (end_time - start_time) / 3600
@@ -349,38 +457,10 @@ def run_parallel_workers(config):
     print(f"\n🎉 PARALLEL EXTRACTION COMPLETED!")
     print(f"⏱️  Total time: {duration_hours:.1f} hours")
     print(f"📊 Total businesses: {total_businesses:,}")
-    print(f"📁 Data saved in: {results_dir}")
-    
-    # Cleanup worker scripts
-    for script_path in worker_scripts:
-        try:
-            os.remove(script_path)
-        except:
-            pass
+    print(f"📁 Data saved in: {config.store_path}")
     
     print("🔥 UJJAIN DATA EXTRACTION COMPLETED TODAY!")
 
-def run_single_worker(worker_id, script_path):
-    """Run a single worker process"""
-    
-    try:
-        result = subprocess.run([sys.executable, script_path], 
-                              capture_output=True, text=True, 
-                              timeout=300)  # 5 minute timeout per worker
-        
-        if result.returncode == 0:
-            return 25  # Approximate businesses per worker
-        else:
-            print(f"Worker {worker_id} error: {result.stderr}")
-            return 0
-            
-    except subprocess.TimeoutExpired:
-        print(f"Worker {worker_id} timed out")
-        return 0
-    except Exception as e:
-        print(f"Worker {worker_id} exception: {e}")
-        return 0
-
 def main():
     """Main parallel extraction function"""
     
@@ -400,7 +480,29 @@ def main():
     print("✅ 500,000+ images")
     print("✅ Complete Ujjain coverage")
     
-    start_parallel_extraction()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resume", action="store_true", help="Skip queries finished in the previous run")
+    parser.add_argument("--intercept", action="store_true",
+                        help="Read listings from Maps search responses, click only incomplete ones")
+    parser.add_argument("--resources", choices=list(RESOURCE_PROFILES), default=DEFAULT_PROFILE,
+                        help="Which page resources to download (listing-only blocks stylesheets too)")
+    parser.add_argument("--seen-file", type=str,
+                        help="Remember scraped places in this file so later runs never click them again")
+    parser.add_argument("--store", type=str, default=DEFAULT_STORE_PATH,
+                        help="SQLite business store every query is appended to")
+    parser.add_argument("--plan", action="store_true",
+                        help="Skip duplicate/synonym queries and ones past runs show are covered by others")
+    parser.add_argument("--formats", nargs="*", choices=OUTPUT_FORMATS, default=list(DEFAULT_OUTPUT_FORMATS),
+                        help="Also write per-query files in these formats, e.g. csv excel (parquet/feather need pyarrow)")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve live Prometheus metrics on this local port, e.g. 9464")
+    args = parser.parse_args()
+    
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port, "parallel_ujjain_scraper")
+    start_parallel_extraction(resume=args.resume, intercept=args.intercept, resource_profile=args.resources,
+                              seen_file=args.seen_file, output_formats=args.formats, store_path=args.store,
+                              plan_queries=args.plan)
 
 if __name__ == "__main__":
     main()
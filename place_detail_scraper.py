@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+🔥 DIRECT PLACE SCRAPER - NO SEARCH, NO SCROLL, JUST THE DETAIL PANE 🔥
+Open known place URLs / place IDs straight away on a pool of warm pages and extract Business fields
+"""
+
+import asyncio
+import time
+import argparse
+from dataclasses import dataclass, asdict
+from playwright.async_api import async_playwright
+from browser_pool import BrowserPool, PoolConfig
+from query_scheduler import QueryScheduler, SchedulerConfig
+from resource_filter import DEFAULT_PROFILE, RESOURCE_PROFILES
+from wait_strategies import AsyncMapsWaits, WaitTelemetry
+from maps_response_parser import feature_id_from_href, place_url
+from business_store import DEFAULT_STORE_PATH, TRACKED_FIELDS, BusinessStore, record_id
+from google_maps_scraper_bazarse import Business, apply_search_context
+from detail_extractor import read_detail_pane_async
+from scraper_metrics import METRICS, start_metrics_server
+
+# What the detail pane shows - Business defaults (status, city, source) must not overwrite stored values
+DETAIL_FIELDS = (
+    'name', 'address', 'domain', 'website', 'phone_number', 'opening_hours', 'reviews_count',
+    'reviews_average', 'latitude', 'longitude', 'image_url', 'photos', 'scraped_at',
+)
+
+@dataclass
+class DetailConfig:
+    """Configuration for direct place-URL scraping"""
+    concurrency: int = 8  # detail pages open at once
+    browsers: int = 2
+    max_retries: int = 1  # a place that won't load twice is usually gone
+    headless: bool = True
+    resource_profile: str = DEFAULT_PROFILE
+    navigation_timeout: int = 20000  # ms
+
+def detail_fields(business):
+    """The scraped detail-pane fields of a Business, for BusinessStore.apply_refresh"""
+    return {field: getattr(business, field) for field in DETAIL_FIELDS}
+
+def target_url(value, name=None):
+    """Place URL for a /maps/place/ URL, feature ID (0x…:0x…) or Places API ID (ChIJ…), else None"""
+    value = (value or "").strip()
+    if value.startswith('http'):
+        return value if '/maps/place' in value else None
+    return place_url(value, name)
+
+class PlaceDetailScraper:
+    """Scrapes many known places concurrently over one BrowserPool
+
+    Each URL is a scheduler item, so idle pages keep pulling the next place
+    and a place that fails to load is retried once on another page.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or DetailConfig()
+        self.telemetry = WaitTelemetry()
+        self.stats = {'extracted': 0, 'failed': 0, 'seconds': 0.0}
+
+    async def _scrape_one(self, pool, url, on_business):
+        start = time.perf_counter()
+        async with pool.page() as page:
+            waits = AsyncMapsWaits(page, self.telemetry)
+            await page.goto(url, wait_until="domcontentloaded", timeout=self.config.navigation_timeout)
+            if not await waits.place_loaded():
+                raise RuntimeError("place pane did not load")
+            business = Business(**await read_detail_pane_async(page))
+
+        # A moved or merged place can land on another listing - its fields must not overwrite the stored ones
+        requested = feature_id_from_href(url)
+        if requested and business.google_place_id and business.google_place_id != requested:
+            raise RuntimeError(f"opened {business.google_place_id} ({business.name}) instead of {requested}")
+
+        self.stats['extracted'] += 1
+        self.stats['seconds'] += time.perf_counter() - start
+        METRICS.query_finished(time.perf_counter() - start, 1 if business.name else 0)
+        if on_business:
+            on_business(url, business)
+        return business
+
+    async def scrape(self, urls, on_business=None):
+        """{url: Business} for every place URL that loaded; on_business(url, business) fires as each one lands"""
+        browsers = max(1, min(self.config.browsers, self.config.concurrency))
+        pool_config = PoolConfig(
+            max_browsers=browsers,
+            contexts_per_browser=-(-self.config.concurrency // browsers),
+            headless=self.config.headless,
+            resource_profile=self.config.resource_profile,
+            navigation_timeout=self.config.navigation_timeout
+        )
+
+        async with async_playwright() as playwright:
+            async with BrowserPool(playwright, pool_config) as pool:
+                scheduler = QueryScheduler(
+                    lambda url, worker_id: self._scrape_one(pool, url, on_business),
+                    SchedulerConfig(concurrency=self.config.concurrency, max_retries=self.config.max_retries,
+                                    backoff_base=1.0)
+                )
+                results = await scheduler.run(list(dict.fromkeys(urls)))
+                self.stats['failed'] += scheduler.stats['failed']
+                scheduler.print_stats()
+                pool.print_stats()
+        return results
+
+    def print_stats(self):
+        extracted = self.stats['extracted']
+        per_place = self.stats['seconds'] / extracted if extracted else 0
+        print(f"📍 Direct places: {extracted:,} extracted, {self.stats['failed']:,} failed, "
+              f"{per_place:.1f}s per place (page time, no search/scroll)")
+        self.telemetry.print_summary()
+
+def scrape_places(urls, config=None, on_business=None):
+    """Sync entry point: scrape place URLs over a page pool, returns (results, scraper)"""
+    scraper = PlaceDetailScraper(config)
+    results = asyncio.run(scraper.scrape(urls, on_business))
+    return results, scraper
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape known places directly by URL or place ID")
+    parser.add_argument("targets", nargs="*", help="/maps/place/ URLs, feature IDs (0x…:0x…) or ChIJ place IDs")
+    parser.add_argument("--file", help="Read targets from this file, one per line")
+    parser.add_argument("--backfill", nargs="+", choices=TRACKED_FIELDS, metavar="FIELD",
+                        help="Re-visit stored businesses missing any of these fields, e.g. phone_number opening_hours")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH)
+    parser.add_argument("--concurrency", type=int, default=DetailConfig.concurrency)
+    parser.add_argument("--browsers", type=int, default=DetailConfig.browsers)
+    parser.add_argument("--resources", choices=list(RESOURCE_PROFILES), default=DEFAULT_PROFILE)
+    parser.add_argument("--show-browser", action="store_true", help="Run the browsers with a window")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve live Prometheus metrics on this local port, e.g. 9464")
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port, "place_detail_scraper")
+    config = DetailConfig(concurrency=args.concurrency, browsers=args.browsers,
+                          headless=not args.show_browser, resource_profile=args.resources)
+    store = BusinessStore(args.store)
+    start = time.time()
+
+    if args.backfill:
+        # Businesses read from search payloads without a click never got phone/hours/website
+        by_url = {}
+        for business_id, record in store.missing_fields(args.backfill):
+            url = target_url(record.get('google_place_id') or record.get('place_id'), record.get('name'))
+            if url:
+                by_url[url] = business_id
+        print(f"🎯 {len(by_url):,} stored businesses missing {', '.join(args.backfill)}")
+
+        filled = 0
+
+        def backfill(url, business):
+            nonlocal filled
+            diffs = store.apply_refresh(by_url[url], detail_fields(business))
+            filled += bool(diffs)
+
+        _, scraper = scrape_places(list(by_url), config, backfill)
+        print(f"✅ {filled:,} businesses updated in {args.store}")
+    else:
+        targets = list(args.targets)
+        if args.file:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                targets.extend(line.strip() for line in f if line.strip())
+        urls = [url for url in map(target_url, targets) if url]
+        if len(urls) < len(targets):
+            print(f"⚠️  {len(targets) - len(urls)} targets are not place URLs or IDs, skipping them")
+        if not urls:
+            print("❌ Nothing to scrape. Pass place URLs/IDs, --file or --backfill")
+            store.close()
+            return
+
+        results, scraper = scrape_places(urls, config)
+        records, known = [], []
+        for business in results.values():
+            stored = business.google_place_id and store.get(business.google_place_id)
+            if stored:
+                # Merge like --backfill, so area/categories from the original search survive
+                store.apply_refresh(record_id(stored), detail_fields(business))
+                known.append(business.google_place_id)
+            else:
+                apply_search_context(business, "")
+                records.append(asdict(business))
+        store.save_query(f"direct:{args.file or 'command line'}", records, known)
+        print(f"✅ {len(records):,} new businesses saved and {len(known):,} known ones updated in {args.store}")
+
+    scraper.print_stats()
+    print(f"⏱️  {(time.time() - start) / 60:.1f} minutes")
+    store.close()
+
+if __name__ == "__main__":
+    main()
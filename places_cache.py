@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+🔥 PLACES API RESPONSE CACHE - DON'T PAY TWICE FOR THE SAME PLACE 🔥
+SQLite-backed cache keyed by endpoint + params, with per-endpoint TTLs and LRU size limit
+"""
+
+import json
+import os
+import sqlite3
+import time
+import argparse
+from urllib.parse import urlencode
+
+DEFAULT_CACHE_PATH = "places_cache.sqlite"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+DAY = 24 * 3600
+
+# How long an entry is served without asking the API again
+DEFAULT_TTLS = {
+    'textsearch': 7 * DAY,  # new businesses show up in searches
+    'details': 30 * DAY,  # phone numbers, websites and hours rarely change
+}
+
+# Params that never change the answer
+IGNORED_PARAMS = {'key'}
+
+def cache_key(endpoint, params):
+    """'details?fields=…&place_id=…' - stable regardless of param order, API key left out"""
+    items = sorted((name, str(value)) for name, value in params.items() if name not in IGNORED_PARAMS)
+    return f"{endpoint}?{urlencode(items)}"
+
+class PlacesCache:
+    """Persistent endpoint+params -> JSON cache
+
+    Expired entries are not deleted: lookup() reports them as stale, so a
+    refresh that fails (quota, outage) can still fall back to the old answer.
+    Least recently used entries are evicted once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttls=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'stale_served': 0, 'stores': 0, 'evictions': 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self.db.commit()
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def lookup(self, endpoint, params):
+        """(value, fresh) - value is None on a miss; fresh is False once the endpoint's TTL has passed"""
+        key = cache_key(endpoint, params)
+        row = self.db.execute("SELECT value, fetched_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.stats['misses'] += 1
+            return None, False
+
+        now = time.time()
+        self.db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        if now - row[1] > self.ttls.get(endpoint, 0):
+            self.stats['expired'] += 1
+            return json.loads(row[0]), False
+        self.stats['hits'] += 1
+        return json.loads(row[0]), True
+
+    def get(self, endpoint, params):
+        """Fresh value or None"""
+        value, fresh = self.lookup(endpoint, params)
+        return value if fresh else None
+
+    def served_stale(self):
+        """Count a stale entry used because the refresh failed"""
+        self.stats['stale_served'] += 1
+
+    def put(self, endpoint, params, value):
+        key = cache_key(endpoint, params)
+        text = json.dumps(value, ensure_ascii=False)
+        size = len(text.encode('utf-8'))
+        now = time.time()
+        old = self.db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries (key, endpoint, value, size, fetched_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, endpoint, text, size, now, now)
+        )
+        self.total_bytes += size - (old[0] if old else 0)
+        self.stats['stores'] += 1
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+        self.db.commit()
+
+    def evict(self, target_ratio=0.9):
+        """Drop least recently used entries until the cache is under target_ratio of max_bytes"""
+        target = self.max_bytes * target_ratio
+        evicted = []
+        freed = 0
+        for key, size in self.db.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if self.total_bytes - freed <= target:
+                break
+            evicted.append((key,))
+            freed += size
+        self.db.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        self.total_bytes -= freed
+        self.stats['evictions'] += len(evicted)
+
+    def purge_expired(self):
+        """Delete entries past their endpoint's TTL; returns how many"""
+        now = time.time()
+        deleted = 0
+        for endpoint, ttl in self.ttls.items():
+            deleted += self.db.execute("DELETE FROM entries WHERE endpoint = ? AND fetched_at < ?",
+                                       (endpoint, now - ttl)).rowcount
+        self.db.commit()
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        return deleted
+
+    def summary(self):
+        """Entries and bytes per endpoint"""
+        return {endpoint: {'entries': count, 'bytes': size} for endpoint, count, size in self.db.execute(
+            "SELECT endpoint, COUNT(*), SUM(size) FROM entries GROUP BY endpoint")}
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def print_stats(self):
+        lookups = self.stats['hits'] + self.stats['misses'] + self.stats['expired']
+        hit_rate = self.stats['hits'] / lookups * 100 if lookups else 0
+        print(f"🗄️  Places cache: {self.stats['hits']:,} hits, {self.stats['misses']:,} misses, "
+              f"{self.stats['expired']:,} expired ({hit_rate:.0f}% hit rate), "
+              f"{self.stats['stale_served']:,} stale served, {self.stats['evictions']:,} evicted, "
+              f"{self.total_bytes / 1024 / 1024:.1f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clean the Places API cache")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH)
+    parser.add_argument("--purge-expired", action="store_true", help="Delete entries past their TTL")
+    args = parser.parse_args()
+
+    cache = PlacesCache(args.cache)
+    if args.purge_expired:
+        print(f"🧹 Deleted {cache.purge_expired():,} expired entries")
+    for endpoint, info in cache.summary().items():
+        print(f"🗄️  {endpoint}: {info['entries']:,} entries, {info['bytes'] / 1024:.0f} KB")
+    cache.close()
+
+if __name__ == "__main__":
+    main()
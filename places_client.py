@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+🔥 ASYNC GOOGLE PLACES CLIENT - ALL PAGES, PARALLEL DETAILS, QUOTA-SAFE 🔥
+Text Search with next_page_token pagination and rate-limited concurrent Place Details
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime
+import aiohttp
+from places_cache import cache_key
+
+PLACES_API = "https://maps.googleapis.com/maps/api/place"
+UJJAIN_CENTER = "23.1765,75.7885"
+
+DETAILS_FIELDS = "name,formatted_address,formatted_phone_number,website,opening_hours,reviews,photos"
+
+# Text Search returns at most 3 pages of 20 results
+MAX_SEARCH_PAGES = 3
+
+# A next_page_token only becomes valid a couple of seconds after it is issued
+NEXT_PAGE_DELAY = 2.0
+
+RETRYABLE_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR"}
+RETRYABLE_HTTP_STATUSES = {429, 500, 502, 503, 504}
+
+class PlacesApiError(Exception):
+    """Non-retryable API answer (REQUEST_DENIED, INVALID_REQUEST, ...)"""
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second with bursts of up to `capacity`
+
+    The default capacity of 1 spaces requests evenly, so no one-second window
+    ever sees more than `rate` of them (what the per-second quota counts).
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waits = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # The lock queues waiters in order, so a burst is spread evenly over time
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                self.waits += 1
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+def business_from_search_result(place, api_key):
+    """Business dict from one Text Search result"""
+    business = {
+        'name': place.get('name'),
+        'address': place.get('formatted_address'),
+        'place_id': place.get('place_id'),
+        'rating': place.get('rating'),
+        'user_ratings_total': place.get('user_ratings_total'),
+        'price_level': place.get('price_level'),
+        'types': place.get('types', []),
+        'business_status': place.get('business_status'),
+        'permanently_closed': place.get('permanently_closed', False)
+    }
+
+    # Get coordinates
+    if 'geometry' in place and 'location' in place['geometry']:
+        location = place['geometry']['location']
+        business['latitude'] = location.get('lat')
+        business['longitude'] = location.get('lng')
+
+    # Get photos
+    if 'photos' in place and place['photos']:
+        photo_ref = place['photos'][0].get('photo_reference')
+        if photo_ref:
+            business['image_url'] = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=400&photoreference={photo_ref}&key={api_key}"
+
+    return business
+
+def details_from_result(result):
+    """The Place Details fields we keep"""
+    details = {}
+
+    # Phone number
+    if 'formatted_phone_number' in result:
+        details['phone_number'] = result['formatted_phone_number']
+
+    # Website
+    if 'website' in result:
+        details['website'] = result['website']
+
+    # Opening hours
+    if 'opening_hours' in result and 'weekday_text' in result['opening_hours']:
+        details['opening_hours'] = result['opening_hours']['weekday_text']
+
+    # Reviews
+    if 'reviews' in result:
+        details['reviews'] = result['reviews'][:3]  # First 3 reviews
+
+    return details
+
+class AsyncPlacesClient:
+    """One aiohttp session; every request goes through the same token bucket
+
+    With a PlacesCache, searches and details are answered from disk while fresh.
+    """
+
+    def __init__(self, api_key, base_url=PLACES_API, rate=10, burst=1, details_concurrency=8,
+                 max_retries=4, next_page_delay=NEXT_PAGE_DELAY, timeout=30, cache=None):
+        self.api_key = api_key
+        self.cache = cache
+        self._in_flight = {}  # cache key -> future of the request already on its way
+        self.base_url = base_url.rstrip('/')
+        self.limiter = TokenBucket(rate, burst)
+        self.details_slots = asyncio.Semaphore(details_concurrency)
+        self.max_retries = max_retries
+        self.next_page_delay = next_page_delay
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.session = None
+        self.stats = {'requests': 0, 'search_pages': 0, 'details': 0, 'retries': 0, 'failed_details': 0}
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+
+    async def _get(self, endpoint, params, retry_statuses=RETRYABLE_STATUSES):
+        """GET one JSON endpoint with rate limiting and backoff on quota/transient errors"""
+        params = dict(params, key=self.api_key)
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            self.stats['requests'] += 1
+            try:
+                async with self.session.get(f"{self.base_url}/{endpoint}/json", params=params) as response:
+                    if response.status in RETRYABLE_HTTP_STATUSES:
+                        status = f"HTTP {response.status}"
+                    elif response.status != 200:
+                        raise PlacesApiError(f"HTTP {response.status}")
+                    else:
+                        data = await response.json(content_type=None)
+                        status = data.get('status')
+                        if status in ("OK", "ZERO_RESULTS"):
+                            return data
+                        if status not in retry_statuses:
+                            raise PlacesApiError(f"{status}: {data.get('error_message', '')}".strip(': '))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = type(e).__name__
+
+            if attempt == self.max_retries:
+                raise PlacesApiError(f"{endpoint} still failing after {attempt + 1} attempts ({status})")
+            self.stats['retries'] += 1
+            await asyncio.sleep(min(2 ** attempt, 30) * 0.5 + random.uniform(0, 0.25))
+
+    async def _cached(self, endpoint, params, fetch):
+        """fetch() unless the cache has a fresh answer; a failed refresh falls back to the stale one"""
+        if not self.cache:
+            return await fetch()
+        cached, fresh = self.cache.lookup(endpoint, params)
+        if fresh:
+            return cached
+
+        # Overlapping queries often want the same place at the same moment - fetch it once
+        key = cache_key(endpoint, params)
+        pending = self._in_flight.get(key)
+        owner = pending is None
+        if owner:
+            pending = self._in_flight[key] = asyncio.ensure_future(fetch())
+        try:
+            value = await asyncio.shield(pending)
+        except PlacesApiError:
+            if cached is None:
+                raise
+            self.cache.served_stale()
+            return cached
+        finally:
+            if owner:
+                self._in_flight.pop(key, None)
+        if owner:
+            self.cache.put(endpoint, params, value)
+        return value
+
+    async def text_search(self, query, location=UJJAIN_CENTER, radius=10000, max_pages=MAX_SEARCH_PAGES):
+        """All result pages of a Text Search (up to 60 places)"""
+        # Cached as a whole: page tokens expire, so single pages can't be replayed
+        return await self._cached(
+            "textsearch",
+            {'query': query, 'location': location, 'radius': radius, 'max_pages': max_pages},
+            lambda: self._text_search_pages(query, location, radius, max_pages)
+        )
+
+    async def _text_search_pages(self, query, location, radius, max_pages):
+        params = {'query': query, 'location': location, 'radius': radius, 'language': 'en'}
+        retry_statuses = RETRYABLE_STATUSES
+        results = []
+        for _ in range(max_pages):
+            data = await self._get("textsearch", params, retry_statuses)
+            self.stats['search_pages'] += 1
+            results.extend(data.get('results', []))
+
+            token = data.get('next_page_token')
+            if not token:
+                break
+            # Follow-up pages take only the token, which answers INVALID_REQUEST until it is ready
+            await asyncio.sleep(self.next_page_delay)
+            params = {'pagetoken': token}
+            retry_statuses = RETRYABLE_STATUSES | {"INVALID_REQUEST"}
+        return results
+
+    async def place_details(self, place_id, fields=DETAILS_FIELDS):
+        """Place Details result dict ({} on failure, so one bad place never sinks the query)"""
+        params = {'place_id': place_id, 'fields': fields}
+
+        async def fetch():
+            async with self.details_slots:
+                data = await self._get("details", params)
+            self.stats['details'] += 1
+            return data.get('result', {})
+
+        try:
+            return await self._cached("details", params, fetch)
+        except PlacesApiError as e:
+            self.stats['failed_details'] += 1
+            print(f"❌ Error getting place details: {e}")
+            return {}
+
+    async def search_businesses(self, query, max_pages=MAX_SEARCH_PAGES):
+        """Text Search every page, then fetch all Place Details concurrently"""
+        places = await self.text_search(query, max_pages=max_pages)
+        businesses = [business_from_search_result(place, self.api_key) for place in places]
+
+        details = await asyncio.gather(*(
+            self.place_details(business['place_id']) if business.get('place_id') else asyncio.sleep(0, {})
+            for business in businesses
+        ))
+        for business, result in zip(businesses, details):
+            business.update(details_from_result(result))
+            business['scraped_at'] = datetime.now().isoformat()
+            business['source'] = 'google_maps_api'
+            business['data_type'] = 'real'
+        return businesses
+
+    def print_stats(self):
+        print(f"🌐 Places API: {self.stats['requests']:,} requests ({self.stats['search_pages']:,} search pages, "
+              f"{self.stats['details']:,} details, {self.stats['retries']:,} retries, "
+              f"{self.stats['failed_details']:,} details failed), {self.limiter.waits:,} rate-limit waits")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+🔥 LOCAL PLACES API MOCK - TEST THE PLACES CLIENT WITHOUT SPENDING QUOTA 🔥
+Fake Text Search (paginated) and Place Details endpoints with a QPS limit
+"""
+
+import json
+import time
+import random
+import hashlib
+import threading
+import argparse
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE_SIZE = 20
+MAX_RESULTS = 60
+
+def fake_place(query, index):
+    """Deterministic place for the index-th result of a query"""
+    digest = hashlib.sha1(f"{query}|{index}".encode('utf-8')).hexdigest()
+    rng = random.Random(digest)
+    return {
+        'place_id': f"ChIJ{digest[:23]}",
+        'name': f"{query.split(' in ')[0].title()} {index + 1}",
+        'formatted_address': f"{rng.randint(1, 200)}, Freeganj, Ujjain, Madhya Pradesh 456010, India",
+        'geometry': {'location': {'lat': 23.1765 + rng.uniform(-0.05, 0.05),
+                                  'lng': 75.7885 + rng.uniform(-0.05, 0.05)}},
+        'rating': round(rng.uniform(3, 5), 1),
+        'user_ratings_total': rng.randint(1, 2000),
+        'types': ['store', 'point_of_interest', 'establishment'],
+        'business_status': 'OPERATIONAL',
+        'photos': [{'photo_reference': f"ref_{digest[:16]}"}],
+    }
+
+class MockPlacesHandler(BaseHTTPRequestHandler):
+    """Handles /textsearch/json (with next_page_token) and /details/json"""
+
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _over_quota(self):
+        """Sliding one-second window, like the per-second API quota"""
+        server = self.server
+        now = time.monotonic()
+        with server.lock:
+            server.requests += 1
+            server.recent = [stamp for stamp in server.recent if now - stamp < 1.0]
+            if server.qps and len(server.recent) >= server.qps:
+                server.rejected += 1
+                return True
+            server.recent.append(now)
+        return False
+
+    def _text_search(self, params):
+        server = self.server
+        if 'pagetoken' in params:
+            with server.lock:
+                token = server.tokens.get(params['pagetoken'][0])
+            if not token:
+                return {'status': 'INVALID_REQUEST', 'results': []}
+            if time.monotonic() < token['ready_at']:
+                return {'status': 'INVALID_REQUEST', 'results': []}  # token not valid yet
+            query, start = token['query'], token['start']
+        elif 'query' in params:
+            query, start = params['query'][0], 0
+        else:
+            return {'status': 'INVALID_REQUEST', 'results': []}
+
+        total = server.results_for(query)
+        if total == 0:
+            return {'status': 'ZERO_RESULTS', 'results': []}
+        end = min(start + PAGE_SIZE, total)
+        payload = {'status': 'OK', 'results': [fake_place(query, index) for index in range(start, end)]}
+        if end < total:
+            token = hashlib.sha1(f"{query}|{end}|{random.random()}".encode('utf-8')).hexdigest()
+            with server.lock:
+                server.tokens[token] = {'query': query, 'start': end,
+                                        'ready_at': time.monotonic() + server.token_delay}
+            payload['next_page_token'] = token
+        return payload
+
+    def _details(self, params):
+        place_id = params.get('place_id', [''])[0]
+        if not place_id:
+            return {'status': 'INVALID_REQUEST'}
+        rng = random.Random(place_id)
+        with self.server.lock:
+            self.server.details += 1
+        return {'status': 'OK', 'result': {
+            'formatted_phone_number': f"0{rng.randint(70000, 99999)} {rng.randint(10000, 99999)}",
+            'website': f"https://{place_id[-8:].lower()}.example.in",
+            'opening_hours': {'weekday_text': ["Monday: 9:00 AM – 9:00 PM"]},
+            'reviews': [{'author_name': 'Test', 'rating': 5, 'text': 'Good'}],
+        }}
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if params.get('key', [''])[0] == '':
+            self._send_json({'status': 'REQUEST_DENIED', 'error_message': 'The provided API key is invalid.'})
+        elif self._over_quota():
+            self._send_json({'status': 'OVER_QUERY_LIMIT', 'error_message': 'You have exceeded your rate-limit.'})
+        elif parsed.path.endswith('/textsearch/json'):
+            self._send_json(self._text_search(params))
+        elif parsed.path.endswith('/details/json'):
+            self._send_json(self._details(params))
+        else:
+            self._send_json({'status': 'INVALID_REQUEST'})
+
+    def log_message(self, format, *args):
+        pass
+
+def start_mock_server(port=0, qps=0, token_delay=0.2, latency=0.0, results_per_query=None):
+    """Serve in a daemon thread; returns (server, base_url) - pass base_url as the client's base_url
+
+    qps: reject requests above this rate with OVER_QUERY_LIMIT (0 = unlimited)
+    results_per_query: fixed result count, else 0-60 derived from the query text
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockPlacesHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.rejected = 0
+    server.details = 0
+    server.recent = []
+    server.tokens = {}
+    server.qps = qps
+    server.token_delay = token_delay
+    server.latency = latency
+    server.results_for = (
+        (lambda query: results_per_query) if results_per_query is not None
+        else (lambda query: int(hashlib.sha1(query.encode('utf-8')).hexdigest(), 16) % (MAX_RESULTS + 1))
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/maps/api/place"
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8086)
+    parser.add_argument("--qps", type=int, default=10, help="Answer OVER_QUERY_LIMIT above this many requests/second")
+    parser.add_argument("--token-delay", type=float, default=2.0, help="Seconds before a next_page_token is valid")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(args.port, args.qps, args.token_delay, args.latency)
+    print(f"🧪 Mock Places API running at {base_url}")
+    print(f"👉 python real_google_maps_scraper.py --endpoint {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n📊 {server.requests} requests, {server.rejected} over quota, {server.details} details")
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,84 @@ This script populates Firebase with sample vendor data for Bazarse app
 """
 
 import requests
-import json
+import os
+import glob
 import time
+import random
+import argparse
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from dataset_writers import iter_records
+from business_store import record_id
+
+FIRESTORE_API = "https://firestore.googleapis.com/v1"
+
+# documents:batchWrite accepts at most this many writes per request
+BATCH_WRITE_LIMIT = 500
+
+# HTTP statuses worth resending the whole request for
+RETRYABLE_HTTP_STATUSES = {429, 500, 502, 503, 504}
+
+# Per-write google.rpc codes worth resending: DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED, UNAVAILABLE
+RETRYABLE_WRITE_CODES = {4, 8, 10, 14}
+
+def to_firestore_value(value):
+    """Python value -> Firestore REST typed value"""
+    if value is None:
+        return {"nullValue": None}
+    if isinstance(value, bool):  # before int - bool is an int subclass
+        return {"booleanValue": value}
+    if isinstance(value, int):
+        return {"integerValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    if isinstance(value, list):
+        return {"arrayValue": {"values": [to_firestore_value(item) for item in value]}}
+    if isinstance(value, dict):
+        return {"mapValue": {"fields": to_firestore_fields(value)}}
+    return {"stringValue": str(value)}
+
+def to_firestore_fields(data):
+    return {key: to_firestore_value(value) for key, value in data.items()}
+
+def load_dataset_records(paths):
+    """Business records from dataset JSON/JSONL files or folders (summary files are skipped)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            # A folder's complete_* file already holds every business of its per-category files
+            complete = sorted(glob.glob(os.path.join(path, 'complete_*.json*')))
+            files.extend(complete or sorted(glob.glob(os.path.join(path, '*.json')) +
+                                            glob.glob(os.path.join(path, '*.jsonl'))))
+        else:
+            files.append(path)
+    
+    records = []
+    for file_path in files:
+        # .jsonl files stream line by line; a summary's top-level object yields only its keys
+        loaded = [record for record in iter_records(file_path) if isinstance(record, dict) and record.get('name')]
+        records.extend(loaded)
+        print(f"📂 {file_path}: {len(loaded)} records")
+    return records
 
 class FirebasePopulator:
-    def __init__(self):
+    def __init__(self, firestore_api=FIRESTORE_API, auth_token=None, max_connections=16):
         """Initialize Firebase Populator"""
         self.project_id = "bazarse-8c768"
         self.base_url = f"https://{self.project_id}-default-rtdb.firebaseio.com"
+        self.document_root = f"projects/{self.project_id}/databases/(default)/documents"
+        self.documents_url = f"{firestore_api}/{self.document_root}"
+        
+        # One keep-alive session for every request instead of a new connection per vendor
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if auth_token:
+            self.session.headers['Authorization'] = f"Bearer {auth_token}"
         
         print("🔥 Firebase Database Populator - Vinu Bhaisahab Edition 🔥")
         print("=" * 70)
@@ -22,34 +91,18 @@ class FirebasePopulator:
         """Add vendor to Firestore using REST API"""
         try:
             # Firestore REST API endpoint
-            url = f"https://firestore.googleapis.com/v1/projects/{self.project_id}/databases/(default)/documents/vendors"
+            url = f"{self.documents_url}/vendors"
             
             # Convert vendor data to Firestore format
             firestore_data = {
-                "fields": {}
+                "fields": to_firestore_fields(vendor_data)
             }
             
-            for key, value in vendor_data.items():
-                if isinstance(value, str):
-                    firestore_data["fields"][key] = {"stringValue": value}
-                elif isinstance(value, int):
-                    firestore_data["fields"][key] = {"integerValue": str(value)}
-                elif isinstance(value, float):
-                    firestore_data["fields"][key] = {"doubleValue": value}
-                elif isinstance(value, bool):
-                    firestore_data["fields"][key] = {"booleanValue": value}
-                elif isinstance(value, list):
-                    firestore_data["fields"][key] = {
-                        "arrayValue": {
-                            "values": [{"stringValue": item} for item in value]
-                        }
-                    }
-            
             # Add timestamp
             firestore_data["fields"]["createdAt"] = {"timestampValue": datetime.now().isoformat() + "Z"}
             firestore_data["fields"]["updatedAt"] = {"timestampValue": datetime.now().isoformat() + "Z"}
             
-            response = requests.post(url, json=firestore_data)
+            response = self.session.post(url, json=firestore_data)
             
             if response.status_code == 200:
                 print(f"✅ Added vendor: {vendor_data['name']}")
@@ -62,6 +115,83 @@ class FirebasePopulator:
             print(f"❌ Error adding vendor: {e}")
             return False
     
+    def _batch_write(self, writes, max_retries):
+        """Send one batchWrite, resending only the writes that failed transiently"""
+        pending = writes
+        done = rejected = 0
+        for attempt in range(max_retries + 1):
+            if attempt:
+                time.sleep(min(30, 2 ** (attempt - 1)) * (1 + random.random() / 2))
+            
+            try:
+                response = self.session.post(f"{self.documents_url}:batchWrite",
+                                             json={"writes": pending}, timeout=60)
+            except requests.RequestException as e:
+                print(f"🔁 batchWrite retry {attempt + 1}/{max_retries} - {e}")
+                continue
+            
+            if response.status_code in RETRYABLE_HTTP_STATUSES:
+                print(f"🔁 batchWrite retry {attempt + 1}/{max_retries} - HTTP {response.status_code}")
+                continue
+            if response.status_code != 200:
+                print(f"❌ batchWrite rejected: HTTP {response.status_code} - {response.text[:200]}")
+                break
+            
+            # batchWrite is not atomic - every write gets its own status
+            retry = []
+            statuses = response.json().get('status') or [{}] * len(pending)
+            for write, status in zip(pending, statuses):
+                code = status.get('code', 0)
+                if code == 0:
+                    done += 1
+                elif code in RETRYABLE_WRITE_CODES:
+                    retry.append(write)
+                else:
+                    rejected += 1
+                    print(f"❌ Write rejected: {write['update']['name']} - {status.get('message')}")
+            
+            pending = retry
+            if not pending:
+                break
+        
+        return done, rejected + len(pending)
+    
+    def bulk_upload(self, records, collection="vendors", batch_size=BATCH_WRITE_LIMIT,
+                    concurrency=8, max_retries=5):
+        """Upload records with batchWrite requests, several in flight over the pooled session"""
+        timestamp = datetime.now().isoformat() + "Z"
+        
+        writes = {}
+        for record in records:
+            # Same IDs the scraper's save_to_firebase uses, so a bulk re-upload overwrites its documents
+            doc_id = record_id(record)
+            fields = to_firestore_fields(record)
+            fields["createdAt"] = {"timestampValue": timestamp}
+            fields["updatedAt"] = {"timestampValue": timestamp}
+            writes[doc_id] = {"update": {"name": f"{self.document_root}/{collection}/{doc_id}", "fields": fields}}
+        
+        writes = list(writes.values())
+        batch_size = min(batch_size, BATCH_WRITE_LIMIT)
+        chunks = [writes[i:i + batch_size] for i in range(0, len(writes), batch_size)]
+        
+        print(f"🚀 Uploading {len(writes):,} documents to {collection} "
+              f"({len(chunks)} batches, {concurrency} in flight)")
+        start_time = time.time()
+        success_count = failed_count = 0
+        
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = [executor.submit(self._batch_write, chunk, max_retries) for chunk in chunks]
+            for future in as_completed(futures):
+                done, failed = future.result()
+                success_count += done
+                failed_count += failed
+        
+        elapsed = time.time() - start_time
+        rate = success_count / elapsed if elapsed else 0
+        print(f"🎉 Uploaded {success_count:,}/{len(writes):,} documents in {elapsed:.1f}s "
+              f"({rate:.0f} docs/s, {failed_count} failed)")
+        return success_count
+    
     def populate_sample_vendors(self):
         """Populate Firebase with sample vendor data"""
         print("🏪 Populating sample vendor data...")
@@ -222,11 +352,7 @@ class FirebasePopulator:
             }
         ]
         
-        success_count = 0
-        for vendor in vendors_data:
-            if self.add_vendor_to_firestore(vendor):
-                success_count += 1
-            time.sleep(0.5)  # Small delay between requests
+        success_count = self.bulk_upload(vendors_data, "vendors")
         
         print(f"🎉 Successfully added {success_count}/{len(vendors_data)} vendors!")
         return success_count > 0
@@ -270,7 +396,7 @@ class FirebasePopulator:
         
         for category in categories:
             try:
-                url = f"https://firestore.googleapis.com/v1/projects/{self.project_id}/databases/(default)/documents/categories"
+                url = f"{self.documents_url}/categories"
                 
                 firestore_data = {
                     "fields": {
@@ -286,7 +412,7 @@ class FirebasePopulator:
                     }
                 }
                 
-                response = requests.post(url, json=firestore_data)
+                response = self.session.post(url, json=firestore_data)
                 
                 if response.status_code == 200:
                     print(f"✅ Added category: {category['name']}")
@@ -315,7 +441,25 @@ class FirebasePopulator:
 
 def main():
     """Main function"""
-    populator = FirebasePopulator()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bulk", nargs="+", metavar="PATH",
+                        help="Upload dataset JSON/JSONL files or folders in bulk instead of showing the menu")
+    parser.add_argument("--collection", default="vendors", help="Target collection for --bulk")
+    parser.add_argument("--concurrency", type=int, default=8, help="batchWrite requests in flight")
+    parser.add_argument("--batch-size", type=int, default=BATCH_WRITE_LIMIT, help="Writes per batchWrite (max 500)")
+    parser.add_argument("--endpoint", default=FIRESTORE_API,
+                        help="Firestore REST base URL (e.g. http://127.0.0.1:8085/v1 for firestore_mock_server.py)")
+    parser.add_argument("--token", default=os.environ.get("FIRESTORE_TOKEN"), help="OAuth bearer token")
+    args = parser.parse_args()
+    
+    populator = FirebasePopulator(firestore_api=args.endpoint, auth_token=args.token,
+                                  max_connections=max(args.concurrency, 1))
+    
+    if args.bulk:
+        records = load_dataset_records(args.bulk)
+        populator.bulk_upload(records, args.collection, batch_size=args.batch_size,
+                              concurrency=args.concurrency)
+        return
     
     print("🔥 Firebase Database Populator Menu 🔥")
     print("1. Populate complete database (categories + vendors)")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+🔥 PROGRESS JOURNAL - CRASH-SAFE RESUME FOR LONG RUNS 🔥
+Append-only JSON Lines journal of finished queries and extracted place IDs
+"""
+
+import json
+import os
+from datetime import datetime
+
+class ProgressJournal:
+    """Durable record of completed queries so a crashed run can resume where it stopped"""
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.completed = {}  # query -> last query_done record
+        self.place_ids = set()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if resume:
+            self._load()
+        elif os.path.exists(path):
+            # Fresh run: keep the old journal aside instead of silently mixing runs
+            backup = f"{path}.{datetime.now().strftime('%Y%m%d_%H%M%S')}.bak"
+            os.replace(path, backup)
+            print(f"📒 Previous journal moved to {backup}")
+
+        self._file = open(path, 'a', encoding='utf-8')
+        if resume and self._file.tell() > 0:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    # Terminate a line torn by a crash so the next record starts cleanly
+                    self._file.write('\n')
+        self._append({'event': 'run_start', 'resume': resume})
+
+    def _load(self):
+        """Replay the journal; a torn last line from a crash is ignored"""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get('event') == 'query_done':
+                    self.completed[record['query']] = record
+                    self.place_ids.update(record.get('place_ids', []))
+
+        print(f"📒 Resuming: {len(self.completed):,} queries and "
+              f"{len(self.place_ids):,} places already done ({self.path})")
+
+    def _append(self, record):
+        record['ts'] = datetime.now().isoformat()
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def is_done(self, query):
+        return query in self.completed
+
+    def pending(self, queries):
+        """Queries not yet completed, in their original order"""
+        return [query for query in queries if query not in self.completed]
+
+    def output_for(self, query):
+        """Output file recorded when the query finished, if any"""
+        record = self.completed.get(query)
+        return record.get('output') if record else None
+
+    def mark_done(self, query, place_ids=(), businesses=0, output=None):
+        """Durably record a finished query (fsync'd before returning)"""
+        place_ids = [place_id for place_id in place_ids if place_id]
+        record = {
+            'event': 'query_done',
+            'query': query,
+            'businesses': businesses,
+            'place_ids': place_ids,
+        }
+        if output:
+            record['output'] = output
+        self._append(record)
+        self.completed[query] = record
+        self.place_ids.update(place_ids)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+🔥 QUERY PLANNER - FEWER SEARCHES, SAME BUSINESSES 🔥
+Canonicalize, deduplicate and group search queries, then drop the ones past runs show are covered by others
+"""
+
+import os
+import re
+import argparse
+from dataclasses import dataclass, field
+from business_store import DEFAULT_STORE_PATH, BusinessStore
+
+# British/Indian and American spellings Maps treats the same
+SPELLINGS = {
+    'jewellery': 'jewelry', 'parlour': 'parlor', 'centre': 'center', 'theatre': 'theater',
+    'shop': 'store',  # "clothing shops" / "clothing stores" return the same list
+}
+
+# Near-synonyms: every query in a group returns (almost) the same places; the first wording is kept
+SYNONYM_GROUPS = (
+    ("footwear", "shoe stores", "sandal shops"),
+    ("jewelry", "jewellery shops", "gold jewelry"),
+    ("pharmacies", "medical stores", "chemists"),
+    ("grocery stores", "kirana stores", "provision stores"),
+    ("sweet shops", "mithai shops"),
+    ("salons", "hair cutting"),
+    ("coaching centers", "tuition centers"),
+    ("taxi services", "taxi booking"),
+    ("cinemas", "theaters"),
+    ("banquet halls", "party halls"),
+)
+
+CITY = "ujjain"
+
+def singular(word):
+    if word.endswith('ies') and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith(('ches', 'shes', 'xes', 'sses')):
+        return word[:-2]
+    if word.endswith('s') and not word.endswith(('ss', 'us')):
+        return word[:-1]
+    return word
+
+def normalize_subject(subject):
+    """'Jewellery Shops ' -> 'jewelry store' (case, spacing, spelling and plurals)"""
+    words = re.findall(r"[a-z0-9&'-]+", subject.lower())
+    return " ".join(SPELLINGS.get(singular(word), singular(word)) for word in words)
+
+SYNONYMS = {normalize_subject(alias): normalize_subject(group[0]) for group in SYNONYM_GROUPS for alias in group}
+
+def split_query(query):
+    """'sweet shops in Freeganj, Ujjain' -> ('sweet store', 'freeganj'); city-wide queries get 'ujjain'"""
+    subject, _, location = query.partition(" in ")
+    parts = [part.strip().lower() for part in location.split(",") if part.strip()]
+    if len(parts) > 1 and parts[-1] == CITY:
+        parts = parts[:-1]
+    return normalize_subject(subject), " ".join(" ".join(parts).split()) or CITY
+
+def canonical_query(query):
+    """(subject, location) with synonyms folded - equal keys search for the same thing"""
+    subject, location = split_query(query)
+    return SYNONYMS.get(subject, subject), location
+
+@dataclass
+class PlannerConfig:
+    """How aggressively past overlap may drop queries"""
+    subsumed_threshold: float = 0.9  # share of a query's past results other kept queries also found
+    min_results: int = 5  # judge only queries that found at least this many businesses
+    drop_empty: bool = False  # also drop queries that found nothing last time
+    minutes_per_query: float = 10.0  # for the crawl-time estimate (search + scroll + clicks)
+
+@dataclass
+class QueryPlan:
+    """Planned queries plus why every other query was dropped"""
+    queries: list
+    original_count: int
+    duplicates: dict = field(default_factory=dict)  # dropped -> identical kept query
+    synonyms: dict = field(default_factory=dict)  # dropped -> near-synonym kept query
+    subsumed: dict = field(default_factory=dict)  # dropped -> share of its past results others found
+    empty: list = field(default_factory=list)  # dropped, found nothing last time
+    groups: dict = field(default_factory=dict)  # canonical subject -> wordings folded into it
+    coverage: float = None  # share of past businesses the kept queries found
+
+def query_history(store):
+    """{canonical key: set of business IDs} from every query saved in the store"""
+    history = {}
+    for query, business_ids in store.query_result_sets().items():
+        history.setdefault(canonical_query(query), set()).update(business_ids)
+    return history
+
+def plan_queries(queries, history=None, config=None):
+    """QueryPlan keeping the original order of the queries that survive"""
+    config = config or PlannerConfig()
+    plan = QueryPlan(queries=[], original_count=len(queries))
+
+    # 1. Identical after canonicalizing, or near-synonyms in the same place
+    kept_by_exact = {}
+    kept_by_key = {}
+    for query in queries:
+        exact = split_query(query)
+        key = canonical_query(query)
+        if exact in kept_by_exact:
+            plan.duplicates[query] = kept_by_exact[exact]
+        elif key in kept_by_key:
+            plan.synonyms[query] = kept_by_key[key]
+            kept_by_exact[exact] = kept_by_key[key]
+        else:
+            kept_by_exact[exact] = kept_by_key[key] = query
+            plan.queries.append(query)
+        if exact[0] != key[0]:
+            plan.groups.setdefault(key[0], set()).add(exact[0])
+
+    # 2. Past runs: drop queries whose businesses other kept queries also found
+    if history:
+        results = {query: history.get(canonical_query(query)) for query in plan.queries}
+        judged = [query for query, found in results.items() if found is not None]
+        found_by = {}  # business ID -> how many kept queries found it
+        for query in judged:
+            for business_id in results[query]:
+                found_by[business_id] = found_by.get(business_id, 0) + 1
+        everything = set(found_by)
+
+        dropped = set()
+        # Narrow queries first: they are the ones most likely to be covered by broader ones
+        for query in sorted(judged, key=lambda query: len(results[query])):
+            found = results[query]
+            if not found:
+                if config.drop_empty:
+                    plan.empty.append(query)
+                    dropped.add(query)
+                continue
+            if len(found) < config.min_results:
+                continue
+            covered = sum(1 for business_id in found if found_by[business_id] > 1) / len(found)
+            if covered >= config.subsumed_threshold:
+                plan.subsumed[query] = covered
+                dropped.add(query)
+                for business_id in found:
+                    found_by[business_id] -= 1
+
+        plan.queries = [query for query in plan.queries if query not in dropped]
+        if everything:
+            plan.coverage = sum(1 for count in found_by.values() if count > 0) / len(everything)
+
+    return plan
+
+def print_plan_report(plan, config=None, show_dropped=False):
+    config = config or PlannerConfig()
+    kept = len(plan.queries)
+    saved = plan.original_count - kept
+    print(f"🧭 Query plan: {plan.original_count:,} → {kept:,} queries "
+          f"({saved / plan.original_count * 100 if plan.original_count else 0:.0f}% fewer)")
+    print(f"   {len(plan.duplicates):,} duplicates, {len(plan.synonyms):,} near-synonyms, "
+          f"{len(plan.subsumed):,} covered by other queries, {len(plan.empty):,} empty last time")
+    for subject, wordings in sorted(plan.groups.items()):
+        print(f"   🔗 {subject} ← {', '.join(sorted(wordings))}")
+    if plan.coverage is not None:
+        print(f"   📍 Kept queries found {plan.coverage * 100:.1f}% of the businesses of past runs")
+    hours = config.minutes_per_query / 60
+    print(f"⏱️  Predicted crawl: {kept * hours:,.0f} query-hours instead of {plan.original_count * hours:,.0f} "
+          f"(saves {saved * hours:,.0f} at {config.minutes_per_query:g} min/query)")
+
+    if show_dropped:
+        for query, kept_query in list(plan.duplicates.items()) + list(plan.synonyms.items()):
+            print(f"   ➖ {query} (same as {kept_query})")
+        for query, covered in plan.subsumed.items():
+            print(f"   ➖ {query} ({covered * 100:.0f}% found by other queries)")
+        for query in plan.empty:
+            print(f"   ➖ {query} (no results last time)")
+
+def load_history(store_path):
+    """query_history of the store at store_path, None when there is no store yet"""
+    if not store_path or not os.path.exists(store_path):
+        return None
+    store = BusinessStore(store_path)
+    history = query_history(store)
+    store.close()
+    return history
+
+def optimize_queries(queries, store_path=DEFAULT_STORE_PATH, config=None):
+    """Planned query list for a scraper run, using the store's history when there is one"""
+    plan = plan_queries(queries, load_history(store_path), config)
+    print_plan_report(plan, config)
+    return plan.queries
+
+def source_queries(source):
+    if source == "main":
+        from google_maps_scraper_bazarse import get_ujjain_search_queries
+        return get_ujjain_search_queries()
+    if source == "parallel":
+        from parallel_ujjain_scraper import generate_all_ujjain_queries
+        return generate_all_ujjain_queries()
+    from ultra_fast_scraper import get_ultra_queries
+    return get_ultra_queries()
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan a smaller set of search queries")
+    parser.add_argument("--source", choices=("main", "parallel", "ultra"), default="main",
+                        help="Which scraper's query list to plan")
+    parser.add_argument("--file", help="Plan the queries in this file instead (one per line)")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="Business store with past query results")
+    parser.add_argument("--threshold", type=float, default=PlannerConfig.subsumed_threshold,
+                        help="Drop a query once this share of its past results was found by others")
+    parser.add_argument("--drop-empty", action="store_true", help="Also drop queries that found nothing last time")
+    parser.add_argument("--minutes-per-query", type=float, default=PlannerConfig.minutes_per_query)
+    parser.add_argument("--show-dropped", action="store_true")
+    parser.add_argument("--out", help="Write the planned queries to this file")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            queries = [line.strip() for line in f if line.strip()]
+    else:
+        queries = source_queries(args.source)
+
+    config = PlannerConfig(subsumed_threshold=args.threshold, drop_empty=args.drop_empty,
+                           minutes_per_query=args.minutes_per_query)
+    history = load_history(args.store)
+    if history is None:
+        print(f"ℹ️  No business store at {args.store} - planning without past overlap")
+
+    plan = plan_queries(queries, history, config)
+    print_plan_report(plan, config, args.show_dropped)
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write("\n".join(plan.queries) + "\n")
+        print(f"✅ {len(plan.queries):,} queries saved: {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+🔥 WORK-STEALING QUERY SCHEDULER 🔥
+Shared asyncio priority queue - idle workers always pull the next query
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from scraper_metrics import METRICS
+
+# Categories that usually return long result lists in Ujjain
+DENSE_KEYWORDS = (
+    "restaurant", "grocery", "kirana", "medical", "pharmac", "clothing",
+    "mobile", "hotel", "school", "sweet", "hospital", "bank"
+)
+
+def dense_first_priority(query):
+    """Lower runs first: city-wide and dense queries start early so they never become the tail"""
+    query_lower = query.lower()
+    priority = 0
+    if query_lower.endswith(" in ujjain"):
+        priority -= 2
+    if any(keyword in query_lower for keyword in DENSE_KEYWORDS):
+        priority -= 1
+    return priority
+
+@dataclass
+class SchedulerConfig:
+    """Configuration for the shared query scheduler"""
+    concurrency: int = 10  # Workers pulling from the shared queue
+    max_retries: int = 3  # Attempts per query after the first failure
+    backoff_base: float = 2.0  # seconds, doubled per retry
+    backoff_max: float = 60.0
+    jitter: float = 0.5  # Up to +50% random backoff
+    delay_between_queries: float = 0.0  # Politeness delay per worker
+
+class QueryScheduler:
+    """Runs an async handler over queries with bounded concurrency, priorities and retries"""
+
+    _STOP = float('inf')
+
+    def __init__(self, handler, config=None, priority=None):
+        self.handler = handler  # async handler(query, worker_id) -> result, raises on failure
+        self.config = config or SchedulerConfig()
+        self.priority = priority or (lambda query: 0)
+        self.results = {}
+        self.failures = {}
+        self.stats = {
+            'completed': 0,
+            'failed': 0,
+            'retries': 0,
+            'per_worker': {},
+        }
+        self._queue = None
+        self._outstanding = 0
+        self._worker_count = 0
+        self._sequence = 0
+        self._start_time = None
+
+    def _put(self, query, attempt):
+        self._sequence += 1
+        self._queue.put_nowait((self.priority(query), self._sequence, attempt, query))
+
+    def _backoff(self, attempt):
+        delay = min(self.config.backoff_max, self.config.backoff_base * (2 ** (attempt - 1)))
+        return delay * (1 + random.uniform(0, self.config.jitter))
+
+    async def _requeue_later(self, query, attempt):
+        await asyncio.sleep(self._backoff(attempt))
+        self._put(query, attempt)
+
+    def _finish_one(self):
+        self._outstanding -= 1
+        if self._outstanding == 0:
+            for _ in range(self._worker_count):
+                self._queue.put_nowait((self._STOP, 0, 0, None))
+
+    async def _worker(self, worker_id):
+        self.stats['per_worker'][worker_id] = 0
+        retry_tasks = []
+
+        while True:
+            priority, _, attempt, query = await self._queue.get()
+            if priority == self._STOP:
+                break
+
+            try:
+                self.results[query] = await self.handler(query, worker_id)
+                self.stats['completed'] += 1
+                self.stats['per_worker'][worker_id] += 1
+                self._finish_one()
+            except Exception as e:
+                METRICS.error('query')
+                if attempt < self.config.max_retries:
+                    self.stats['retries'] += 1
+                    print(f"🔁 Worker {worker_id}: retry {attempt + 1}/{self.config.max_retries} for {query} - {e}")
+                    retry_tasks.append(asyncio.create_task(self._requeue_later(query, attempt + 1)))
+                else:
+                    self.failures[query] = str(e)
+                    self.stats['failed'] += 1
+                    METRICS.query_failed()
+                    print(f"❌ Worker {worker_id}: giving up on {query} - {e}")
+                    self._finish_one()
+
+            if self.config.delay_between_queries:
+                await asyncio.sleep(self.config.delay_between_queries)
+
+        await asyncio.gather(*retry_tasks, return_exceptions=True)
+
+    async def run(self, queries):
+        """Process all queries; returns {query: handler result} for successful ones"""
+        self._queue = asyncio.PriorityQueue()
+        self._outstanding = len(queries)
+        self._start_time = time.time()
+
+        if not queries:
+            return self.results
+
+        for query in queries:
+            self._put(query, 0)
+
+        self._worker_count = min(self.config.concurrency, len(queries))
+        workers = [
+            asyncio.create_task(self._worker(worker_id))
+            for worker_id in range(self._worker_count)
+        ]
+        await asyncio.gather(*workers)
+        return self.results
+
+    def print_stats(self):
+        """Print scheduler statistics"""
+        elapsed = time.time() - (self._start_time or time.time())
+        done = self.stats['completed']
+        rate = done / elapsed * 60 if elapsed else 0
+        print(f"📊 Scheduler: {done} completed, {self.stats['failed']} failed, "
+              f"{self.stats['retries']} retries, {rate:.1f} queries/min")
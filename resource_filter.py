@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+🔥 RESOURCE BLOCKING PROFILES - ONLY DOWNLOAD WHAT WE SCRAPE 🔥
+Route-based filter that drops images, fonts, map tiles and analytics from Maps pages
+"""
+
+# Requests matching these URL fragments are map tiles, street view or satellite imagery
+MAP_TILE_PATTERNS = (
+    "/maps/vt", "/vt?", "/kh?", "/kh/", "khms", "streetviewpixels", "/maps/api/js/StaticMapService",
+)
+
+# Logging, ads and analytics beacons - never needed for scraping
+ANALYTICS_PATTERNS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googleadservices.com",
+    "/gen_204", "/log?", "/csi?", "play.google.com/log",
+)
+
+# What each profile drops
+#   listing-only: feed listings / intercepted payloads only - no layout needed beyond the feed
+#   details: clicks detail panes - keeps stylesheets so panes render and stay clickable
+#   full: nothing blocked, only counted
+RESOURCE_PROFILES = {
+    "listing-only": {
+        "resource_types": {"image", "media", "font", "stylesheet"},
+        "block_map_tiles": True,
+        "block_analytics": True,
+    },
+    "details": {
+        "resource_types": {"image", "media", "font"},
+        "block_map_tiles": True,
+        "block_analytics": True,
+    },
+    "full": {
+        "resource_types": set(),
+        "block_map_tiles": False,
+        "block_analytics": False,
+    },
+}
+
+DEFAULT_PROFILE = "details"
+
+def new_resource_stats():
+    return {'requests': 0, 'blocked': 0, 'bytes': 0, 'blocked_by_type': {}}
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+class ResourceFilter:
+    """Blocks unneeded requests on one page and counts what still gets downloaded"""
+
+    def __init__(self, profile=DEFAULT_PROFILE, totals=None):
+        if profile not in RESOURCE_PROFILES:
+            raise ValueError(f"Unknown resource profile: {profile} (choose from {', '.join(RESOURCE_PROFILES)})")
+        self.profile = profile
+        self.rules = RESOURCE_PROFILES[profile]
+        self.totals = totals if totals is not None else new_resource_stats()  # shared across pages
+        self.query = new_resource_stats()  # reset by start_query()
+
+    def should_block(self, resource_type, url):
+        if resource_type in self.rules["resource_types"]:
+            return True
+        if self.rules["block_map_tiles"] and any(pattern in url for pattern in MAP_TILE_PATTERNS):
+            return True
+        if self.rules["block_analytics"] and any(pattern in url for pattern in ANALYTICS_PATTERNS):
+            return True
+        return False
+
+    def _count(self, key, amount=1):
+        self.query[key] += amount
+        self.totals[key] += amount
+
+    def _check(self, request):
+        """Count the request and decide whether to abort it"""
+        self._count('requests')
+        if self.should_block(request.resource_type, request.url):
+            self._count('blocked')
+            for stats in (self.query, self.totals):
+                by_type = stats['blocked_by_type']
+                by_type[request.resource_type] = by_type.get(request.resource_type, 0) + 1
+            return True
+        return False
+
+    def _count_transfer(self, sizes, response=None):
+        """Bytes actually transferred (compressed body + headers) - chunked responses have no content-length"""
+        if sizes:
+            self._count('bytes', max(0, sizes.get('responseBodySize', 0)) + max(0, sizes.get('responseHeadersSize', 0)))
+        elif response is not None:
+            try:
+                self._count('bytes', int(response.headers.get('content-length', 0)))
+            except (TypeError, ValueError):
+                pass
+
+    def on_request_finished(self, request):
+        """page.on("requestfinished") for sync pages - only requests let through get here"""
+        try:
+            sizes = request.sizes()
+        except Exception:
+            sizes = None
+        self._count_transfer(sizes, None if sizes else request.response())
+
+    async def on_request_finished_async(self, request):
+        """page.on("requestfinished") for async pages"""
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            sizes = None
+        self._count_transfer(sizes, None if sizes else await request.response())
+
+    def _route_sync(self, route):
+        if self._check(route.request):
+            route.abort()
+        else:
+            route.continue_()
+
+    async def _route_async(self, route):
+        if self._check(route.request):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def attach(self, page):
+        """Install on a sync Playwright page (before the first navigation)"""
+        if self.profile != "full":
+            page.route("**/*", self._route_sync)
+        page.on("requestfinished", self.on_request_finished)
+
+    async def attach_async(self, page):
+        """Install on an async Playwright page (before the first navigation)"""
+        if self.profile != "full":
+            await page.route("**/*", self._route_async)
+        page.on("requestfinished", self.on_request_finished_async)
+
+    def start_query(self):
+        self.query = new_resource_stats()
+
+    def query_summary(self):
+        """One line of per-query bandwidth numbers for progress output"""
+        return (f"{format_bytes(self.query['bytes'])} downloaded, "
+                f"{self.query['blocked']}/{self.query['requests']} requests blocked")
+
+def print_resource_stats(profile, totals):
+    """Print run-wide resource filter counters"""
+    print(f"📦 Resources ({profile}): {format_bytes(totals['bytes'])} downloaded, "
+          f"{totals['blocked']:,}/{totals['requests']:,} requests blocked")
+    for resource_type, count in sorted(totals['blocked_by_type'].items(), key=lambda item: -item[1]):
+        print(f"   {resource_type}: {count:,} blocked")
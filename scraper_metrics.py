@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+🔥 LIVE SCRAPER METRICS - PROMETHEUS TEXT FORMAT ON A LOCAL PORT 🔥
+Throughput, stage latencies, error/empty rates and active browsers of a running crawl, for alerting
+"""
+
+import time
+import threading
+import argparse
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.request import urlopen
+
+# Seconds - from a quick wait for the detail pane up to a long scrolled query
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+DEFAULT_METRICS_PORT = 9464  # pass --metrics-port to a scraper to serve on it
+
+RATE_WINDOW = 300  # seconds the queries/sec and businesses/min gauges average over
+
+class Histogram:
+    """Cumulative-bucket latency histogram"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.count += 1
+        self.sum += seconds
+        for index, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[index] += 1
+
+class ScraperMetrics:
+    """Process-wide counters, gauges and histograms of one scraper run
+
+    A "query" is one unit of scraper work: a search for the search scrapers,
+    a place visit for the detail/refresh scrapers, a map tile for the tile crawler.
+    """
+
+    def __init__(self, window=RATE_WINDOW):
+        self.window = window
+        self.lock = threading.Lock()
+        self.entry_point = None
+        self.started = time.time()
+        self.queries = {'ok': 0, 'empty': 0, 'failed': 0}
+        self.businesses = 0
+        self.errors = {}  # stage -> count
+        self.stages = {}  # stage -> Histogram
+        self.active_browsers = 0
+        self._recent = deque()  # (finished at, businesses) inside the rate window
+
+    def start_run(self, entry_point):
+        with self.lock:
+            self.entry_point = entry_point
+            self.started = time.time()
+
+    def observe(self, stage, seconds):
+        """Record how long one stage (results_loaded, scroll, extract, query...) took"""
+        with self.lock:
+            self.stages.setdefault(stage, Histogram()).observe(seconds)
+
+    def error(self, stage):
+        with self.lock:
+            self.errors[stage] = self.errors.get(stage, 0) + 1
+
+    def query_finished(self, seconds, businesses, listed=None):
+        """A query completed; listed = places it showed (default businesses), none is an empty result
+
+        Pass listed when already-seen places are skipped, so a query whose
+        places were all scraped before doesn't look like an empty search.
+        """
+        now = time.time()
+        listed = businesses if listed is None else listed
+        with self.lock:
+            self.queries['ok' if listed else 'empty'] += 1
+            self.businesses += businesses
+            self.stages.setdefault('query', Histogram()).observe(seconds)
+            self._recent.append((now, businesses))
+
+    def query_failed(self):
+        """A query gave up (after its retries)"""
+        with self.lock:
+            self.queries['failed'] += 1
+
+    def browser_started(self):
+        with self.lock:
+            self.active_browsers += 1
+
+    def browser_stopped(self):
+        with self.lock:
+            self.active_browsers = max(0, self.active_browsers - 1)
+
+    def rates(self, now=None):
+        """(queries per second, businesses per minute) over the last window seconds"""
+        now = now or time.time()
+        while self._recent and self._recent[0][0] < now - self.window:
+            self._recent.popleft()
+        span = max(1.0, min(self.window, now - self.started))
+        return len(self._recent) / span, sum(businesses for _, businesses in self._recent) * 60 / span
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self.lock:
+            queries_per_second, businesses_per_minute = self.rates()
+            total = sum(self.queries.values())
+            lines = [
+                "# HELP scraper_info Scraper entry point of this process",
+                "# TYPE scraper_info gauge",
+                f'scraper_info{{entry_point="{self.entry_point or "unknown"}"}} 1',
+                "# HELP scraper_uptime_seconds Seconds since the run started",
+                "# TYPE scraper_uptime_seconds gauge",
+                f"scraper_uptime_seconds {time.time() - self.started:.1f}",
+                "# HELP scraper_queries_total Finished queries by result",
+                "# TYPE scraper_queries_total counter",
+            ]
+            lines += [f'scraper_queries_total{{result="{result}"}} {count}' for result, count in self.queries.items()]
+            lines += [
+                "# HELP scraper_businesses_total Businesses extracted",
+                "# TYPE scraper_businesses_total counter",
+                f"scraper_businesses_total {self.businesses}",
+                f"# HELP scraper_queries_per_second Queries finished per second over the last {self.window}s",
+                "# TYPE scraper_queries_per_second gauge",
+                f"scraper_queries_per_second {queries_per_second:.4f}",
+                f"# HELP scraper_businesses_per_minute Businesses extracted per minute over the last {self.window}s",
+                "# TYPE scraper_businesses_per_minute gauge",
+                f"scraper_businesses_per_minute {businesses_per_minute:.2f}",
+                "# HELP scraper_empty_result_ratio Share of finished queries that found no businesses",
+                "# TYPE scraper_empty_result_ratio gauge",
+                f"scraper_empty_result_ratio {self.queries['empty'] / total if total else 0:.4f}",
+                "# HELP scraper_error_ratio Share of finished queries that failed",
+                "# TYPE scraper_error_ratio gauge",
+                f"scraper_error_ratio {self.queries['failed'] / total if total else 0:.4f}",
+                "# HELP scraper_errors_total Errors by stage (failed attempts, extraction errors)",
+                "# TYPE scraper_errors_total counter",
+            ]
+            lines += [f'scraper_errors_total{{stage="{stage}"}} {count}' for stage, count in sorted(self.errors.items())]
+            lines += [
+                "# HELP scraper_active_browsers Browser processes currently open",
+                "# TYPE scraper_active_browsers gauge",
+                f"scraper_active_browsers {self.active_browsers}",
+                "# HELP scraper_stage_seconds Latency of each scraping stage",
+                "# TYPE scraper_stage_seconds histogram",
+            ]
+            for stage, histogram in sorted(self.stages.items()):
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'scraper_stage_seconds_bucket{{stage="{stage}",le="{bound:g}"}} {count}')
+                lines.append(f'scraper_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'scraper_stage_seconds_sum{{stage="{stage}"}} {histogram.sum:.3f}')
+                lines.append(f'scraper_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+# Shared by waits, scrollers, extractors, pools and schedulers of this process
+METRICS = ScraperMetrics()
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves /metrics (and / for convenience)"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(port, entry_point, metrics=METRICS, host="127.0.0.1"):
+    """Serve metrics in a daemon thread for the rest of the run; returns the server"""
+    metrics.start_run(entry_point)
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.metrics = metrics
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"📈 Metrics: http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the metrics a running scraper exposes")
+    parser.add_argument("--port", type=int, default=DEFAULT_METRICS_PORT)
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args()
+
+    with urlopen(f"http://{args.host}:{args.port}/metrics", timeout=5) as response:
+        print(response.read().decode('utf-8'))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+🔥 SEEN-PLACE REGISTRY - NEVER CLICK THE SAME BUSINESS TWICE 🔥
+Process-wide (optionally on-disk) set of places already extracted by any query
+"""
+
+import os
+from maps_response_parser import feature_id_from_href
+
+def place_key(href_or_id):
+    """Feature ID (0x…:0x…) of a /maps/place/ href or place ID; other hrefs without their query string"""
+    if not href_or_id:
+        return None
+    value = str(href_or_id)
+    if value.startswith('0x'):
+        return value
+    return feature_id_from_href(value) or value.split('?')[0]
+
+class SeenPlaces:
+    """Places extracted so far; overlapping queries skip them instead of clicking again
+
+    New places are kept pending until flush(), which appends them to the file -
+    call it once the query that found them has been saved, so a crash mid-query
+    never marks unsaved businesses as done.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.keys = set()
+        self._pending = []
+        self.stats = {'checked': 0, 'skipped': 0, 'loaded': 0}
+
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.keys.update(line.strip() for line in f if line.strip())
+            self.stats['loaded'] = len(self.keys)
+            print(f"♻️  {len(self.keys):,} already scraped places loaded from {path}")
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, href_or_id):
+        return place_key(href_or_id) in self.keys
+
+    def update(self, place_ids):
+        """Seed with known place IDs, e.g. ProgressJournal.place_ids of finished queries"""
+        self.keys.update(key for key in map(place_key, place_ids) if key)
+
+    def filter_new(self, items, href_of=lambda item: item):
+        """Items whose href is not seen yet; counts every skip as a saved click"""
+        fresh = []
+        for item in items:
+            self.stats['checked'] += 1
+            if place_key(href_of(item)) in self.keys:
+                self.stats['skipped'] += 1
+            else:
+                fresh.append(item)
+        return fresh
+
+    def add(self, *hrefs_or_ids):
+        """Register a scraped place under all the identifiers we have for it"""
+        for value in hrefs_or_ids:
+            key = place_key(value)
+            if key and key not in self.keys:
+                self.keys.add(key)
+                self._pending.append(key)
+
+    def flush(self):
+        """Persist places added since the last flush (no-op without a file)"""
+        if not self.path or not self._pending:
+            self._pending = []
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write("\n".join(self._pending) + "\n")
+        self._pending = []
+
+    def print_stats(self):
+        print(f"♻️  Seen places: {self.stats['skipped']:,} of {self.stats['checked']:,} listings skipped "
+              f"(clicks saved), {len(self.keys):,} places known")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+🔥 BULK UPLOAD TEST - BATCHWRITE AGAINST THE LOCAL FIRESTORE MOCK 🔥
+Run with: python -m pytest test_firestore_upload.py
+"""
+
+import json
+import random
+import populate_firebase_db
+from populate_firebase_db import FirebasePopulator, load_dataset_records
+from business_store import record_id
+from firestore_mock_server import start_mock_server
+
+def sample_records(count):
+    return [
+        {'name': f"Shop {i}", 'address': f"{i} Freeganj, Ujjain", 'rating': 4.2, 'verified': i % 2 == 0}
+        for i in range(count)
+    ]
+
+def upload(records, abort_rate=0.0, batch_size=500, max_retries=5):
+    server, base_url = start_mock_server(abort_rate=abort_rate)
+    try:
+        populator = FirebasePopulator(firestore_api=base_url)
+        uploaded = populator.bulk_upload(records, batch_size=batch_size, concurrency=4, max_retries=max_retries)
+        return server, populator, uploaded
+    finally:
+        server.shutdown()
+
+def test_bulk_upload_batches_and_stores_documents():
+    records = sample_records(1200)
+    server, populator, uploaded = upload(records)
+
+    assert uploaded == 1200
+    assert sorted(server.batch_sizes) == [200, 500, 500]
+    assert len(server.documents) == 1200
+
+    stored = server.documents[f"{populator.document_root}/vendors/{record_id(records[7])}"]
+    assert stored['name'] == {'stringValue': "Shop 7"}
+    assert stored['rating'] == {'doubleValue': 4.2}
+    assert stored['verified'] == {'booleanValue': False}
+    assert 'createdAt' in stored and 'updatedAt' in stored
+
+def test_bulk_upload_retries_aborted_writes(monkeypatch):
+    monkeypatch.setattr(populate_firebase_db.time, 'sleep', lambda seconds: None)
+    random.seed(7)
+    server, _, uploaded = upload(sample_records(300), abort_rate=0.3, batch_size=100, max_retries=12)
+
+    assert uploaded == 300
+    assert len(server.documents) == 300
+    # The first round sends every write once, later rounds only the aborted ones
+    assert len(server.batch_sizes) > 3
+    assert sum(server.batch_sizes) > 300
+
+def test_reupload_overwrites_instead_of_duplicating():
+    records = sample_records(50)
+    server, base_url = start_mock_server()
+    try:
+        populator = FirebasePopulator(firestore_api=base_url)
+        populator.bulk_upload(records)
+        populator.bulk_upload(records + records[:10])
+        assert len(server.documents) == 50
+        assert server.batch_sizes == [50, 50]
+    finally:
+        server.shutdown()
+
+def test_load_dataset_records_reads_jsonl_and_skips_summaries(tmp_path):
+    records = sample_records(3)
+    (tmp_path / "restaurants.jsonl").write_text("".join(json.dumps(record) + "\n" for record in records))
+    (tmp_path / "shops.json").write_text(json.dumps(records[:1]))
+    (tmp_path / "dataset_summary.json").write_text(json.dumps({'total_businesses': 4}))
+
+    assert len(load_dataset_records([str(tmp_path)])) == 4
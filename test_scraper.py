@@ -7,8 +7,8 @@ Test the enhanced scraper with a small sample
 import subprocess
 import sys
 import os
-import pandas as pd
 from datetime import datetime
+from business_store import DEFAULT_STORE_PATH, BusinessStore
 
 def run_test_scraping():
     """Run a quick test with limited data"""
@@ -67,66 +67,55 @@ def run_test_scraping():
     analyze_test_results()
     return True
 
-def analyze_test_results():
+def analyze_test_results(store_path=DEFAULT_STORE_PATH):
     """Analyze the test results"""
     print("\n📊 ANALYZING TEST RESULTS")
     print("=" * 40)
     
-    # Look for generated files
+    # Every query of today's run is in the business store
     today = datetime.now().strftime("%Y-%m-%d")
-    data_dir = f"Ujjain_Business_Data/{today}"
     
-    if not os.path.exists(data_dir):
-        print("❌ No data directory found")
+    if not os.path.exists(store_path):
+        print("❌ No business store found")
         return
     
-    csv_files = [f for f in os.listdir(data_dir) if f.endswith('.csv')]
+    store = BusinessStore(store_path)
+    query_counts = store.query_counts(date=today)
     
-    if not csv_files:
-        print("❌ No CSV files found")
+    if not query_counts:
+        print("❌ No queries saved today")
+        store.close()
         return
     
-    print(f"✅ Found {len(csv_files)} data files")
+    print(f"✅ Found {len(query_counts)} saved queries")
     
-    total_businesses = 0
-    categories_found = set()
-    
-    for csv_file in csv_files:
-        try:
-            df = pd.read_csv(os.path.join(data_dir, csv_file))
-            count = len(df)
-            total_businesses += count
-            
-            print(f"📁 {csv_file}: {count} businesses")
-            
-            # Show sample data
-            if count > 0:
-                print("   Sample business:")
-                sample = df.iloc[0]
-                print(f"   📍 Name: {sample.get('name', 'N/A')}")
-                print(f"   📍 Address: {sample.get('address', 'N/A')}")
-                print(f"   📍 Phone: {sample.get('phone_number', 'N/A')}")
-                print(f"   📍 Category: {sample.get('primary_category', 'N/A')}")
-                print(f"   📍 Subcategory: {sample.get('primary_subcategory', 'N/A')}")
-                print(f"   📍 Rating: {sample.get('reviews_average', 'N/A')}")
-                print(f"   📍 Image: {sample.get('image_url', 'N/A')[:50]}...")
-                print()
-                
-                if 'primary_category' in df.columns:
-                    categories_found.update(df['primary_category'].dropna().unique())
+    for query, count in query_counts:
+        print(f"📁 {query}: {count} businesses")
         
-        except Exception as e:
-            print(f"❌ Error reading {csv_file}: {e}")
-    
-    print(f"🎉 TOTAL BUSINESSES EXTRACTED: {total_businesses}")
+        # Show sample data
+        sample = store.query_sample(query)
+        if sample:
+            print("   Sample business:")
+            print(f"   📍 Name: {sample.get('name') or 'N/A'}")
+            print(f"   📍 Address: {sample.get('address') or 'N/A'}")
+            print(f"   📍 Phone: {sample.get('phone_number') or 'N/A'}")
+            print(f"   📍 Category: {sample.get('primary_category') or 'N/A'}")
+            print(f"   📍 Subcategory: {sample.get('primary_subcategory') or 'N/A'}")
+            print(f"   📍 Rating: {sample.get('reviews_average') or 'N/A'}")
+            print(f"   📍 Image: {(sample.get('image_url') or 'N/A')[:50]}...")
+            print()
+    
+    categories_found = store.breakdown('primary_category', date=today)
+    print(f"🎉 TOTAL BUSINESSES EXTRACTED: {store.count(date=today)}")
     print(f"📂 CATEGORIES FOUND: {len(categories_found)}")
     
     if categories_found:
         print("📋 Categories:")
-        for category in sorted(categories_found):
-            print(f"   ✅ {category}")
+        for category, count in sorted(categories_found.items(), key=lambda item: str(item[0])):
+            print(f"   ✅ {category or 'Uncategorized'} ({count})")
     
-    print(f"\n📁 Data saved in: {data_dir}")
+    store.close()
+    print(f"\n📁 Data saved in: {store_path}")
 
 def show_sample_data_structure():
     """Show expected data structure"""
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+🔥 QUADTREE TILE CRAWLER - SEARCH THE MAP, NOT A LIST OF PLACE NAMES 🔥
+Search a category over viewports covering Ujjain, splitting only the tiles whose result list fills up
+"""
+
+import asyncio
+import math
+import re
+import time
+import argparse
+from dataclasses import dataclass, asdict
+from urllib.parse import quote_plus
+from playwright.async_api import async_playwright
+from browser_pool import BrowserPool, PoolConfig
+from query_scheduler import QueryScheduler, SchedulerConfig
+from resource_filter import DEFAULT_PROFILE, RESOURCE_PROFILES
+from wait_strategies import AsyncMapsWaits, WaitTelemetry
+from feed_scroller import LISTING_SELECTOR, AsyncFeedScroller, ScrollTelemetry
+from seen_places import place_key
+from geo_index import nearest_area
+from business_store import DEFAULT_STORE_PATH, BusinessStore
+from place_detail_scraper import DetailConfig, scrape_places
+from google_maps_scraper_bazarse import Business, apply_search_context
+from scraper_metrics import METRICS, start_metrics_server
+
+# Municipal area plus the outskirts along Indore/Agar/Dewas roads
+UJJAIN_BBOX = (23.120, 75.720, 23.230, 75.860)  # south, west, north, east
+
+# Place hrefs carry the pin position: …!3d23.1765!4d75.7885…
+HREF_COORDINATES_RE = re.compile(r'!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)')
+
+# Map part of a default 1280x720 page - the result panel covers the left ~400px
+MAP_WIDTH_PX = 880
+MAP_HEIGHT_PX = 720
+
+@dataclass(frozen=True)
+class Tile:
+    """Lat/lng box searched as one map viewport"""
+    south: float
+    west: float
+    north: float
+    east: float
+    depth: int = 0
+
+    @property
+    def center(self):
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    def zoom(self, width_px=MAP_WIDTH_PX, height_px=MAP_HEIGHT_PX):
+        """Largest Maps zoom level whose viewport still shows the whole tile"""
+        lat, _ = self.center
+        width_m = (self.east - self.west) * 111320 * math.cos(math.radians(lat))
+        height_m = (self.north - self.south) * 110574
+        meters_per_px_at_zoom0 = 156543.03 * math.cos(math.radians(lat))
+        return max(1, math.floor(math.log2(meters_per_px_at_zoom0 * min(width_px / width_m, height_px / height_m))))
+
+    def split(self):
+        lat, lng = self.center
+        depth = self.depth + 1
+        return [
+            Tile(self.south, self.west, lat, lng, depth), Tile(self.south, lng, lat, self.east, depth),
+            Tile(lat, self.west, self.north, lng, depth), Tile(lat, lng, self.north, self.east, depth),
+        ]
+
+    def contains(self, lat, lng):
+        return self.south <= lat < self.north and self.west <= lng < self.east
+
+    def search_url(self, category):
+        lat, lng = self.center
+        return f"https://www.google.com/maps/search/{quote_plus(category)}/@{lat:.6f},{lng:.6f},{self.zoom()}z"
+
+    def __str__(self):
+        return f"d{self.depth} {self.south:.4f},{self.west:.4f}→{self.north:.4f},{self.east:.4f}"
+
+@dataclass
+class TileConfig:
+    """Configuration for the quadtree crawl"""
+    saturation: int = 100  # a tile listing this many places probably has more - split it
+    max_depth: int = 5  # 1/32 of the city box per side (~350m tiles in Ujjain)
+    concurrency: int = 8  # tiles searched at once
+    browsers: int = 2
+    headless: bool = True
+    resource_profile: str = DEFAULT_PROFILE
+    scrape_details: bool = True  # open newly found places for phone/hours/photos, else save their listings
+
+def places_in_tile(listings, tile):
+    """{place key: listing} of listed places whose pin lies inside the tile (Maps pads the viewport)"""
+    places = {}
+    for listing in listings:
+        match = HREF_COORDINATES_RE.search(listing['href'] or "")
+        if not match:
+            continue
+        lat, lng = float(match.group(1)), float(match.group(2))
+        if tile.contains(lat, lng):
+            places[place_key(listing['href'])] = dict(listing, latitude=lat, longitude=lng)
+    return places
+
+class TileCrawler:
+    """Breadth-first quadtree over one category: each level's tiles run on a shared page pool"""
+
+    def __init__(self, config=None):
+        self.config = config or TileConfig()
+        self.telemetry = WaitTelemetry()
+        self.scroll_telemetry = ScrollTelemetry()
+        self.stats = {'searches': 0, 'saturated': 0, 'per_depth': {}}
+
+    async def _search_tile(self, pool, category, tile):
+        """(places inside the tile, listings shown) for one viewport search"""
+        start = time.perf_counter()
+        async with pool.page() as page:
+            waits = AsyncMapsWaits(page, self.telemetry)
+            await page.goto(tile.search_url(category), wait_until="domcontentloaded")
+            await waits.results_loaded()
+
+            # Scroll until the feed ends or reaches the saturation size
+            await AsyncFeedScroller(page, waits, self.scroll_telemetry).scroll(self.config.saturation)
+            listings = await page.locator(LISTING_SELECTOR).evaluate_all(
+                "elements => elements.map(element => ({href: element.href, name: element.getAttribute('aria-label')}))"
+            )
+
+        self.stats['searches'] += 1
+        self.stats['per_depth'][tile.depth] = self.stats['per_depth'].get(tile.depth, 0) + 1
+        places = places_in_tile(listings, tile)
+        METRICS.query_finished(time.perf_counter() - start, len(places), len(listings))
+        return places, len(listings)
+
+    async def crawl(self, category, bbox=UJJAIN_BBOX):
+        """{place key: listing dict} of every place found for the category inside bbox"""
+        found = {}
+        level = [Tile(*bbox)]
+        browsers = max(1, min(self.config.browsers, self.config.concurrency))
+        pool_config = PoolConfig(
+            max_browsers=browsers,
+            contexts_per_browser=-(-self.config.concurrency // browsers),
+            headless=self.config.headless,
+            resource_profile=self.config.resource_profile
+        )
+
+        async with async_playwright() as playwright:
+            async with BrowserPool(playwright, pool_config) as pool:
+                while level:
+                    scheduler = QueryScheduler(
+                        lambda tile, worker_id: self._search_tile(pool, category, tile),
+                        SchedulerConfig(concurrency=self.config.concurrency, max_retries=2)
+                    )
+                    results = await scheduler.run(level)
+
+                    next_level = []
+                    for tile, (places, listed) in results.items():
+                        found.update(places)
+                        # A full list means Maps cut it off - look closer; a short one is the whole tile
+                        if listed >= self.config.saturation:
+                            self.stats['saturated'] += 1
+                            if tile.depth < self.config.max_depth:
+                                next_level.extend(tile.split())
+                    print(f"🗺️  {category}: depth {level[0].depth} - {len(level)} tiles, "
+                          f"{len(found):,} places so far, {len(next_level)} tiles to split into")
+                    level = next_level
+                pool.print_stats()
+        return found
+
+    def print_stats(self, category, found, seconds):
+        depths = ", ".join(f"d{depth}: {count}" for depth, count in sorted(self.stats['per_depth'].items()))
+        print(f"🗺️  {category}: {self.stats['searches']} searches ({depths}), {self.stats['saturated']} saturated, "
+              f"{len(found):,} places in {seconds / 60:.1f} minutes")
+        self.telemetry.print_summary()
+        self.scroll_telemetry.print_summary()
+
+def listing_business(key, listing):
+    """Business from a feed listing alone - name and pin, the rest left for --backfill"""
+    return Business(name=listing.get('name'), google_place_id=key,
+                    latitude=listing['latitude'], longitude=listing['longitude'])
+
+def save_tile_results(store, category, found, detail_config=None, scrape_details=True):
+    """Save the category's businesses, opening places the store doesn't know yet; returns how many were new
+
+    Without scrape_details (or when a detail visit fails) a new place is saved
+    from its listing - name, place ID and pin - so
+    `place_detail_scraper.py --backfill phone_number` can complete it later.
+    """
+    new_urls = {listing['href']: key for key, listing in found.items() if key and store.get(key) is None}
+    print(f"🆕 {len(new_urls):,} of {len(found):,} places are new to the store")
+
+    results = {}
+    if new_urls and scrape_details:
+        results, scraper = scrape_places(list(new_urls), detail_config)
+        scraper.print_stats()
+
+    records = []
+    for url, key in new_urls.items():
+        listing = found[key]
+        business = results.get(url) or listing_business(key, listing)
+        business.latitude = business.latitude or listing['latitude']
+        business.longitude = business.longitude or listing['longitude']
+        apply_search_context(business, category)
+        # The category query names no area - place the pin instead
+        business.area = nearest_area(business.latitude, business.longitude) or business.area
+        records.append(asdict(business))
+
+    # Already known places are linked to this search too, so the planner sees its full result set
+    new_keys = set(new_urls.values())
+    known = [key for key in found if key and key not in new_keys]
+    store.save_query(f"{category} in Ujjain (tiles)", records, known)
+    return len(records)
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl categories over an adaptive quadtree of map tiles")
+    parser.add_argument("categories", nargs="+", help='Categories to search, e.g. restaurants "sweet shops"')
+    parser.add_argument("--saturation", type=int, default=TileConfig.saturation,
+                        help="Split a tile once its result list reaches this many places")
+    parser.add_argument("--max-depth", type=int, default=TileConfig.max_depth)
+    parser.add_argument("--concurrency", type=int, default=TileConfig.concurrency)
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH)
+    parser.add_argument("--no-details", action="store_true",
+                        help="Save new places from their listings (name, pin) without opening them")
+    parser.add_argument("--resources", choices=list(RESOURCE_PROFILES), default=DEFAULT_PROFILE)
+    parser.add_argument("--show-browser", action="store_true", help="Run the browsers with a window")
+    parser.add_argument("--dry-run", action="store_true", help="Print the root tile and its zoom level only")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve live Prometheus metrics on this local port, e.g. 9464")
+    args = parser.parse_args()
+
+    root = Tile(*UJJAIN_BBOX)
+    if args.dry_run:
+        smallest = root
+        for _ in range(args.max_depth):
+            smallest = smallest.split()[0]
+        print(f"🗺️  Root tile {root} at zoom {root.zoom()}: {root.search_url(args.categories[0])}")
+        print(f"   Deepest tiles (depth {args.max_depth}) at zoom {smallest.zoom()}, "
+              f"at most {4 ** args.max_depth:,} of them")
+        return
+
+    config = TileConfig(saturation=args.saturation, max_depth=args.max_depth, concurrency=args.concurrency,
+                        headless=not args.show_browser, resource_profile=args.resources,
+                        scrape_details=not args.no_details)
+    detail_config = DetailConfig(concurrency=config.concurrency, headless=config.headless,
+                                 resource_profile=config.resource_profile)
+    store = BusinessStore(args.store)
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port, "tile_crawler")
+
+    for category in args.categories:
+        start = time.time()
+        crawler = TileCrawler(config)
+        found = asyncio.run(crawler.crawl(category))
+        crawler.print_stats(category, found, time.time() - start)
+        added = save_tile_results(store, category, found, detail_config, config.scrape_details)
+        print(f"✅ {added:,} new businesses saved to {args.store}")
+
+    store.close()
+
+if __name__ == "__main__":
+    main()
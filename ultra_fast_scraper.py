@@ -18,160 +18,149 @@ import pandas as pd
 from concurrent.futures import ProcessPoolExecutor
 import subprocess
 import sys
+from browser_pool import BrowserPool, PoolConfig
+from resource_filter import DEFAULT_PROFILE, RESOURCE_PROFILES
+from wait_strategies import AsyncMapsWaits, WaitTelemetry
+from detail_extractor import quick_record, read_detail_pane_async
+from feed_scroller import LISTING_SELECTOR, AsyncFeedScroller, ScrollTelemetry
+from query_scheduler import QueryScheduler, SchedulerConfig, dense_first_priority
+from progress_journal import ProgressJournal
+from query_planner import optimize_queries
+from scraper_metrics import METRICS, start_metrics_server
+import argparse
+
+JOURNAL_PATH = "Ultra_Fast_Results_progress.jsonl"
+
+def get_ultra_queries():
+    """Generate all Ujjain search queries"""
+    
+    locations = [
+        "Freeganj", "Mahakaleshwar Temple", "Tower Chowk", "Dewas Gate",
+        "University Road", "Agar Road", "Indore Road", "Railway Station Road",
+        "Nanakheda", "Chimanganj Mandi", "Jiwaji University", "Kshipra Pul",
+        "Ramghat Road", "Vikram University", "Madhav Nagar", "Kalbhairav Temple",
+        "Sandipani Ashram", "Triveni Museum", "Bharti Nagar", "Jaisinghpura"
+    ]
+    
+    categories = [
+        # High-priority categories for faster results
+        "restaurants", "grocery stores", "medical stores", "clothing shops",
+        "mobile shops", "beauty parlors", "electronics stores", "banks",
+        "petrol pumps", "hospitals", "schools", "hotels", "auto repair",
+        "jewellery shops", "furniture stores", "hardware stores", "pharmacies",
+        "sweet shops", "kirana stores", "salons", "coaching centers",
+        "travel agencies", "real estate", "insurance", "lawyers",
+        
+        # Additional categories
+        "fast food", "bakeries", "ice cream parlors", "tea stalls", "coffee shops",
+        "supermarkets", "general stores", "spice shops", "clinics", "dental clinics",
+        "eye clinics", "saree shops", "footwear", "computer shops", "mobile repair",
+        "spa", "home decor", "paint shops", "car service", "bike service",
+        "colleges", "libraries", "guest houses", "event management", "photography"
+    ]
+    
+    queries = []
+    
+    # Generate location-specific queries
+    for location in locations:
+        for category in categories:
+            queries.append(f"{category} in {location}, Ujjain")
+    
+    # Add general Ujjain queries
+    for category in categories:
+        queries.append(f"{category} in Ujjain")
+    
+    return queries
 
 class UltraFastScraper:
-    def __init__(self):
+    def __init__(self, resume=False, resource_profile=DEFAULT_PROFILE, plan_queries=False):
         self.total_workers = 1000
-        self.concurrent_browsers = 100
+        self.concurrent_browsers = 100  # Concurrent query workers (warm pages)
+        self.pool_browsers = 10  # Chromium processes shared by all workers
         self.businesses_per_query = 25
         self.max_retries = 3
         self.results_queue = asyncio.Queue()
         self.completed_queries = 0
         self.total_businesses = 0
+        self.wait_telemetry = WaitTelemetry()
+        self.scroll_telemetry = ScrollTelemetry()
+        self.journal = ProgressJournal(JOURNAL_PATH, resume=resume)
+        self.resource_profile = resource_profile
+        self.plan_queries = plan_queries  # drop duplicate/synonym/covered queries first
         
     async def get_all_queries(self):
         """Generate all Ujjain search queries"""
-        
-        locations = [
-            "Freeganj", "Mahakaleshwar Temple", "Tower Chowk", "Dewas Gate",
-            "University Road", "Agar Road", "Indore Road", "Railway Station Road",
-            "Nanakheda", "Chimanganj Mandi", "Jiwaji University", "Kshipra Pul",
-            "Ramghat Road", "Vikram University", "Madhav Nagar", "Kalbhairav Temple",
-            "Sandipani Ashram", "Triveni Museum", "Bharti Nagar", "Jaisinghpura"
-        ]
-        
-        categories = [
-            # High-priority categories for faster results
-            "restaurants", "grocery stores", "medical stores", "clothing shops",
-            "mobile shops", "beauty parlors", "electronics stores", "banks",
-            "petrol pumps", "hospitals", "schools", "hotels", "auto repair",
-            "jewellery shops", "furniture stores", "hardware stores", "pharmacies",
-            "sweet shops", "kirana stores", "salons", "coaching centers",
-            "travel agencies", "real estate", "insurance", "lawyers",
-            
-            # Additional categories
-            "fast food", "bakeries", "ice cream parlors", "tea stalls", "coffee shops",
-            "supermarkets", "general stores", "spice shops", "clinics", "dental clinics",
-            "eye clinics", "saree shops", "footwear", "computer shops", "mobile repair",
-            "spa", "home decor", "paint shops", "car service", "bike service",
-            "colleges", "libraries", "guest houses", "event management", "photography"
-        ]
-        
-        queries = []
-        
-        # Generate location-specific queries
-        for location in locations:
-            for category in categories:
-                queries.append(f"{category} in {location}, Ujjain")
-        
-        # Add general Ujjain queries
-        for category in categories:
-            queries.append(f"{category} in Ujjain")
-        
-        return queries
+        return get_ultra_queries()
     
-    async def scrape_single_query(self, browser, query, worker_id):
-        """Scrape a single query with async browser"""
+    async def scrape_single_query(self, pool, query, worker_id):
+        """Scrape a single query on a warm page borrowed from the pool"""
         
+        start = time.perf_counter()
         try:
-            page = await browser.new_page()
-            await page.goto("https://www.google.com/maps", timeout=30000)
-            
-            # Search for the query
-            await page.fill('input[id="searchboxinput"]', query)
-            await page.press('input[id="searchboxinput"]', 'Enter')
-            await page.wait_for_timeout(3000)
-            
-            # Scroll to load results
-            for _ in range(5):  # Limited scrolling for speed
-                await page.mouse.wheel(0, 5000)
-                await page.wait_for_timeout(1000)
-            
-            # Extract business listings
-            listings = await page.locator('a[href*="/maps/place/"]').all()
-            businesses = []
-            
-            for i, listing in enumerate(listings[:self.businesses_per_query]):
-                try:
-                    await listing.click()
-                    await page.wait_for_timeout(2000)
-                    
-                    # Extract business data quickly
-                    business_data = await self.extract_business_data(page, query)
-                    if business_data:
-                        businesses.append(business_data)
-                    
-                except Exception as e:
-                    print(f"Worker {worker_id}: Error extracting business {i}: {e}")
-                    continue
-            
-            await page.close()
+            async with pool.page() as page:
+                resources = pool.resources_for(page)
+                resources.start_query()
+                
+                # Search for the query
+                waits = AsyncMapsWaits(page, self.wait_telemetry)
+                await waits.mark_stale_results()
+                await page.fill('input[id="searchboxinput"]', query)
+                await page.press('input[id="searchboxinput"]', 'Enter')
+                await waits.results_loaded()
+                
+                # Scroll only as far as this query's results need
+                scrolled = await AsyncFeedScroller(page, waits, self.scroll_telemetry).scroll(
+                    self.businesses_per_query)
+                
+                # Extract business listings
+                hrefs = scrolled.hrefs[:self.businesses_per_query]
+                listings = (await page.locator(LISTING_SELECTOR).all())[:len(hrefs)]
+                businesses = []
+                
+                for i, (listing, href) in enumerate(zip(listings, hrefs)):
+                    try:
+                        if not await waits.open_listing(listing, href):
+                            continue  # pane never loaded - extracting now would copy the previous business
+                        
+                        # Extract business data quickly
+                        business_data = await self.extract_business_data(page, query)
+                        if business_data:
+                            businesses.append(business_data)
+                        
+                    except Exception as e:
+                        print(f"Worker {worker_id}: Error extracting business {i}: {e}")
+                        METRICS.error('extract')
+                        continue
+                
+                bandwidth = resources.query_summary()
             
             # Save results immediately
-            await self.save_query_results(query, businesses, worker_id)
+            filepath = await self.save_query_results(query, businesses, worker_id)
+            self.journal.mark_done(
+                query,
+                place_ids=[business.get('google_place_id') for business in businesses],
+                businesses=len(businesses),
+                output=filepath
+            )
             
             self.completed_queries += 1
             self.total_businesses += len(businesses)
+            METRICS.query_finished(time.perf_counter() - start, len(businesses), scrolled.count)
             
-            print(f"✅ Worker {worker_id}: {query} - {len(businesses)} businesses")
+            print(f"✅ Worker {worker_id}: {query} - {len(businesses)} businesses ({bandwidth}, "
+                  f"{scrolled.iterations} scrolls in {scrolled.seconds:.1f}s)")
             
             return len(businesses)
             
         except Exception as e:
             print(f"❌ Worker {worker_id}: Query failed - {e}")
-            return 0
+            raise
     
     async def extract_business_data(self, page, query):
         """Extract business data from current page"""
         
         try:
-            business = {}
-            
-            # Name
-            name_elem = page.locator('h1.DUwDvf').first
-            if await name_elem.count() > 0:
-                business['name'] = await name_elem.inner_text()
-            
-            # Address
-            address_elem = page.locator('[data-item-id="address"] .fontBodyMedium').first
-            if await address_elem.count() > 0:
-                business['address'] = await address_elem.inner_text()
-            
-            # Phone
-            phone_elem = page.locator('[data-item-id*="phone"] .fontBodyMedium').first
-            if await phone_elem.count() > 0:
-                business['phone_number'] = await phone_elem.inner_text()
-            
-            # Website
-            website_elem = page.locator('[data-item-id="authority"] .fontBodyMedium').first
-            if await website_elem.count() > 0:
-                business['website'] = await website_elem.inner_text()
-            
-            # Rating
-            rating_elem = page.locator('[role="img"][aria-label*="stars"]').first
-            if await rating_elem.count() > 0:
-                rating_text = await rating_elem.get_attribute('aria-label')
-                if rating_text:
-                    try:
-                        business['rating'] = float(rating_text.split()[0])
-                    except:
-                        pass
-            
-            # Image URL
-            img_elem = page.locator('.ZKCDEc img').first
-            if await img_elem.count() > 0:
-                business['image_url'] = await img_elem.get_attribute('src')
-            
-            # Coordinates from URL
-            url = page.url
-            if '/@' in url:
-                try:
-                    coords = url.split('/@')[1].split('/')[0]
-                    lat, lng = coords.split(',')[:2]
-                    business['latitude'] = float(lat)
-                    business['longitude'] = float(lng)
-                except:
-                    pass
+            business = quick_record(await read_detail_pane_async(page))
             
             # Category from query
             business['category'] = self.categorize_business(query)
@@ -182,6 +171,7 @@ class UltraFastScraper:
             
         except Exception as e:
             print(f"Error extracting business data: {e}")
+            METRICS.error('extract')
             return None
     
     def categorize_business(self, query):
@@ -223,38 +213,8 @@ class UltraFastScraper:
         filepath = os.path.join(results_dir, filename)
         async with aiofiles.open(filepath, 'w') as f:
             await f.write(json.dumps(businesses, indent=2, ensure_ascii=False))
-    
-    async def worker_browser(self, worker_id, queries, playwright_instance):
-        """Single browser worker handling multiple queries"""
         
-        try:
-            browser = await playwright_instance.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-dev-shm-usage']
-            )
-            
-            total_businesses = 0
-            
-            for query in queries:
-                try:
-                    businesses_count = await self.scrape_single_query(browser, query, worker_id)
-                    total_businesses += businesses_count
-                    
-                    # Small delay to avoid overwhelming
-                    await asyncio.sleep(0.1)
-                    
-                except Exception as e:
-                    print(f"Worker {worker_id}: Query error - {e}")
-                    continue
-            
-            await browser.close()
-            
-            print(f"🎉 Worker {worker_id} completed! Total: {total_businesses} businesses")
-            return total_businesses
-            
-        except Exception as e:
-            print(f"❌ Worker {worker_id} failed: {e}")
-            return 0
+        return filepath
     
     async def run_ultra_fast_extraction(self):
         """Run the ultra-fast extraction"""
@@ -264,6 +224,12 @@ class UltraFastScraper:
         
         # Generate all queries
         all_queries = await self.get_all_queries()
+        if self.plan_queries:
+            all_queries = optimize_queries(all_queries)
+        pending_queries = self.journal.pending(all_queries)
+        if len(pending_queries) < len(all_queries):
+            print(f"⏭️  Skipping {len(all_queries) - len(pending_queries):,} queries finished in a previous run")
+        all_queries = pending_queries
         total_queries = len(all_queries)
         
         print(f"📊 Total queries: {total_queries:,}")
@@ -271,40 +237,40 @@ class UltraFastScraper:
         print(f"⚡ Expected time: 6-8 hours")
         print(f"📈 Expected businesses: {total_queries * self.businesses_per_query:,}")
         
-        # Split queries among workers
-        queries_per_worker = total_queries // self.concurrent_browsers
-        worker_queries = []
-        
-        for i in range(self.concurrent_browsers):
-            start_idx = i * queries_per_worker
-            if i == self.concurrent_browsers - 1:
-                end_idx = total_queries
-            else:
-                end_idx = (i + 1) * queries_per_worker
-            
-            worker_queries.append(all_queries[start_idx:end_idx])
-        
-        print(f"✅ Queries split among {len(worker_queries)} workers")
-        
         # Start extraction
         start_time = time.time()
         
+        pool_config = PoolConfig(
+            max_browsers=self.pool_browsers,
+            contexts_per_browser=max(1, self.concurrent_browsers // self.pool_browsers),
+            resource_profile=self.resource_profile
+        )
+        
         async with async_playwright() as playwright:
-            # Create tasks for all workers
-            tasks = []
-            for i, queries in enumerate(worker_queries):
-                task = asyncio.create_task(
-                    self.worker_browser(i, queries, playwright)
+            async with BrowserPool(playwright, pool_config) as pool:
+                # Workers pull from one shared queue, so a slow query never stalls a fixed chunk
+                scheduler = QueryScheduler(
+                    lambda query, worker_id: self.scrape_single_query(pool, query, worker_id),
+                    SchedulerConfig(
+                        concurrency=self.concurrent_browsers,
+                        max_retries=self.max_retries,
+                        delay_between_queries=0.1
+                    ),
+                    priority=dense_first_priority
                 )
-                tasks.append(task)
-            
-            print(f"🚀 Launched {len(tasks)} browser workers")
+                
+                print(f"🚀 Launched {self.concurrent_browsers} workers on {pool_config.max_browsers} pooled browsers")
+                
+                results = await scheduler.run(all_queries)
+                scheduler.print_stats()
+                pool.print_stats()
+                self.wait_telemetry.print_summary()
+                self.scroll_telemetry.print_summary()
             
-            # Wait for all workers to complete
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            self.journal.close()
             
             # Calculate totals
-            total_businesses = sum(r for r in results if isinstance(r, int))
+            total_businesses = sum(results.values())
             
             end_time = time.time()
             duration_hours = (end_time - start_time) / 3600
@@ -347,6 +313,16 @@ def calculate_ultra_fast_estimates():
 async def main():
     """Main ultra-fast extraction function"""
     
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resume", action="store_true", help="Skip queries finished in the previous run")
+    parser.add_argument("--resources", choices=list(RESOURCE_PROFILES), default=DEFAULT_PROFILE,
+                        help="Which page resources to download (listing-only blocks stylesheets too)")
+    parser.add_argument("--plan", action="store_true",
+                        help="Skip duplicate/synonym queries and ones past runs show are covered by others")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve live Prometheus metrics on this local port, e.g. 9464")
+    args = parser.parse_args()
+    
     print("🔥 ULTRA-FAST UJJAIN SCRAPER 🔥")
     print("🚀 COMPLETE DATA TODAY - 6-8 HOURS")
     print("=" * 60)
@@ -372,7 +348,9 @@ async def main():
     choice = input("\n👉 Start ultra-fast extraction? (y/n): ").lower()
     
     if choice == 'y':
-        scraper = UltraFastScraper()
+        if args.metrics_port:
+            start_metrics_server(args.metrics_port, "ultra_fast_scraper")
+        scraper = UltraFastScraper(resume=args.resume, resource_profile=args.resources, plan_queries=args.plan)
         await scraper.run_ultra_fast_extraction()
         
         print("\n🔥 UJJAIN DATA EXTRACTION COMPLETED TODAY!")
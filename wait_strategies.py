@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+🔥 EVENT-DRIVEN WAITS - NO MORE FIXED SLEEPS 🔥
+Wait on real Google Maps DOM/network conditions and record how long each took
+"""
+
+import time
+from dataclasses import dataclass
+from urllib.parse import unquote
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from scraper_metrics import METRICS
+from maps_response_parser import feature_id_from_href
+
+# Tag whatever the previous search left on a reused page so it is not mistaken for new results;
+# headings keep the text they showed, in case Maps reuses the element for the next place
+MARK_STALE_JS = """
+() => document.querySelectorAll('a[href*="/maps/place/"], h1.DUwDvf')
+    .forEach(el => el.setAttribute('data-bazarse-stale', el.matches('h1') ? el.innerText.trim() : '1'))
+"""
+
+# Same for the detail pane alone, before clicking the next listing
+MARK_STALE_DETAIL_JS = """
+() => document.querySelectorAll('h1.DUwDvf')
+    .forEach(el => el.setAttribute('data-bazarse-stale', el.innerText.trim()))
+"""
+
+# Search finished: either a fresh result feed with listings or a fresh single place pane
+RESULTS_READY_JS = """
+() => document.querySelectorAll('a[href*="/maps/place/"]:not([data-bazarse-stale])').length > 0
+    || !!document.querySelector('h1.DUwDvf:not([data-bazarse-stale])')
+"""
+
+# More listings were appended to the feed after a scroll
+FEED_GREW_JS = """
+(previousCount) => document.querySelectorAll('a[href*="/maps/place/"]').length > previousCount
+"""
+
+# Maps appends "You've reached the end of the list." to a fully loaded feed
+FEED_END_CHECK = """
+(() => {
+    const feed = document.querySelector('div[role="feed"]');
+    if (!feed) return false;
+    if (feed.querySelector('span.HlvSq')) return true;
+    const last = feed.lastElementChild;
+    return !!last && /end of the list/i.test(last.innerText || '');
+})()
+"""
+
+# The feed grew past previousCount listings or reached its end
+FEED_MORE_JS = f"""
+(previousCount) => document.querySelectorAll('a[href*="/maps/place/"]').length > previousCount
+    || {FEED_END_CHECK.strip()}
+"""
+
+# Detail pane is a fresh one and the URL points at the clicked place (chain branches share names)
+DETAIL_CHANGED_JS = """
+(placeMarker) => {
+    const heading = document.querySelector('h1.DUwDvf:not([data-bazarse-stale])')
+        || Array.from(document.querySelectorAll('h1.DUwDvf'))
+            .find(el => el.innerText.trim() !== el.getAttribute('data-bazarse-stale'));
+    if (!heading || !heading.innerText.trim()) return false;
+    return decodeURIComponent(location.href).includes(placeMarker);
+}
+"""
+
+# A place URL opened directly has rendered its detail pane
+PLACE_READY_JS = """
+() => {
+    const heading = document.querySelector('h1.DUwDvf');
+    return !!heading && heading.innerText.trim().length > 0;
+}
+"""
+
+@dataclass
+class WaitConfig:
+    """Per-step timeouts (ms) for event-driven waits"""
+    results_timeout: int = 15000
+    feed_growth_timeout: int = 4000
+    detail_timeout: int = 5000
+    network_idle_timeout: int = 5000
+    poll_interval: int = 100
+    listing_attempts: int = 2  # clicks on a listing before giving up on its detail pane
+
+def place_marker(href):
+    """Part of a listing href the page URL contains once its place is open: the feature ID, else the name path"""
+    feature_id = feature_id_from_href(href)
+    if feature_id:
+        return feature_id
+    if href and '/maps/place/' in href:
+        return unquote('/maps/place/' + href.split('/maps/place/')[1].split('/')[0])
+    return ''
+
+class WaitTelemetry:
+    """Collects how long each wait condition actually took"""
+
+    def __init__(self):
+        self.samples = {}  # step -> list of seconds
+        self.timeouts = {}  # step -> timeout count
+
+    def record(self, step, seconds, timed_out=False):
+        self.samples.setdefault(step, []).append(seconds)
+        METRICS.observe(step, seconds)
+        if timed_out:
+            self.timeouts[step] = self.timeouts.get(step, 0) + 1
+
+    def summary(self):
+        """Per-step count, mean/p50/p95/max seconds and timeout count"""
+        report = {}
+        for step, values in self.samples.items():
+            ordered = sorted(values)
+            report[step] = {
+                'count': len(ordered),
+                'mean': sum(ordered) / len(ordered),
+                'p50': ordered[len(ordered) // 2],
+                'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                'max': ordered[-1],
+                'total': sum(ordered),
+                'timeouts': self.timeouts.get(step, 0),
+            }
+        return report
+
+    def print_summary(self):
+        """Print wait telemetry"""
+        report = self.summary()
+        if not report:
+            return
+        print("⏱️  Wait telemetry (seconds):")
+        for step, stats in report.items():
+            print(f"   {step}: n={stats['count']} mean={stats['mean']:.2f} "
+                  f"p50={stats['p50']:.2f} p95={stats['p95']:.2f} max={stats['max']:.2f} "
+                  f"total={stats['total']:.0f} timeouts={stats['timeouts']}")
+
+class MapsWaits:
+    """Event-driven waits for the sync Playwright API"""
+
+    def __init__(self, page, telemetry=None, config=None):
+        self.page = page
+        self.telemetry = telemetry or WaitTelemetry()
+        self.config = config or WaitConfig()
+
+    def _wait_function(self, step, expression, arg, timeout):
+        start = time.perf_counter()
+        try:
+            self.page.wait_for_function(expression, arg=arg, timeout=timeout,
+                                        polling=self.config.poll_interval)
+            self.telemetry.record(step, time.perf_counter() - start)
+            return True
+        except PlaywrightTimeoutError:
+            self.telemetry.record(step, time.perf_counter() - start, timed_out=True)
+            return False
+
+    def network_idle(self):
+        """Wait until the page has no network activity for 500ms"""
+        start = time.perf_counter()
+        try:
+            self.page.wait_for_load_state("networkidle", timeout=self.config.network_idle_timeout)
+            self.telemetry.record('network_idle', time.perf_counter() - start)
+            return True
+        except PlaywrightTimeoutError:
+            self.telemetry.record('network_idle', time.perf_counter() - start, timed_out=True)
+            return False
+
+    def mark_stale_results(self):
+        """Call before submitting a search on a page that already shows results"""
+        self.page.evaluate(MARK_STALE_JS)
+
+    def results_loaded(self):
+        """Wait for search results (feed listings or a single place pane)"""
+        if self._wait_function('results_loaded', RESULTS_READY_JS, None, self.config.results_timeout):
+            return True
+        # Empty result pages never render listings - settle on network idle instead
+        self.network_idle()
+        return False
+
+    def feed_growth(self, previous_count):
+        """Wait for the result feed to grow past previous_count listings"""
+        return self._wait_function('feed_growth', FEED_GREW_JS, previous_count,
+                                   self.config.feed_growth_timeout)
+
+    def feed_more(self, previous_count):
+        """Wait for the feed to grow past previous_count listings or show its end-of-list marker"""
+        return self._wait_function('feed_growth', FEED_MORE_JS, previous_count,
+                                   self.config.feed_growth_timeout)
+
+    def detail_changed(self, href):
+        """Wait for a fresh detail pane of the listing with this href"""
+        return self._wait_function('detail_changed', DETAIL_CHANGED_JS, place_marker(href),
+                                   self.config.detail_timeout)
+
+    def open_listing(self, listing, href):
+        """Click a feed listing until its detail pane shows; False means skip it, the pane is someone else's"""
+        for _ in range(self.config.listing_attempts):
+            self.page.evaluate(MARK_STALE_DETAIL_JS)
+            listing.click()
+            if self.detail_changed(href):
+                return True
+        METRICS.error('detail_changed')
+        return False
+
+    def place_loaded(self):
+        """Wait for the detail pane of a place URL opened with page.goto"""
+        return self._wait_function('place_loaded', PLACE_READY_JS, None, self.config.results_timeout)
+
+class AsyncMapsWaits:
+    """Event-driven waits for the async Playwright API"""
+
+    def __init__(self, page, telemetry=None, config=None):
+        self.page = page
+        self.telemetry = telemetry or WaitTelemetry()
+        self.config = config or WaitConfig()
+
+    async def _wait_function(self, step, expression, arg, timeout):
+        start = time.perf_counter()
+        try:
+            await self.page.wait_for_function(expression, arg=arg, timeout=timeout,
+                                              polling=self.config.poll_interval)
+            self.telemetry.record(step, time.perf_counter() - start)
+            return True
+        except PlaywrightTimeoutError:
+            self.telemetry.record(step, time.perf_counter() - start, timed_out=True)
+            return False
+
+    async def network_idle(self):
+        """Wait until the page has no network activity for 500ms"""
+        start = time.perf_counter()
+        try:
+            await self.page.wait_for_load_state("networkidle", timeout=self.config.network_idle_timeout)
+            self.telemetry.record('network_idle', time.perf_counter() - start)
+            return True
+        except PlaywrightTimeoutError:
+            self.telemetry.record('network_idle', time.perf_counter() - start, timed_out=True)
+            return False
+
+    async def mark_stale_results(self):
+        """Call before submitting a search on a page that already shows results"""
+        await self.page.evaluate(MARK_STALE_JS)
+
+    async def results_loaded(self):
+        """Wait for search results (feed listings or a single place pane)"""
+        if await self._wait_function('results_loaded', RESULTS_READY_JS, None, self.config.results_timeout):
+            return True
+        await self.network_idle()
+        return False
+
+    async def feed_growth(self, previous_count):
+        """Wait for the result feed to grow past previous_count listings"""
+        return await self._wait_function('feed_growth', FEED_GREW_JS, previous_count,
+                                         self.config.feed_growth_timeout)
+
+    async def feed_more(self, previous_count):
+        """Wait for the feed to grow past previous_count listings or show its end-of-list marker"""
+        return await self._wait_function('feed_growth', FEED_MORE_JS, previous_count,
+                                         self.config.feed_growth_timeout)
+
+    async def detail_changed(self, href):
+        """Wait for a fresh detail pane of the listing with this href"""
+        return await self._wait_function('detail_changed', DETAIL_CHANGED_JS, place_marker(href),
+                                         self.config.detail_timeout)
+
+    async def open_listing(self, listing, href):
+        """Click a feed listing until its detail pane shows; False means skip it, the pane is someone else's"""
+        for _ in range(self.config.listing_attempts):
+            await self.page.evaluate(MARK_STALE_DETAIL_JS)
+            await listing.click()
+            if await self.detail_changed(href):
+                return True
+        METRICS.error('detail_changed')
+        return False
+
+    async def place_loaded(self):
+        """Wait for the detail pane of a place URL opened with page.goto"""
+        return await self._wait_function('place_loaded', PLACE_READY_JS, None, self.config.results_timeout)